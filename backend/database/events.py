@@ -1,11 +1,20 @@
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
 
 from fastapi import HTTPException
+from feeds.changes import change, publish_event_change, publish_event_changes
+from planner.recurrence import occurrences_between, recurrence_lines
 from routers.schemas import EventCreate, EventSchema
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, or_, select
 from sqlalchemy.orm import Session
 
 from .models import Event as EventModel
+from .workload import event_counts, record_event_change, refresh_user_workload
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 def create_event(db: Session, event: EventCreate) -> EventSchema:
@@ -19,20 +28,143 @@ def create_event(db: Session, event: EventCreate) -> EventSchema:
         eventType=event.eventType,
         start=event.start,
         end=event.end,
-        recurrence=event.recurrence,
+        recurrence=event.recurrence or None,
+        time_zone=event.time_zone,
         course_name=event.course_name,
     )
     db.add(db_event)
+    db.flush()
+    record_event_change(db, after=db_event)
+    publish_event_change(
+        db, "create", db_event.user_id, db_event.id, event_change_body(db_event)
+    )
     db.commit()
     db.refresh(db_event)
     return db_event
 
 
+def event_change_body(db_event: EventModel) -> dict:
+    """JSON body of an event for change notifications."""
+    return EventSchema.model_validate(db_event, from_attributes=True).model_dump(
+        mode="json"
+    )
+
+
 def get_events(db: Session, user_id: int) -> List[EventSchema]:
     stmt = select(EventModel).where(EventModel.user_id == user_id)
     return db.execute(stmt).scalars().all()
 
 
+def get_events_in_window(
+    db: Session, user_id: int, start: datetime, end: datetime
+) -> List[EventSchema]:
+    """Events overlapping [start, end), with recurring events expanded.
+
+    Each occurrence is returned as a copy of its series with the occurrence's
+    start/end and ``recurring_event_id`` set to the series id.
+    """
+    stmt = (
+        select(EventModel)
+        .where(
+            EventModel.user_id == user_id,
+            or_(
+                and_(EventModel.start < end, EventModel.end > start),
+                and_(
+                    EventModel.recurrence.isnot(None),
+                    EventModel.recurrence != "",
+                    EventModel.start < end,
+                ),
+            ),
+        )
+        .order_by(EventModel.start)
+    )
+
+    start, end = _aware(start), _aware(end)
+    results: List[EventSchema] = []
+    for event in db.execute(stmt).scalars():
+        base = EventSchema.model_validate(event, from_attributes=True)
+        if not recurrence_lines(event.recurrence):
+            # Only reachable through the overlap branch, but recheck so a
+            # blank or whitespace-only rule can never leak rows in
+            event_start, event_end = _aware(event.start), _aware(event.end)
+            if event_start < end and event_end > start:
+                # Aware like the occurrences, so callers can compare the two
+                results.append(
+                    base.model_copy(update={"start": event_start, "end": event_end})
+                )
+            continue
+        duration = event.end - event.start
+        for occurrence in occurrences_between(
+            event.recurrence, event.start, duration, start, end, event.time_zone
+        ):
+            results.append(
+                base.model_copy(
+                    update={
+                        "start": occurrence,
+                        "end": occurrence + duration,
+                        "recurring_event_id": event.id,
+                    }
+                )
+            )
+    results.sort(key=lambda e: e.start)
+    return results
+
+
+def create_events_bulk(db: Session, events: List[EventCreate]) -> List[EventSchema]:
+    """Insert events with one INSERT ... RETURNING instead of a round trip each."""
+    rows = [
+        event.model_dump() | {"recurrence": event.recurrence or None}
+        for event in events
+    ]
+    if not rows:
+        return []
+    db_events = db.scalars(insert(EventModel).returning(EventModel), rows).all()
+    refresh_user_workload(db, {e.user_id for e in db_events})
+    # Serialize before commit expires the rows and each would be reloaded
+    results = [EventSchema.model_validate(e, from_attributes=True) for e in db_events]
+    publish_event_changes(
+        db,
+        [change("create", e.user_id, e.id, e.model_dump(mode="json")) for e in results],
+    )
+    db.commit()
+    return results
+
+
+def _user_event_filters(user_id: int, course_name: Optional[str] = None) -> list:
+    filters = [EventModel.user_id == user_id]
+    if course_name:
+        filters.append(EventModel.course_name == course_name)
+    return filters
+
+
+def get_events_version(
+    db: Session, user_id: int, course_name: Optional[str] = None
+) -> Tuple[int, Optional[datetime]]:
+    """(row count, latest updated_at) for a user's events.
+
+    Answered from the (user_id, updated_at) index without reading the rows;
+    any insert, update or delete changes one of the two values.
+    """
+    stmt = select(func.count(EventModel.id), func.max(EventModel.updated_at)).where(
+        *_user_event_filters(user_id, course_name)
+    )
+    count, last_updated = db.execute(stmt).one()
+    return count, last_updated
+
+
+def iter_event_batches(
+    db: Session, user_id: int, course_name: Optional[str] = None, batch_size=500
+) -> Iterator[List[EventModel]]:
+    """Yield a user's events in batches from a server-side cursor."""
+    stmt = (
+        select(EventModel)
+        .where(*_user_event_filters(user_id, course_name))
+        .order_by(EventModel.start)
+    )
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    yield from result.scalars().partitions()
+
+
 def get_event(db: Session, event_id: int) -> Optional[EventSchema]:
     stmt = select(EventModel).where(EventModel.id == event_id)
     return db.execute(stmt).scalars().first()
@@ -45,10 +177,23 @@ def update_event(db: Session, event_id: int, updated_event: EventCreate) -> Even
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
 
+    before_counts, before_user_id = event_counts(db_event), db_event.user_id
     for field, value in updated_event:
-        if value is not None:
+        if field == "recurrence" and value == "":
+            db_event.recurrence = None  # "" clears the rule
+        elif value is not None:
             setattr(db_event, field, value)
+    db_event.version += 1
+    if db_event.syllabus_id is not None:
+        db_event.syllabus_edited = True
 
+    db.flush()
+    record_event_change(
+        db, after=db_event, before_counts=before_counts, before_user_id=before_user_id
+    )
+    publish_event_change(
+        db, "update", db_event.user_id, db_event.id, event_change_body(db_event)
+    )
     db.commit()
     db.refresh(db_event)
     return db_event
@@ -61,5 +206,7 @@ def delete_event(db: Session, event_id: int) -> None:
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
 
+    record_event_change(db, before=db_event)
+    publish_event_change(db, "delete", db_event.user_id, db_event.id)
     db.delete(db_event)
     db.commit()
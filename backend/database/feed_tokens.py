@@ -0,0 +1,27 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import FeedToken
+
+
+def get_feed_token_version(db: Session, user_id: int) -> int:
+    stmt = select(FeedToken.version).where(FeedToken.user_id == user_id)
+    return db.execute(stmt).scalar() or 1
+
+
+def rotate_feed_token(db: Session, user_id: int) -> int:
+    """Bump the user's feed token version in one upsert; returns the new one."""
+    insert = (
+        postgresql.insert
+        if db.get_bind().dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    stmt = insert(FeedToken).values(user_id=user_id, version=2)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FeedToken.user_id],
+        set_={"version": FeedToken.version + 1},
+    ).returning(FeedToken.version)
+    version = db.execute(stmt).scalar_one()
+    db.commit()
+    return version
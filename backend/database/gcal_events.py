@@ -0,0 +1,149 @@
+import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import GoogleCalendarEvent, GoogleCalendarSyncState
+
+
+def parse_google_time(value: dict) -> Optional[datetime.datetime]:
+    """Turn a Google {dateTime|date} object into an aware datetime."""
+    if not value:
+        return None
+    if value.get("dateTime"):
+        return datetime.datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+    if value.get("date"):
+        day = datetime.date.fromisoformat(value["date"])
+        return datetime.datetime.combine(day, datetime.time(), datetime.timezone.utc)
+    return None
+
+
+def get_sync_state(
+    db: Session, user_id: int, lock: bool = False
+) -> GoogleCalendarSyncState:
+    """Fetch (creating if needed) the user's sync state.
+
+    With ``lock`` the row stays locked until commit, so concurrent views of
+    the same user wait for one sync instead of racing each other.
+    """
+    stmt = select(GoogleCalendarSyncState).where(
+        GoogleCalendarSyncState.user_id == user_id
+    )
+    if lock:
+        stmt = stmt.with_for_update()
+    state = db.execute(stmt).scalars().first()
+    if state is None:
+        try:
+            with db.begin_nested():
+                db.add(GoogleCalendarSyncState(user_id=user_id))
+        except IntegrityError:
+            pass  # created concurrently by another request
+        state = db.execute(stmt).scalars().one()
+    return state
+
+
+def clear_mirror(
+    db: Session, user_id: int, calendar_ids: Optional[Iterable[str]] = None
+) -> int:
+    """Drop mirrored events for a user, or only those of ``calendar_ids``,
+    returning rows removed."""
+    stmt = delete(GoogleCalendarEvent).where(GoogleCalendarEvent.user_id == user_id)
+    if calendar_ids is not None:
+        stmt = stmt.where(GoogleCalendarEvent.calendar_id.in_(list(calendar_ids)))
+    return db.execute(stmt).rowcount
+
+
+def apply_google_items(
+    db: Session, user_id: int, items: Iterable[dict], calendar_id: str = "primary"
+) -> int:
+    """Merge a page of Google events into the mirror, returning rows changed.
+
+    Cancelled events are removed, and events whose ETag matches the mirrored
+    copy are skipped so unchanged pages cost no writes.
+    """
+    items = [item for item in items if item.get("id")]
+    if not items:
+        return 0
+
+    ids = [item["id"] for item in items]
+    stmt = select(GoogleCalendarEvent).where(
+        GoogleCalendarEvent.user_id == user_id,
+        GoogleCalendarEvent.calendar_id == calendar_id,
+        GoogleCalendarEvent.google_event_id.in_(ids),
+    )
+    existing = {row.google_event_id: row for row in db.execute(stmt).scalars()}
+
+    # Unseen events are collected and written in one executemany INSERT.
+    new_rows = {}
+    changed = 0
+    for item in items:
+        row = existing.get(item["id"])
+
+        if item.get("status") == "cancelled":
+            if row is not None:
+                db.delete(row)
+                changed += 1
+            elif new_rows.pop(item["id"], None) is not None:
+                changed -= 1
+            continue
+
+        if row is not None and row.etag and row.etag == item.get("etag"):
+            continue
+
+        start = parse_google_time(item.get("start"))
+        end = parse_google_time(item.get("end")) or start
+        if start is None:
+            continue
+
+        if row is None:
+            if item["id"] not in new_rows:
+                changed += 1
+            new_rows[item["id"]] = {
+                "user_id": user_id,
+                "calendar_id": calendar_id,
+                "google_event_id": item["id"],
+                "etag": item.get("etag"),
+                "start": start,
+                "end": end,
+                "payload": item,
+            }
+            continue
+
+        row.etag = item.get("etag")
+        row.start = start
+        row.end = end
+        row.payload = item
+        changed += 1
+
+    db.flush()
+    if new_rows:
+        db.execute(insert(GoogleCalendarEvent), list(new_rows.values()))
+    return changed
+
+
+def get_mirrored_events(
+    db: Session,
+    user_id: int,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> List[dict]:
+    """Return mirrored Google events overlapping [start, end), ordered by start.
+
+    Events from all mirrored calendars are merged; each carries its
+    ``calendarId``.
+    """
+    stmt = (
+        select(GoogleCalendarEvent.payload, GoogleCalendarEvent.calendar_id)
+        .where(
+            GoogleCalendarEvent.user_id == user_id,
+            GoogleCalendarEvent.start < end,
+            GoogleCalendarEvent.end > start,
+        )
+        .order_by(GoogleCalendarEvent.start)
+    )
+    return [
+        {**payload, "calendarId": calendar_id}
+        for payload, calendar_id in db.execute(stmt)
+    ]
@@ -0,0 +1,201 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import GoogleCalendarJob, GoogleCalendarRateLimit
+
+# A running job whose worker has not finished within this window is reclaimed.
+JOB_LEASE_SECONDS = 300
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def get_job(db: Session, job_id: int) -> Optional[GoogleCalendarJob]:
+    return db.get(GoogleCalendarJob, job_id)
+
+
+def enqueue_job(
+    db: Session,
+    user_id: int,
+    action: str,
+    idempotency_key: str,
+    event_id: Optional[int] = None,
+    google_event_id: Optional[str] = None,
+    payload: Optional[dict] = None,
+) -> GoogleCalendarJob:
+    """Queue a Google Calendar write, reusing any job with the same key.
+
+    A job that already failed is put back on the queue; queued, running and
+    succeeded jobs are returned untouched so repeated submits are no-ops.
+    """
+    stmt = select(GoogleCalendarJob).where(
+        GoogleCalendarJob.idempotency_key == idempotency_key
+    )
+    job = db.execute(stmt).scalars().first()
+
+    if job is None:
+        job = GoogleCalendarJob(
+            user_id=user_id,
+            event_id=event_id,
+            idempotency_key=idempotency_key,
+            action=action,
+            google_event_id=google_event_id,
+            payload=payload,
+            status="queued",
+            attempts=0,
+            run_after=_utcnow(),
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Lost a race with an identical submit; return the winner's job.
+            db.rollback()
+            return db.execute(stmt).scalars().one()
+    elif job.status == "failed":
+        job.status = "queued"
+        job.attempts = 0
+        job.last_error = None
+        job.run_after = _utcnow()
+        job.updated_at = _utcnow()
+        db.commit()
+
+    db.refresh(job)
+    return job
+
+
+def claim_next_job(db: Session) -> Optional[GoogleCalendarJob]:
+    """Lock the next due job for this worker and mark it running.
+
+    Uses SKIP LOCKED so several workers can poll the same table, and leases
+    the job by pushing run_after forward so a crashed worker's job is retried.
+    """
+    now = _utcnow()
+    stmt = (
+        select(GoogleCalendarJob)
+        .where(
+            or_(
+                GoogleCalendarJob.status == "queued",
+                GoogleCalendarJob.status == "running",
+            ),
+            GoogleCalendarJob.run_after <= now,
+        )
+        .order_by(GoogleCalendarJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = db.execute(stmt).scalars().first()
+    if job is None:
+        db.rollback()
+        return None
+
+    job.status = "running"
+    job.attempts += 1
+    job.run_after = now + datetime.timedelta(seconds=JOB_LEASE_SECONDS)
+    job.updated_at = now
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def complete_job(db: Session, job: GoogleCalendarJob, result: Optional[dict]) -> None:
+    job.status = "succeeded"
+    job.result = result
+    job.last_error = None
+    job.updated_at = _utcnow()
+    db.commit()
+
+
+def reschedule_job(
+    db: Session,
+    job: GoogleCalendarJob,
+    delay: float,
+    error: Optional[str] = None,
+    count_attempt: bool = True,
+) -> None:
+    """Put a job back on the queue to run again after ``delay`` seconds."""
+    job.status = "queued"
+    if not count_attempt:
+        job.attempts -= 1
+    if error:
+        job.last_error = error
+    job.run_after = _utcnow() + datetime.timedelta(seconds=delay)
+    job.updated_at = _utcnow()
+    db.commit()
+
+
+def is_superseded(db: Session, job: GoogleCalendarJob) -> bool:
+    """Whether a later update job exists for the same event.
+
+    Update payloads carry the event's full state, so only the newest one
+    needs to reach Google; older ones retried late must not overwrite it.
+    """
+    if job.action != "update" or job.event_id is None:
+        return False
+    stmt = select(GoogleCalendarJob.id).where(
+        GoogleCalendarJob.event_id == job.event_id,
+        GoogleCalendarJob.action == "update",
+        GoogleCalendarJob.id > job.id,
+    )
+    return db.execute(stmt.limit(1)).first() is not None
+
+
+def skip_job(db: Session, job: GoogleCalendarJob, reason: str) -> None:
+    job.status = "superseded"
+    job.last_error = reason
+    job.updated_at = _utcnow()
+    db.commit()
+
+
+def fail_job(db: Session, job: GoogleCalendarJob, error: str) -> None:
+    job.status = "failed"
+    job.last_error = error
+    job.updated_at = _utcnow()
+    db.commit()
+
+
+def take_rate_limit_token(
+    db: Session, user_id: int, rate: float, burst: float
+) -> float:
+    """Consume one token from the user's bucket.
+
+    Returns 0 when a token was taken, otherwise the seconds to wait until
+    one becomes available. The bucket row is locked so workers share it.
+    """
+    now = _utcnow()
+    stmt = (
+        select(GoogleCalendarRateLimit)
+        .where(GoogleCalendarRateLimit.user_id == user_id)
+        .with_for_update()
+    )
+    bucket = db.execute(stmt).scalars().first()
+    if bucket is None:
+        bucket = GoogleCalendarRateLimit(user_id=user_id, tokens=burst, refilled_at=now)
+        db.add(bucket)
+
+    refilled_at = bucket.refilled_at
+    if refilled_at.tzinfo is None:
+        refilled_at = refilled_at.replace(tzinfo=datetime.timezone.utc)
+    elapsed = max((now - refilled_at).total_seconds(), 0.0)
+    tokens = min(burst, bucket.tokens + elapsed * rate)
+
+    wait = 0.0
+    if tokens >= 1:
+        tokens -= 1
+    else:
+        wait = (1 - tokens) / rate
+
+    bucket.tokens = tokens
+    bucket.refilled_at = now
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker created the bucket first; retry against its row.
+        db.rollback()
+        return take_rate_limit_token(db, user_id, rate, burst)
+    return wait
@@ -0,0 +1,99 @@
+"""Bring tables that predate the current models up to date at startup.
+
+``Base.metadata.create_all`` creates missing tables but never alters an
+existing one, so columns added to ``events`` after it first shipped are
+added here with plain ``ALTER TABLE`` statements. Every step checks the live
+schema first and is safe to run on each start.
+
+Anything still missing afterwards (e.g. a table whose shape changed and has
+to be dropped and recreated) stops startup with the list of missing columns
+rather than failing later with "no such column".
+"""
+
+import logging
+from typing import Dict, List
+
+from sqlalchemy import Engine, inspect, text
+
+from .db import Base
+from .models import EVENT_SEARCH_DDL, EVENT_TRGM_DDL
+
+logger = logging.getLogger(__name__)
+
+# events columns added after the table first shipped, in the order they came.
+# Defaults fill existing rows so NOT NULL holds.
+EVENT_COLUMNS = [
+    ("time_zone", "VARCHAR"),
+    ("syllabus_id", "INTEGER REFERENCES syllabi (id)"),
+    ("syllabus_key", "VARCHAR"),
+    ("syllabus_edited", "BOOLEAN NOT NULL DEFAULT false"),
+    ("version", "INTEGER NOT NULL DEFAULT 1"),
+    ("updated_at", "TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()"),
+]
+EVENT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_events_syllabus_id ON events (syllabus_id)",
+    "CREATE INDEX IF NOT EXISTS ix_events_user_updated_at "
+    "ON events (user_id, updated_at)",
+]
+
+
+def _add_event_columns(conn, existing: set) -> List[str]:
+    added = []
+    for name, ddl in EVENT_COLUMNS:
+        if name in existing:
+            continue
+        if name == "updated_at" and conn.dialect.name == "sqlite":
+            # SQLite cannot add a column with a non-constant default
+            conn.execute(text("ALTER TABLE events ADD COLUMN updated_at TIMESTAMP"))
+            conn.execute(text("UPDATE events SET updated_at = CURRENT_TIMESTAMP"))
+        else:
+            conn.execute(text(f"ALTER TABLE events ADD COLUMN {name} {ddl}"))
+        added.append(name)
+    return added
+
+
+def missing_columns(engine: Engine) -> Dict[str, List[str]]:
+    """Model columns absent from existing tables, by table name."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    missing = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        absent = [column.name for column in table.columns if column.name not in present]
+        if absent:
+            missing[table.name] = absent
+    return missing
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Add missing events columns and indexes, then check every table.
+
+    Run after ``create_all``. Raises RuntimeError if a table still lacks
+    columns the models expect.
+    """
+    inspector = inspect(engine)
+    if inspector.has_table("events"):
+        existing = {column["name"] for column in inspector.get_columns("events")}
+        with engine.begin() as conn:
+            added = _add_event_columns(conn, existing)
+            for statement in EVENT_INDEXES:
+                conn.execute(text(statement))
+            if conn.dialect.name == "postgresql":
+                if "search_vector" not in existing:
+                    conn.execute(text(EVENT_SEARCH_DDL))
+                    added.append("search_vector")
+                conn.execute(text(EVENT_TRGM_DDL))
+        if added:
+            logger.warning("Added events columns: %s", ", ".join(added))
+
+    missing = missing_columns(engine)
+    if missing:
+        details = "; ".join(
+            f"{table}: {', '.join(columns)}" for table, columns in missing.items()
+        )
+        raise RuntimeError(
+            f"Database schema is out of date ({details}). "
+            "Drop and recreate these tables, or add the columns by hand."
+        )
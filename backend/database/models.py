@@ -1,4 +1,22 @@
-from sqlalchemy import TIMESTAMP, Column, DateTime, ForeignKey, Integer, String, text
+from sqlalchemy import (
+    DDL,
+    JSON,
+    TIMESTAMP,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+    false,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from .db import Base
@@ -20,6 +38,7 @@ class User(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (Index("ix_events_user_updated_at", "user_id", "updated_at"),)
 
     # IDS
     id = Column(Integer, primary_key=True, index=True, nullable=False)
@@ -37,10 +56,218 @@ class Event(Base):
     start = Column(DateTime(timezone=True), nullable=False)
     end = Column(DateTime(timezone=True), nullable=False)
     recurrence = Column(String, nullable=True)
+    # IANA zone recurring events repeat in (start/end only keep an offset)
+    time_zone = Column(String, nullable=True)
 
     course_name = Column(String, nullable=True)
 
+    # Set when materialized from a shared syllabus; `syllabus_key` is the
+    # draft's key in the catalog entry, so revisions can find their copies
+    syllabus_id = Column(Integer, ForeignKey("syllabi.id"), nullable=True, index=True)
+    syllabus_key = Column(String, nullable=True)
+    # Set once the user edits their copy; catalog revisions then leave it be
+    syllabus_edited = Column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
+
+    # Incremented on every content change; keys Google update jobs
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+    # Bumped on every write; drives feed/list ETags and Last-Modified
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=text("now()"),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
     user = relationship("User", back_populates="events")
 
 
+# Full-text search (Postgres only; database/search.py falls back to LIKE on
+# other dialects). Weighted so title hits outrank course, then body text.
+EVENT_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(course_name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C')"
+)
+EVENT_FUZZY_DOCUMENT = "(coalesce(summary, '') || ' ' || coalesce(course_name, ''))"
+
+# Idempotent, so database/migrations.py reruns them on pre-existing tables.
+EVENT_SEARCH_DDL = (
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({EVENT_SEARCH_DOCUMENT}) STORED; "
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector "
+    "ON events USING gin (search_vector)"
+)
+# pg_trgm powers optional fuzzy matching; skipped quietly if the role may
+# not create extensions.
+EVENT_TRGM_DDL = (
+    "DO $$ BEGIN "
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm; "
+    "CREATE INDEX IF NOT EXISTS ix_events_search_trgm ON events "
+    f"USING gin ({EVENT_FUZZY_DOCUMENT} gin_trgm_ops); "
+    "EXCEPTION WHEN insufficient_privilege THEN "
+    "RAISE NOTICE 'pg_trgm unavailable; fuzzy event search disabled'; "
+    "END $$"
+)
+
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL(EVENT_SEARCH_DDL).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL(EVENT_TRGM_DDL).execute_if(dialect="postgresql"),
+)
+
+
+class FeedToken(Base):
+    """Version signed into a user's feed URLs; bumping it revokes old URLs.
+
+    Users without a row are on version 1.
+    """
+
+    __tablename__ = "feed_tokens"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+
+
+class Syllabus(Base):
+    """A parsed syllabus shared by everyone who uploads the same document."""
+
+    __tablename__ = "syllabi"
+    __table_args__ = (
+        UniqueConstraint(
+            "document_hash", "parse_options", name="uq_syllabi_document_options"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, nullable=False)
+    document_hash = Column(String(64), nullable=False)  # sha256 of the upload
+    # Drafts depend on semester start/timezone too; see database/syllabi.py
+    parse_options = Column(String, nullable=False)
+    course_code = Column(String, nullable=True, index=True)
+    filename = Column(String, nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    drafts = Column(JSON, nullable=False)  # EventDraftSchema dumps with keys
+    revision = Column(Integer, nullable=False, default=1)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class SyllabusLink(Base):
+    __tablename__ = "syllabus_links"
+    __table_args__ = (
+        UniqueConstraint("syllabus_id", "user_id", name="uq_syllabus_links"),
+    )
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    syllabus_id = Column(Integer, ForeignKey("syllabi.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class WeeklyWorkload(Base):
+    """Event counts per user, week, course and type (see planner/workload.py).
+
+    Kept in step by database/events.py writes; one row per non-empty cell.
+    """
+
+    __tablename__ = "weekly_workload"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "week_start",
+            "course_name",
+            "event_type",
+            name="uq_weekly_workload_cell",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    week_start = Column(Date, nullable=False)  # Monday
+    course_name = Column(String, nullable=False, default="")  # "" = no course
+    event_type = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class GoogleCalendarEvent(Base):
+    """Local mirror of a user's Google Calendar events, kept fresh via syncToken."""
+
+    __tablename__ = "gcal_events"
+    __table_args__ = (
+        UniqueConstraint("user_id", "calendar_id", "google_event_id"),
+        Index("ix_gcal_events_user_start", "user_id", "start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    calendar_id = Column(String, nullable=False, default="primary")
+    google_event_id = Column(String, nullable=False)
+    etag = Column(String, nullable=True)
+
+    start = Column(DateTime(timezone=True), nullable=False)
+    end = Column(DateTime(timezone=True), nullable=False)
+
+    # Raw Google event resource, served back as-is to the frontend
+    payload = Column(JSON, nullable=False)
+
+
+class GoogleCalendarSyncState(Base):
+    """Per-user incremental sync cursors for the Google Calendar mirror."""
+
+    __tablename__ = "gcal_sync_state"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    sync_tokens = Column(JSON, nullable=True)  # {calendar_id: syncToken}
+    window_start = Column(DateTime(timezone=True), nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Cached selection from the user's calendar list: [{id, summary, primary}]
+    calendars = Column(JSON, nullable=True)
+    calendars_synced_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class GoogleCalendarJob(Base):
+    """Queued Google Calendar write, executed by the gcal worker process."""
+
+    __tablename__ = "gcal_jobs"
+    __table_args__ = (Index("ix_gcal_jobs_status_run_after", "status", "run_after"),)
+
+    id = Column(Integer, primary_key=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="SET NULL"))
+    idempotency_key = Column(String, unique=True, nullable=False)
+
+    action = Column(String, nullable=False)  # insert | update | delete
+    google_event_id = Column(String, nullable=True)
+    payload = Column(JSON, nullable=True)
+
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class GoogleCalendarRateLimit(Base):
+    """Per-user token bucket shared by every gcal worker."""
+
+    __tablename__ = "gcal_rate_limits"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    refilled_at = Column(DateTime(timezone=True), nullable=False)
+
+
 # https://developers.google.com/workspace/calendar/api/v3/reference/events/insert
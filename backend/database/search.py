@@ -0,0 +1,148 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, literal, literal_column, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import EVENT_FUZZY_DOCUMENT
+from .models import Event as EventModel
+
+SEARCH_CONFIG = "english"
+FUZZY_THRESHOLD = 0.3
+
+# Per-column weights for the LIKE fallback, mirroring the tsvector weights.
+_FALLBACK_WEIGHTS = (
+    (EventModel.summary, 1.0),
+    (EventModel.course_name, 0.4),
+    (EventModel.description, 0.2),
+    (EventModel.location, 0.2),
+)
+
+
+# Whether pg_trgm is installed; checked once, see detect_pg_trgm().
+_pg_trgm: Optional[bool] = None
+
+
+def detect_pg_trgm(engine: Engine) -> bool:
+    """Look up pg_trgm once and remember it, instead of on every search."""
+    global _pg_trgm
+    if engine.dialect.name != "postgresql":
+        _pg_trgm = False
+        return _pg_trgm
+    with engine.connect() as conn:
+        found = conn.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first()
+    _pg_trgm = found is not None
+    return _pg_trgm
+
+
+def _has_pg_trgm(db: Session) -> bool:
+    # Normally set at startup; scripts that skip it detect on first use
+    return _pg_trgm if _pg_trgm is not None else detect_pg_trgm(db.get_bind())
+
+
+def _filters(
+    user_id: int,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    event_type: Optional[str],
+) -> list:
+    filters = [EventModel.user_id == user_id]
+    if event_type:
+        filters.append(EventModel.eventType == event_type)
+    if end is not None:
+        filters.append(EventModel.start < end)
+    if start is not None:
+        # Recurring series may still have occurrences after `start`
+        filters.append(
+            or_(
+                EventModel.end > start,
+                and_(EventModel.recurrence.isnot(None), EventModel.recurrence != ""),
+            )
+        )
+    return filters
+
+
+def _postgres_match(db: Session, q: str, fuzzy: bool):
+    vector = literal_column("events.search_vector")
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    match = vector.op("@@")(query)
+    rank = func.ts_rank_cd(vector, query)
+
+    if fuzzy and _has_pg_trgm(db):
+        document = literal_column(EVENT_FUZZY_DOCUMENT)
+        # `q <% doc` is word_similarity() >= pg_trgm.word_similarity_threshold
+        # and can use the trigram index; the explicit cut-off keeps it stable.
+        similarity = func.word_similarity(q, document)
+        match = or_(
+            match, and_(literal(q).op("<%")(document), similarity >= FUZZY_THRESHOLD)
+        )
+        rank = func.greatest(rank, similarity)
+    return match, rank
+
+
+def _fallback_terms(q: str) -> List[str]:
+    # Web-search quoting and operators have no LIKE equivalent; match words.
+    terms = [term.strip('"-|') for term in q.lower().split()]
+    return [term for term in terms if term and term != "or"]
+
+
+def _fallback_match(terms: List[str]):
+    columns = [func.lower(func.coalesce(column, "")) for column, _ in _FALLBACK_WEIGHTS]
+
+    # Every term must appear in at least one column.
+    match = and_(
+        *(
+            or_(*(column.contains(term, autoescape=True) for column in columns))
+            for term in terms
+        )
+    )
+    rank = sum(
+        case((column.contains(term, autoescape=True), weight), else_=0.0)
+        for term in terms
+        for column, (_, weight) in zip(columns, _FALLBACK_WEIGHTS)
+    )
+    return match, rank
+
+
+def search_events(
+    db: Session,
+    user_id: int,
+    q: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    fuzzy: bool = False,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[Tuple[EventModel, float]], bool]:
+    """Ranked page of a user's events matching ``q``.
+
+    Returns ``(hits, has_more)`` where each hit is ``(event, rank)``. Postgres
+    uses the weighted ``search_vector`` (plus trigram similarity when
+    ``fuzzy``); other dialects fall back to substring matching.
+    """
+    if not q.strip():
+        return [], False
+
+    if db.get_bind().dialect.name == "postgresql":
+        match, rank = _postgres_match(db, q, fuzzy)
+    else:
+        terms = _fallback_terms(q)
+        if not terms:
+            return [], False  # only operators, e.g. "-" or "|"
+        match, rank = _fallback_match(terms)
+
+    rank = rank.label("rank")
+    stmt = (
+        select(EventModel, rank)
+        .where(*_filters(user_id, start, end, event_type), match)
+        .order_by(rank.desc(), EventModel.start, EventModel.id)
+        .offset(offset)
+        # One extra row tells us whether another page exists without a COUNT
+        .limit(limit + 1)
+    )
+    rows = [(event, float(score)) for event, score in db.execute(stmt)]
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,298 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from feeds.changes import change, publish_event_changes
+from parser.parser_app import PARSER_VERSION
+from routers.schemas import EventDraftSchema, EventSchema
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import Event as EventModel
+from .models import Syllabus, SyllabusLink
+from .workload import refresh_user_workload
+
+# Fields a revision may change on materialized events.
+_EVENT_FIELDS = (
+    "summary",
+    "description",
+    "location",
+    "colorId",
+    "eventType",
+    "start",
+    "end",
+    "recurrence",
+    "time_zone",
+    "course_name",
+)
+
+
+def document_hash(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def parse_options_key(
+    semester_start: Optional[str], timezone_name: str, collapse_recurring: bool
+) -> str:
+    """Everything besides the document that changes the parser's output."""
+    return (
+        f"v{PARSER_VERSION}|{semester_start or ''}|{timezone_name}"
+        f"|{int(collapse_recurring)}"
+    )
+
+
+def _with_keys(drafts: List[EventDraftSchema]) -> List[dict]:
+    """JSON dumps of ``drafts``, giving keyless drafts a fresh catalog key."""
+    return [
+        draft.model_dump(mode="json")
+        | {"catalog_key": draft.catalog_key or uuid.uuid4().hex[:16]}
+        for draft in drafts
+    ]
+
+
+def _event_values(draft: dict) -> dict:
+    """Column values for an event materialized from a stored draft.
+
+    Matches the frontend's defaults: all-day drafts end when they start,
+    timed ones last an hour.
+    """
+    parsed = EventDraftSchema.model_validate(draft)
+    end = parsed.end
+    if end is None:
+        end = parsed.start if parsed.all_day else parsed.start + timedelta(hours=1)
+    return {
+        "summary": parsed.summary,
+        "description": parsed.description,
+        "location": parsed.location,
+        "colorId": parsed.colorId,
+        "eventType": parsed.eventType,
+        "start": parsed.start,
+        "end": end,
+        "recurrence": parsed.recurrence,
+        "time_zone": parsed.time_zone,
+        "course_name": parsed.course_name,
+    }
+
+
+def get_syllabus(db: Session, syllabus_id: int) -> Optional[Syllabus]:
+    return db.get(Syllabus, syllabus_id)
+
+
+def find_syllabus(
+    db: Session, document_hash: str, parse_options: str
+) -> Optional[Syllabus]:
+    stmt = select(Syllabus).where(
+        Syllabus.document_hash == document_hash,
+        Syllabus.parse_options == parse_options,
+    )
+    return db.execute(stmt).scalars().first()
+
+
+def list_syllabi(db: Session, course_code: Optional[str] = None) -> List[Syllabus]:
+    stmt = select(Syllabus).order_by(Syllabus.course_code, Syllabus.id)
+    if course_code:
+        stmt = stmt.where(Syllabus.course_code == course_code.replace(" ", "").upper())
+    return db.execute(stmt).scalars().all()
+
+
+def create_syllabus(
+    db: Session,
+    document_hash: str,
+    parse_options: str,
+    drafts: List[EventDraftSchema],
+    course_code: Optional[str] = None,
+    filename: Optional[str] = None,
+    owner_id: Optional[int] = None,
+) -> Syllabus:
+    """Store parsed drafts in the catalog, or return the entry a concurrent
+    upload of the same document already created."""
+    syllabus = Syllabus(
+        document_hash=document_hash,
+        parse_options=parse_options,
+        course_code=course_code,
+        filename=filename,
+        owner_id=owner_id,
+        drafts=_with_keys(drafts),
+        revision=1,
+    )
+    db.add(syllabus)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = find_syllabus(db, document_hash, parse_options)
+        if existing is None:
+            raise  # not a duplicate upload, e.g. an unknown owner
+        return existing
+    db.refresh(syllabus)
+    return syllabus
+
+
+def claim_syllabus(db: Session, syllabus: Syllabus, owner_id: int) -> Syllabus:
+    """Make ``owner_id`` the owner of an entry nobody owns yet.
+
+    A conditional UPDATE, so when two owners race only the first one wins.
+    """
+    db.execute(
+        update(Syllabus)
+        .where(Syllabus.id == syllabus.id, Syllabus.owner_id.is_(None))
+        .values(owner_id=owner_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(syllabus)
+    return syllabus
+
+
+def syllabus_events(db: Session, syllabus_id: int, user_id: int) -> List[EventModel]:
+    stmt = (
+        select(EventModel)
+        .where(EventModel.syllabus_id == syllabus_id, EventModel.user_id == user_id)
+        .order_by(EventModel.start)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def _materialize(
+    db: Session, syllabus_id: int, drafts: List[dict], user_ids: List[int]
+) -> List[EventModel]:
+    rows = [
+        _event_values(draft)
+        | {
+            "user_id": user_id,
+            "syllabus_id": syllabus_id,
+            "syllabus_key": draft["catalog_key"],
+        }
+        for user_id in user_ids
+        for draft in drafts
+    ]
+    if not rows:
+        return []
+    return db.scalars(insert(EventModel).returning(EventModel), rows).all()
+
+
+def link_user(db: Session, syllabus: Syllabus, user_id: int) -> List[EventSchema]:
+    """Link a user to a catalog entry and give them their own events.
+
+    All of the syllabus' events are written with one bulk INSERT. Linking
+    twice is a no-op that returns the events from the first link.
+    """
+    link = SyllabusLink(syllabus_id=syllabus.id, user_id=user_id)
+    db.add(link)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return syllabus_events(db, syllabus.id, user_id)
+
+    events = _materialize(db, syllabus.id, syllabus.drafts, [user_id])
+    refresh_user_workload(db, [user_id])
+    # Serialize before commit expires the rows and each would be reloaded
+    results = [EventSchema.model_validate(e, from_attributes=True) for e in events]
+    publish_event_changes(
+        db,
+        [change("create", user_id, e.id, e.model_dump(mode="json")) for e in results],
+    )
+    db.commit()
+    return results
+
+
+def revise_syllabus(
+    db: Session, syllabus: Syllabus, drafts: List[EventDraftSchema]
+) -> Tuple[Syllabus, List[EventModel], List[Tuple[int, str]]]:
+    """Replace a catalog entry's drafts and fan the change out to linked users.
+
+    Drafts are matched on ``catalog_key``: changed drafts update linked
+    users' copies in one executemany UPDATE, removed drafts delete them, and
+    new drafts are inserted for all linked users at once. Copies a user has
+    edited themselves are never updated or deleted. Returns the entry, the
+    updated events and the ``(user_id, google_event_id)`` of deleted ones
+    that were on Google, so callers can mirror the change there.
+    """
+    old = {draft["catalog_key"]: draft for draft in syllabus.drafts}
+    new = _with_keys(drafts)
+    new_keys = {draft["catalog_key"] for draft in new}
+
+    removed = [key for key in old if key not in new_keys]
+    changed = [d for d in new if d["catalog_key"] in old and d != old[d["catalog_key"]]]
+    added = [d for d in new if d["catalog_key"] not in old]
+
+    user_ids = (
+        db.execute(
+            select(SyllabusLink.user_id).where(SyllabusLink.syllabus_id == syllabus.id)
+        )
+        .scalars()
+        .all()
+    )
+
+    deleted: List[Tuple[int, str]] = []
+    if removed:
+        deleted = db.execute(
+            select(EventModel.user_id, EventModel.google_event_id).where(
+                EventModel.syllabus_id == syllabus.id,
+                EventModel.syllabus_key.in_(removed),
+                EventModel.syllabus_edited.is_(False),
+                EventModel.google_event_id.isnot(None),
+            )
+        ).all()
+        db.execute(
+            delete(EventModel)
+            .where(
+                EventModel.syllabus_id == syllabus.id,
+                EventModel.syllabus_key.in_(removed),
+                EventModel.syllabus_edited.is_(False),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    if changed:
+        table = EventModel.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.syllabus_id == syllabus.id,
+                table.c.syllabus_key == bindparam("b_key"),
+                table.c.syllabus_edited.is_(False),
+            )
+            .values(
+                {field: bindparam(f"b_{field}") for field in _EVENT_FIELDS}
+                | {"version": table.c.version + 1}
+            )
+        )
+        db.execute(
+            stmt,
+            [
+                {f"b_{field}": value for field, value in _event_values(d).items()}
+                | {"b_key": d["catalog_key"]}
+                for d in changed
+            ],
+        )
+
+    _materialize(db, syllabus.id, added, user_ids)
+    refresh_user_workload(db, user_ids)
+
+    # Per-event deltas would be users x drafts; have each client refetch
+    publish_event_changes(db, [change("resync", user_id) for user_id in user_ids])
+
+    syllabus.drafts = new
+    syllabus.revision += 1
+    syllabus.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(syllabus)
+
+    updated: List[EventModel] = []
+    if changed:
+        updated = (
+            db.execute(
+                select(EventModel).where(
+                    EventModel.syllabus_id == syllabus.id,
+                    EventModel.syllabus_key.in_([d["catalog_key"] for d in changed]),
+                    EventModel.syllabus_edited.is_(False),
+                )
+            )
+            .scalars()
+            .all()
+        )
+    return syllabus, updated, [tuple(row) for row in deleted]
@@ -0,0 +1,156 @@
+"""TTL cache of user identity, keyed by both google_id and id.
+
+By default entries live in process memory. Set USER_CACHE_REDIS_URL (and
+install ``redis``) to share the cache across pods so that an invalidation on
+one pod is seen by all of them.
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_REDIS_URL = os.getenv("USER_CACHE_REDIS_URL")
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Detached snapshot of a users row, safe to share between sessions."""
+
+    id: int
+    google_id: str
+    email: str
+    name: str
+    access_token: str
+    token_expires_at: datetime.datetime
+
+    @classmethod
+    def from_model(cls, user) -> "CachedUser":
+        return cls(
+            id=user.id,
+            google_id=user.google_id,
+            email=user.email,
+            name=user.name,
+            access_token=user.access_token,
+            token_expires_at=user.token_expires_at,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["token_expires_at"] = self.token_expires_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw) -> "CachedUser":
+        data = json.loads(raw)
+        data["token_expires_at"] = datetime.datetime.fromisoformat(
+            data["token_expires_at"]
+        )
+        return cls(**data)
+
+
+class LocalUserCache:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, keys, user: CachedUser) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key in keys:
+                self._entries[key] = (expires_at, user)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisUserCache:
+    """Shared cache so every pod sees the same entries and invalidations."""
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "USER_CACHE_REDIS_URL is set but the 'redis' package is not installed"
+            ) from e
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[CachedUser]:
+        raw = self._client.get(f"user-cache:{key}")
+        return CachedUser.from_json(raw) if raw else None
+
+    def set(self, keys, user: CachedUser) -> None:
+        pipe = self._client.pipeline()
+        for key in keys:
+            pipe.setex(f"user-cache:{key}", int(max(self.ttl, 1)), user.to_json())
+        pipe.execute()
+
+    def delete(self, keys) -> None:
+        self._client.delete(*(f"user-cache:{key}" for key in keys))
+
+
+if USER_CACHE_REDIS_URL:
+    user_cache = RedisUserCache(USER_CACHE_REDIS_URL, USER_CACHE_TTL)
+else:
+    user_cache = LocalUserCache(USER_CACHE_TTL, USER_CACHE_MAX_ENTRIES)
+
+
+def _keys(user: CachedUser):
+    return (f"id:{user.id}", f"google:{user.google_id}")
+
+
+def get_by_id(user_id: int) -> Optional[CachedUser]:
+    return user_cache.get(f"id:{user_id}")
+
+
+def get_by_google_id(google_id: str) -> Optional[CachedUser]:
+    return user_cache.get(f"google:{google_id}")
+
+
+def remember(user) -> CachedUser:
+    snapshot = CachedUser.from_model(user)
+    user_cache.set(_keys(snapshot), snapshot)
+    return snapshot
+
+
+def invalidate(user_id: Optional[int] = None, google_id: Optional[str] = None) -> None:
+    keys = []
+    if user_id is not None:
+        keys.append(f"id:{user_id}")
+    if google_id is not None:
+        keys.append(f"google:{google_id}")
+    if keys:
+        user_cache.delete(keys)
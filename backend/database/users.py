@@ -1,8 +1,11 @@
 import datetime
+from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from . import user_cache
 from .models import User
 
 
@@ -20,6 +23,26 @@ def select_user_by_google_id(db: Session, google_id: str):
     return user
 
 
+def get_cached_user_by_id(db: Session, id: int) -> Optional[user_cache.CachedUser]:
+    """Resolve a user by id through the TTL cache, querying only on a miss."""
+    cached = user_cache.get_by_id(id)
+    if cached is not None:
+        return cached
+    user = select_user_by_id(db, id)
+    return user_cache.remember(user) if user else None
+
+
+def get_cached_user_by_google_id(
+    db: Session, google_id: str
+) -> Optional[user_cache.CachedUser]:
+    """Resolve a user by google_id through the TTL cache."""
+    cached = user_cache.get_by_google_id(google_id)
+    if cached is not None:
+        return cached
+    user = select_user_by_google_id(db, google_id)
+    return user_cache.remember(user) if user else None
+
+
 def upsert_user_sync(
     db: Session,
     google_id: str,
@@ -28,29 +51,38 @@ def upsert_user_sync(
     access_token: str,
     expires_in: int,
 ):
-    stmt = select(User).where(User.google_id == google_id)
-    result = db.execute(stmt)
-    user = result.scalars().first()
-
+    """Insert or refresh a user in one INSERT ... ON CONFLICT ... RETURNING."""
     expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in)
 
-    if user is None:
-        user = User(
-            google_id=google_id,
-            email=email,
-            name=name,
-            access_token=access_token,
-            token_expires_at=expires_at,
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    else:
-        user.email = email
-        user.name = name
-        user.access_token = access_token
-        user.token_expires_at = expires_at
-        db.commit()
-        db.refresh(user)
+    insert = (
+        postgresql.insert
+        if db.get_bind().dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    stmt = insert(User).values(
+        google_id=google_id,
+        email=email,
+        name=name,
+        access_token=access_token,
+        token_expires_at=expires_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.google_id],
+        set_={
+            "email": stmt.excluded.email,
+            "name": stmt.excluded.name,
+            "access_token": stmt.excluded.access_token,
+            "token_expires_at": stmt.excluded.token_expires_at,
+        },
+    ).returning(User)
+
+    user = db.execute(
+        select(User).from_statement(stmt),
+        execution_options={"populate_existing": True},
+    ).scalar_one()
+    user_id = user.id
+    db.commit()
 
+    # Tokens and profile fields just changed; drop any stale cached copy.
+    user_cache.invalidate(user_id=user_id, google_id=google_id)
     return user
@@ -0,0 +1,155 @@
+"""Maintenance of the weekly_workload summary table.
+
+Single-event writes apply a +/- delta to the affected cells with one upsert;
+bulk writes recompute the affected users from their events instead.
+Run ``python -m database.workload`` once to backfill existing events.
+"""
+
+from collections import Counter
+from datetime import date
+from typing import Iterable, List, Optional
+
+from planner.workload import event_weeks, total_weeks
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import Event as EventModel
+from .models import WeeklyWorkload
+
+
+def event_counts(event: EventModel) -> Counter:
+    """The workload cells one event contributes to."""
+    return event_weeks(
+        event.start,
+        event.end,
+        event.eventType,
+        event.course_name,
+        event.recurrence,
+        event.time_zone,
+    )
+
+
+def _upsert(db: Session, user_id: int, delta: Counter) -> None:
+    rows = [
+        {
+            "user_id": user_id,
+            "week_start": week,
+            "course_name": course,
+            "event_type": event_type,
+            "count": count,
+        }
+        for (week, course, event_type), count in delta.items()
+        if count
+    ]
+    if not rows:
+        return
+
+    insert = (
+        postgresql.insert
+        if db.get_bind().dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    stmt = insert(WeeklyWorkload)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "week_start", "course_name", "event_type"],
+        set_={"count": WeeklyWorkload.count + stmt.excluded.count},
+    )
+    db.execute(stmt, rows)
+
+
+def apply_workload_delta(db: Session, user_id: int, delta: Counter) -> None:
+    """Add ``delta`` (which may be negative) to a user's cells, dropping
+    cells that reach zero. Runs in the caller's transaction."""
+    _upsert(db, user_id, delta)
+    if any(count < 0 for count in delta.values()):
+        db.execute(
+            delete(WeeklyWorkload).where(
+                WeeklyWorkload.user_id == user_id, WeeklyWorkload.count <= 0
+            )
+        )
+
+
+def record_event_change(
+    db: Session,
+    before: Optional[EventModel] = None,
+    after: Optional[EventModel] = None,
+    before_counts: Optional[Counter] = None,
+    before_user_id: Optional[int] = None,
+) -> None:
+    """Move an event's counts from its old cells to its new ones.
+
+    Pass ``before`` for a delete, ``after`` for a create, and for an update
+    the counts and owner captured before it was modified.
+    """
+    if before is not None:
+        before_counts, before_user_id = event_counts(before), before.user_id
+
+    deltas = {}
+    if before_counts:
+        deltas[before_user_id] = Counter({k: -v for k, v in before_counts.items()})
+    if after is not None:
+        delta = deltas.setdefault(after.user_id, Counter())
+        for key, count in event_counts(after).items():
+            delta[key] += count
+
+    for user_id, delta in deltas.items():
+        apply_workload_delta(db, user_id, delta)
+
+
+def refresh_user_workload(db: Session, user_ids: Iterable[int]) -> None:
+    """Recompute users' cells from their events, after bulk writes."""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    db.execute(delete(WeeklyWorkload).where(WeeklyWorkload.user_id.in_(user_ids)))
+
+    events = db.execute(
+        select(
+            EventModel.user_id,
+            EventModel.start,
+            EventModel.end,
+            EventModel.eventType,
+            EventModel.course_name,
+            EventModel.recurrence,
+            EventModel.time_zone,
+        ).where(EventModel.user_id.in_(user_ids))
+    ).all()
+    by_user = {}
+    for row in events:
+        by_user.setdefault(row.user_id, []).append(row)
+    for user_id, rows in by_user.items():
+        _upsert(db, user_id, total_weeks(rows))
+
+
+def get_workload(
+    db: Session, user_id: int, start: date, end: date
+) -> List[WeeklyWorkload]:
+    """A user's non-empty cells for weeks starting in [start, end)."""
+    stmt = (
+        select(WeeklyWorkload)
+        .where(
+            WeeklyWorkload.user_id == user_id,
+            WeeklyWorkload.week_start >= start,
+            WeeklyWorkload.week_start < end,
+        )
+        .order_by(WeeklyWorkload.week_start)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def backfill() -> None:
+    from .db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_ids = db.execute(select(EventModel.user_id).distinct()).scalars().all()
+        refresh_user_workload(db, user_ids)
+        db.commit()
+        print(f"Rebuilt weekly workload for {len(user_ids)} users")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,229 @@
+"""Per-user event change notifications.
+
+Writes call :func:`publish_event_change` inside their transaction. On Postgres
+that issues ``pg_notify``, which is delivered only if the transaction commits
+and reaches every pod: each process runs a :class:`PostgresListener` thread
+that LISTENs on the channel and hands changes to the in-process :data:`hub`,
+from which the SSE route streams them. On other databases (SQLite in tests)
+changes are dispatched to the local hub after commit instead.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "event_changes"
+# NOTIFY payloads are capped at 8000 bytes; larger events are sent without
+# their body and clients refetch them.
+MAX_PAYLOAD_BYTES = 7900
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+_PENDING_KEY = "pending_event_changes"
+
+
+class ChangeHub:
+    """Fan-out of change dicts to the asyncio queues of subscribed clients."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[
+            int, Set[Tuple[asyncio.Queue, asyncio.AbstractEventLoop]]
+        ] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        entry = (queue, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(entry)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(user_id, set())
+                subscribers.discard(entry)
+                if not subscribers:
+                    self._subscribers.pop(user_id, None)
+
+    def dispatch(self, change: dict) -> None:
+        """Deliver a change to the user's subscribers; safe from any thread."""
+        with self._lock:
+            targets = list(self._subscribers.get(change.get("user_id"), ()))
+        for queue, loop in targets:
+            loop.call_soon_threadsafe(_offer, queue, change)
+
+    def dispatch_all(self, change: dict) -> None:
+        """Deliver a change to every subscriber, e.g. to request a resync."""
+        with self._lock:
+            targets = [
+                (user_id, entry)
+                for user_id, entries in self._subscribers.items()
+                for entry in entries
+            ]
+        for user_id, (queue, loop) in targets:
+            loop.call_soon_threadsafe(_offer, queue, change | {"user_id": user_id})
+
+
+def _offer(queue: asyncio.Queue, change: dict) -> None:
+    try:
+        queue.put_nowait(change)
+    except asyncio.QueueFull:
+        # A stalled client: drop the backlog and tell it to refetch instead.
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"op": "resync", "user_id": change.get("user_id")})
+
+
+hub = ChangeHub()
+
+
+def _encode(change: dict) -> str:
+    payload = json.dumps(change, separators=(",", ":"), default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        change = {k: v for k, v in change.items() if k != "event"}
+        payload = json.dumps(change, separators=(",", ":"), default=str)
+    return payload
+
+
+def change(op: str, user_id: int, event_id: Optional[int] = None, event=None) -> dict:
+    """A change dict. ``op`` is "create", "update" or "delete" for one event,
+    "sync" when the Google mirror changed, or "resync" to make clients refetch.
+    """
+    body = {"op": op, "user_id": user_id, "event_id": event_id}
+    if event is not None:
+        body["event"] = event
+    return body
+
+
+def publish_event_changes(db: Session, changes: List[dict]) -> None:
+    """Queue change notifications in the session's current transaction.
+
+    Nothing is delivered if the transaction rolls back. On Postgres all of
+    them go out in one statement.
+    """
+    if not changes:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload"
+            ),
+            {"channel": CHANNEL, "payloads": [_encode(c) for c in changes]},
+        )
+    else:
+        db.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+def publish_event_change(
+    db: Session,
+    op: str,
+    user_id: int,
+    event_id: Optional[int] = None,
+    event: Optional[dict] = None,
+) -> None:
+    publish_event_changes(db, [change(op, user_id, event_id, event)])
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # a savepoint was released; the outer transaction may still fail
+    for change in session.info.pop(_PENDING_KEY, ()):
+        hub.dispatch(change)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted(session: Session, transaction) -> None:
+    # Runs after _dispatch_committed on commit, so only rolled back or
+    # abandoned changes are left to drop.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+class PostgresListener(threading.Thread):
+    """LISTENs on :data:`CHANNEL` and feeds notifications into the hub.
+
+    Uses its own connection, detached from the pool, and reconnects with
+    backoff if it drops; changes made while disconnected are not replayed,
+    so clients get a "resync" when the listener comes back.
+    """
+
+    def __init__(self, engine: Engine, poll_seconds: float = 5.0):
+        super().__init__(name="event-change-listener", daemon=True)
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self._stopped = threading.Event()
+        self._backoff = 1.0
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        reconnecting = False
+        while not self._stopped.is_set():
+            try:
+                self._listen(resync=reconnecting)
+            except Exception:
+                logger.exception("Event change listener failed; reconnecting")
+            reconnecting = True
+            self._stopped.wait(self._backoff)
+            self._backoff = min(self._backoff * 2, 30.0)
+
+    def _listen(self, resync: bool) -> None:
+        pooled = self.engine.raw_connection()
+        pooled.detach()
+        conn = pooled.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            self._backoff = 1.0
+            if resync:
+                hub.dispatch_all({"op": "resync"})
+            logger.info("Listening for event changes on %s", CHANNEL)
+            while not self._stopped.is_set():
+                readable, _, _ = select.select([conn], [], [], self.poll_seconds)
+                if not readable:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notification = conn.notifies.pop(0)
+                    try:
+                        hub.dispatch(json.loads(notification.payload))
+                    except ValueError:
+                        logger.warning(
+                            "Bad event change payload: %r", notification.payload
+                        )
+        finally:
+            pooled.close()
+
+
+_listener: Optional[PostgresListener] = None
+_listener_lock = threading.Lock()
+
+
+def start_listener(engine: Engine) -> None:
+    """Start this process' LISTEN thread (Postgres only, idempotent)."""
+    global _listener
+    if engine.dialect.name != "postgresql":
+        return
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = PostgresListener(engine)
+            _listener.start()
+
+
+def stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,203 @@
+"""iCalendar (RFC 5545) serialisation for event feeds.
+
+One-off events are written in UTC. Recurring events are written in their
+own IANA zone (``DTSTART;TZID=...``) with a matching VTIMEZONE, so calendar
+apps repeat them at the same local time across DST changes.
+"""
+
+import calendar
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from planner.recurrence import recurrence_lines, resolve_zone
+
+PRODID = "-//Syllabus Scanner//Semester Planner//EN"
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets as RFC 5545 requires."""
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts = []
+    while raw:
+        limit = 75 if not parts else 74  # continuation lines start with a space
+        cut = min(limit, len(raw))
+        # Never split inside a multi-byte UTF-8 sequence.
+        while cut < len(raw) and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode())
+        raw = raw[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _local(value: datetime, zone: ZoneInfo) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(zone).strftime("%Y%m%dT%H%M%S")
+
+
+def _offset(value: timedelta) -> str:
+    minutes = int(value.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def _transitions(zone: ZoneInfo, year: int) -> List[Tuple[datetime, timedelta]]:
+    """UTC instants in ``year`` where ``zone`` changes offset, with the old offset."""
+    found = []
+    day = datetime(year, 1, 1, tzinfo=timezone.utc)
+    before = day.astimezone(zone).utcoffset()
+    while day.year == year:
+        following = day + timedelta(days=1)
+        after = following.astimezone(zone).utcoffset()
+        if after != before:
+            # Bisect to the minute; zones change on whole minutes.
+            low, high = 0, 24 * 60
+            while high - low > 1:
+                middle = (low + high) // 2
+                moment = day + timedelta(minutes=middle)
+                if moment.astimezone(zone).utcoffset() == before:
+                    low = middle
+                else:
+                    high = middle
+            found.append((day + timedelta(minutes=high), before))
+            before = after
+        day = following
+    return found
+
+
+def _yearly_rule(onset: datetime) -> Tuple[str, datetime]:
+    """RRULE for "the nth <weekday> of <month>" at ``onset``, and its 1970 start."""
+    weekday = onset.weekday()
+    days_in_month = calendar.monthrange(onset.year, onset.month)[1]
+    nth = -1 if onset.day + 7 > days_in_month else (onset.day - 1) // 7 + 1
+    code = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")[weekday]
+    rule = f"RRULE:FREQ=YEARLY;BYMONTH={onset.month};BYDAY={nth}{code}"
+    days = [
+        day
+        for week in calendar.monthcalendar(1970, onset.month)
+        if (day := week[weekday])
+    ]
+    first = onset.replace(year=1970, day=days[nth if nth < 0 else nth - 1])
+    return rule, first
+
+
+@lru_cache(maxsize=64)
+def vtimezone(zone_key: str, year: int) -> str:
+    """VTIMEZONE for an IANA zone, using the DST rules in force in ``year``.
+
+    Each offset change becomes a yearly STANDARD/DAYLIGHT rule starting in
+    1970; a zone without DST gets a single fixed STANDARD offset.
+    """
+    zone = ZoneInfo(zone_key)
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{zone_key}"]
+    transitions = _transitions(zone, year)
+    for instant, before in transitions:
+        local = instant.astimezone(zone)
+        kind = "DAYLIGHT" if local.dst() else "STANDARD"
+        onset = (instant + before).replace(tzinfo=None)
+        rule, first = _yearly_rule(onset)
+        lines += [
+            f"BEGIN:{kind}",
+            f"DTSTART:{first.strftime('%Y%m%dT%H%M%S')}",
+            f"TZOFFSETFROM:{_offset(before)}",
+            f"TZOFFSETTO:{_offset(local.utcoffset())}",
+            f"TZNAME:{local.tzname()}",
+            rule,
+            f"END:{kind}",
+        ]
+    if not transitions:
+        local = datetime(year, 1, 1, tzinfo=timezone.utc).astimezone(zone)
+        lines += [
+            "BEGIN:STANDARD",
+            "DTSTART:19700101T000000",
+            f"TZOFFSETFROM:{_offset(local.utcoffset())}",
+            f"TZOFFSETTO:{_offset(local.utcoffset())}",
+            f"TZNAME:{local.tzname()}",
+            "END:STANDARD",
+        ]
+    lines.append("END:VTIMEZONE")
+    return "".join(_fold(line) for line in lines)
+
+
+def _event_zone(event) -> Optional[ZoneInfo]:
+    """The zone a recurring event is written in; None for one-off events."""
+    if not recurrence_lines(event.recurrence):
+        return None
+    return resolve_zone(getattr(event, "time_zone", None))
+
+
+def new_timezones(events: Iterable, emitted: Set[str]) -> str:
+    """VTIMEZONEs for zones ``events`` use that are not yet in ``emitted``."""
+    blocks = []
+    for event in events:
+        zone = _event_zone(event)
+        if zone is not None and zone.key not in emitted:
+            emitted.add(zone.key)
+            blocks.append(vtimezone(zone.key, event.start.year))
+    return "".join(blocks)
+
+
+def calendar_header(name: str) -> str:
+    return "".join(
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(name)}",
+        )
+    )
+
+
+CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+
+def event_to_vevent(event, host: str = "syllabus-scanner") -> str:
+    stamp: Optional[datetime] = getattr(event, "updated_at", None) or event.start
+    zone = _event_zone(event)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.id}@{host}",
+        f"DTSTAMP:{_utc(stamp)}",
+    ]
+    if zone is None:
+        lines += [f"DTSTART:{_utc(event.start)}", f"DTEND:{_utc(event.end)}"]
+    else:
+        lines += [
+            f"DTSTART;TZID={zone.key}:{_local(event.start, zone)}",
+            f"DTEND;TZID={zone.key}:{_local(event.end, zone)}",
+        ]
+    lines.append(f"SUMMARY:{_escape(event.summary)}")
+    if event.description:
+        lines.append(f"DESCRIPTION:{_escape(event.description)}")
+    if event.location:
+        lines.append(f"LOCATION:{_escape(event.location)}")
+    if event.eventType:
+        lines.append(f"CATEGORIES:{_escape(event.eventType.upper())}")
+    if event.course_name:
+        lines.append(f"X-COURSE:{_escape(event.course_name)}")
+    lines.extend(recurrence_lines(event.recurrence))
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
@@ -0,0 +1,184 @@
+"""Reading events across all of a user's selected Google calendars.
+
+The calendar list names the calendars a user shows in Google Calendar; each
+one is then read with its own paginated events.list call. Calendars are
+fetched in parallel on a small thread pool so a request costs about as much
+wall-clock time as its slowest calendar, and every call asks only for the
+fields the app uses.
+
+The pool is shared and long-lived so that each of its threads keeps its own
+Google session (see gcal/http.py) and reuses connections across requests.
+"""
+
+import contextvars
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Sequence, TypeVar
+
+from database.gcal_events import parse_google_time
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from gcal.http import google_session
+from gcal.urls import CALENDAR_LIST_URL, calendar_events_url
+
+load_dotenv()
+
+# Calendars fetched at once per request.
+FETCH_CONCURRENCY = int(os.getenv("GCAL_FETCH_CONCURRENCY", "4"))
+# Threads shared by all requests' calendar fetches.
+FETCH_THREADS = int(os.getenv("GCAL_FETCH_THREADS", "16"))
+
+_fetch_pool = ThreadPoolExecutor(
+    max_workers=FETCH_THREADS, thread_name_prefix="gcal-fetch"
+)
+
+# Partial responses: only what the mirror, the planner and the UI read.
+EVENT_FIELDS = (
+    "items(id,etag,status,summary,description,location,colorId,start,end,"
+    "transparency,recurringEventId,htmlLink,eventType),"
+    "nextPageToken,nextSyncToken"
+)
+CALENDAR_LIST_FIELDS = "items(id,summary,primary,selected,hidden),nextPageToken"
+
+T = TypeVar("T")
+
+_NO_START = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class SyncTokenExpired(Exception):
+    """Google answered 410 Gone: the stored syncToken must be discarded."""
+
+
+def fetch_pages(url: str, access_token: str, params: dict) -> Iterator[dict]:
+    """Yield each page of a Google list call, following nextPageToken."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    page_token = None
+    while True:
+        page_params = dict(params)
+        if page_token:
+            page_params["pageToken"] = page_token
+        resp = google_session().get(url, headers=headers, params=page_params)
+        if resp.status_code == 410:
+            raise SyncTokenExpired()
+        if resp.status_code != 200:
+            raise HTTPException(
+                status_code=resp.status_code, detail="Error fetching calendar events"
+            )
+        data = resp.json()
+        yield data
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def list_calendars(access_token: str) -> List[dict]:
+    """The user's selected calendars as ``{id, summary, primary}``, primary first.
+
+    The primary calendar is recorded under the "primary" alias, which is
+    also where the app writes its own events. Tokens granted before the
+    calendar list scope was requested get a 403; those users see only their
+    primary calendar until they sign in again.
+    """
+    params = {"fields": CALENDAR_LIST_FIELDS, "maxResults": 250}
+    calendars = []
+    try:
+        entries = [
+            entry
+            for page in fetch_pages(CALENDAR_LIST_URL, access_token, params)
+            for entry in page.get("items", [])
+        ]
+    except HTTPException as e:
+        if e.status_code != 403:
+            raise
+        entries = []
+    for entry in entries:
+        primary = bool(entry.get("primary"))
+        if not primary and (not entry.get("selected") or entry.get("hidden")):
+            continue
+        calendars.append(
+            {
+                "id": "primary" if primary else entry["id"],
+                "summary": entry.get("summary"),
+                "primary": primary,
+            }
+        )
+    if not any(calendar["primary"] for calendar in calendars):
+        calendars.append({"id": "primary", "summary": None, "primary": True})
+    calendars.sort(key=lambda calendar: not calendar["primary"])
+    return calendars
+
+
+def fetch_events(access_token: str, calendar_id: str, params: dict) -> List[dict]:
+    """Every event of one calendar matching ``params``, across all pages."""
+    params = {**params, "fields": EVENT_FIELDS}
+    items = []
+    for page in fetch_pages(calendar_events_url(calendar_id), access_token, params):
+        items.extend(page.get("items", []))
+    return items
+
+
+def map_concurrently(fn: Callable[..., T], arguments: Sequence[tuple]) -> List[T]:
+    """``[fn(*args) for args in arguments]``, up to FETCH_CONCURRENCY at a time.
+
+    Calls run on the shared fetch pool, each in a copy of the caller's
+    context so Google calls are still counted against the current request.
+    If any call fails, its exception is re-raised after all of them have
+    finished.
+    """
+    if len(arguments) <= 1:
+        return [fn(*args) for args in arguments]
+    queued = iter(enumerate(arguments))
+    running: Dict[Future, int] = {}
+    finished: List[Future] = [None] * len(arguments)
+
+    def submit_next() -> None:
+        for i, args in queued:
+            context = contextvars.copy_context()
+            running[_fetch_pool.submit(context.run, fn, *args)] = i
+            return
+
+    for _ in range(FETCH_CONCURRENCY):
+        submit_next()
+    while running:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            finished[running.pop(future)] = future
+            submit_next()
+    return [future.result() for future in finished]
+
+
+def _start_key(item: dict) -> datetime:
+    return parse_google_time(item.get("start")) or _NO_START
+
+
+def merge_by_start(streams: Sequence[List[dict]]) -> List[dict]:
+    """Merge per-calendar lists, each already ordered by start, into one."""
+    return list(heapq.merge(*streams, key=_start_key))
+
+
+def fetch_range(
+    access_token: str, calendars: Sequence[dict], time_min: str, time_max: str
+) -> List[dict]:
+    """Events of ``calendars`` in [time_min, time_max), merged by start time.
+
+    Each event carries the ``calendarId`` it came from.
+    """
+    params = {
+        "timeMin": time_min,
+        "timeMax": time_max,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        "maxResults": 2500,
+    }
+    ids = [calendar["id"] for calendar in calendars]
+    results = map_concurrently(
+        fetch_events, [(access_token, calendar_id, params) for calendar_id in ids]
+    )
+    return merge_by_start(
+        [
+            [{**item, "calendarId": calendar_id} for item in items]
+            for calendar_id, items in zip(ids, results)
+        ]
+    )
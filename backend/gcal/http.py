@@ -0,0 +1,22 @@
+import threading
+
+import requests
+from monitoring.hooks import requests_response_hook
+
+_local = threading.local()
+
+
+def google_session() -> requests.Session:
+    """This thread's session for Google API calls.
+
+    requests does not promise that a Session is thread-safe, and calendars
+    are fetched on worker threads, so each thread gets its own. Threads are
+    long-lived (the fetch pool, the server's threadpool, the gcal worker),
+    so keep-alive connections are still reused across requests. Every call
+    is timed into the google_api_* metrics.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.hooks["response"].append(requests_response_hook)
+    return session
@@ -0,0 +1,144 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+
+from database import gcal_jobs as crud_jobs
+from database.models import Event, GoogleCalendarJob
+from planner.recurrence import DEFAULT_TIME_ZONE, recurrence_lines
+from sqlalchemy.orm import Session
+
+
+def google_event_id_for(idempotency_key: str) -> str:
+    """Deterministic Google event id for an insert job.
+
+    Google accepts client-chosen ids (base32hex, which hex digits satisfy), so
+    a retried insert after a lost response gets a 409 instead of a duplicate.
+    """
+    return hashlib.sha1(idempotency_key.encode()).hexdigest()
+
+
+def _time_zone_name(value: datetime, stored: Optional[str] = None) -> str:
+    """IANA zone name for Google; recurring events need one to expand in.
+
+    Prefers the event's stored zone, since datetimes read back from Postgres
+    only carry a fixed UTC offset.
+    """
+    if stored:
+        return stored
+    tzinfo = value.tzinfo
+    name = getattr(tzinfo, "key", None)  # zoneinfo
+    filename = getattr(tzinfo, "_filename", "") or ""  # dateutil tzfile
+    if not name and "zoneinfo/" in filename:
+        name = filename.split("zoneinfo/", 1)[1]
+    return name or DEFAULT_TIME_ZONE
+
+
+def event_to_google_body(event: Event) -> dict:
+    body = {
+        "summary": event.summary,
+        "description": event.description or "",
+        "location": event.location or "",
+        "colorId": event.colorId or "1",
+        "eventType": "default",
+        "start": {
+            "dateTime": event.start.isoformat(),
+            "timeZone": _time_zone_name(event.start, event.time_zone),
+        },
+        "end": {
+            "dateTime": event.end.isoformat(),
+            "timeZone": _time_zone_name(event.end, event.time_zone),
+        },
+    }
+    if event.recurrence:
+        body["recurrence"] = recurrence_lines(event.recurrence)
+    return body
+
+
+def study_block_body(summary: str, start_dt: datetime, end_dt: datetime) -> dict:
+    return {
+        "summary": summary,
+        "description": "Study block created by Study Planner",
+        "colorId": "5",  # Yellow color for study blocks
+        "start": {
+            "dateTime": start_dt.isoformat(),
+            "timeZone": str(start_dt.tzinfo) if start_dt.tzinfo else "America/Chicago",
+        },
+        "end": {
+            "dateTime": end_dt.isoformat(),
+            "timeZone": str(end_dt.tzinfo) if end_dt.tzinfo else "America/Chicago",
+        },
+    }
+
+
+def _body_digest(body: dict) -> str:
+    return hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def enqueue_event_insert(
+    db: Session, user_id: int, event: Event, idempotency_key: Optional[str] = None
+) -> GoogleCalendarJob:
+    key = idempotency_key or f"insert:event:{event.id}"
+    body = event_to_google_body(event)
+    body["id"] = google_event_id_for(key)
+    return crud_jobs.enqueue_job(
+        db,
+        user_id=user_id,
+        action="insert",
+        idempotency_key=key,
+        event_id=event.id,
+        payload=body,
+    )
+
+
+def enqueue_event_update(db: Session, event: Event) -> GoogleCalendarJob:
+    """Queue a patch with the event's current state.
+
+    Keyed on the event's ``version``, which every edit increments, so
+    editing A -> B -> A queues a third job instead of reusing the first,
+    while re-submitting the same edit stays a no-op. The worker skips an
+    update once a newer one for the same event is queued.
+    """
+    body = event_to_google_body(event)
+    key = f"update:event:{event.id}:v{event.version}"
+    return crud_jobs.enqueue_job(
+        db,
+        user_id=event.user_id,
+        action="update",
+        idempotency_key=key,
+        event_id=event.id,
+        google_event_id=event.google_event_id,
+        payload=body,
+    )
+
+
+def enqueue_event_delete(
+    db: Session, user_id: int, google_event_id: str
+) -> GoogleCalendarJob:
+    return crud_jobs.enqueue_job(
+        db,
+        user_id=user_id,
+        action="delete",
+        idempotency_key=f"delete:{user_id}:{google_event_id}",
+        google_event_id=google_event_id,
+    )
+
+
+def enqueue_study_block(
+    db: Session,
+    user_id: int,
+    summary: str,
+    start_dt: datetime,
+    end_dt: datetime,
+    idempotency_key: Optional[str] = None,
+) -> GoogleCalendarJob:
+    body = study_block_body(summary, start_dt, end_dt)
+    key = idempotency_key or f"study-block:{user_id}:{_body_digest(body)}"
+    body["id"] = google_event_id_for(key)
+    return crud_jobs.enqueue_job(
+        db,
+        user_id=user_id,
+        action="insert",
+        idempotency_key=key,
+        payload=body,
+    )
@@ -0,0 +1,181 @@
+import datetime
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from database import gcal_events as crud_gcal
+from database.models import User
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from feeds.changes import publish_event_change
+from gcal.calendars import (
+    EVENT_FIELDS,
+    SyncTokenExpired,
+    fetch_pages,
+    list_calendars,
+    map_concurrently,
+)
+from gcal.urls import calendar_events_url
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# How far back the initial full sync reaches; older ranges are proxied live.
+MIRROR_DAYS_BACK = int(os.getenv("GCAL_MIRROR_DAYS_BACK", "180"))
+# Views within this many seconds of the last sync are served straight from the mirror.
+SYNC_MIN_INTERVAL = int(os.getenv("GCAL_SYNC_MIN_INTERVAL", "15"))
+# The calendar list changes rarely; re-read it at most this often.
+CALENDAR_LIST_TTL = int(os.getenv("GCAL_CALENDAR_LIST_TTL", "600"))
+
+PRIMARY_ONLY = [{"id": "primary", "summary": None, "primary": True}]
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def mirror_window_start(db: Session, user_id: int):
+    state = crud_gcal.get_sync_state(db, user_id)
+    return _as_utc(state.window_start) if state.window_start else None
+
+
+def selected_calendars(db: Session, user_id: int) -> List[dict]:
+    """The calendars mirrored for a user, as of their last sync."""
+    return crud_gcal.get_sync_state(db, user_id).calendars or PRIMARY_ONLY
+
+
+def _refresh_calendar_list(
+    state, access_token: str, now: datetime.datetime, force: bool
+) -> List[dict]:
+    if (
+        not force
+        and state.calendars
+        and state.calendars_synced_at
+        and (now - _as_utc(state.calendars_synced_at)).total_seconds()
+        < CALENDAR_LIST_TTL
+    ):
+        return state.calendars
+    state.calendars = list_calendars(access_token)
+    state.calendars_synced_at = now
+    return state.calendars
+
+
+# (items, nextSyncToken, whether the items replace the calendar's mirror)
+CalendarChanges = Tuple[List[dict], Optional[str], bool]
+
+
+def _read_changes(
+    access_token: str, calendar_id: str, params: dict
+) -> Tuple[List[dict], Optional[str]]:
+    params = {
+        **params,
+        "singleEvents": True,
+        "showDeleted": True,
+        "maxResults": 2500,
+        "fields": EVENT_FIELDS,
+    }
+    items, sync_token = [], None
+    for page in fetch_pages(calendar_events_url(calendar_id), access_token, params):
+        items.extend(page.get("items", []))
+        sync_token = page.get("nextSyncToken") or sync_token
+    return items, sync_token
+
+
+def _fetch_calendar_changes(
+    access_token: str,
+    calendar: dict,
+    sync_token: Optional[str],
+    window_start: datetime.datetime,
+) -> Optional[CalendarChanges]:
+    """Changes to one calendar since ``sync_token``, or all of its events in
+    the mirror window when there is no token or Google expired it.
+
+    Runs on a worker thread, so it only talks to Google. Returns None when
+    a secondary calendar cannot be read (e.g. it was just unshared); the
+    primary calendar's errors propagate.
+    """
+    try:
+        if sync_token:
+            try:
+                params = {"syncToken": sync_token}
+                return _read_changes(access_token, calendar["id"], params) + (False,)
+            except SyncTokenExpired:
+                pass
+        params = {"timeMin": window_start.isoformat()}
+        return _read_changes(access_token, calendar["id"], params) + (True,)
+    except HTTPException as e:
+        if calendar.get("primary"):
+            raise
+        logger.warning(
+            "Skipping calendar %s: Google answered %s", calendar["id"], e.status_code
+        )
+        return None
+
+
+def sync_user_calendar(db: Session, user: User, force: bool = False) -> None:
+    """Bring the user's Google Calendar mirror up to date.
+
+    Every selected calendar is fetched in parallel, each incrementally with
+    its own stored syncToken so only changed events come back; a calendar
+    is fully re-read on first use or when Google invalidates its token.
+    Calendars the user deselects are dropped from the mirror.
+    """
+    state = crud_gcal.get_sync_state(db, user.id, lock=True)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    tokens = dict(state.sync_tokens or {})
+
+    if (
+        not force
+        and tokens
+        and state.last_synced_at
+        and (now - _as_utc(state.last_synced_at)).total_seconds() < SYNC_MIN_INTERVAL
+    ):
+        return
+
+    calendars = _refresh_calendar_list(state, user.access_token, now, force)
+    changed = 0
+
+    if not tokens or state.window_start is None:
+        changed += crud_gcal.clear_mirror(db, user.id)
+        state.window_start = now - datetime.timedelta(days=MIRROR_DAYS_BACK)
+        tokens = {}
+    window_start = _as_utc(state.window_start)
+
+    selected = {calendar["id"] for calendar in calendars}
+    dropped = [calendar_id for calendar_id in tokens if calendar_id not in selected]
+    if dropped:
+        changed += crud_gcal.clear_mirror(db, user.id, dropped)
+
+    results = map_concurrently(
+        _fetch_calendar_changes,
+        [
+            (user.access_token, calendar, tokens.get(calendar["id"]), window_start)
+            for calendar in calendars
+        ],
+    )
+
+    # Writes stay on this thread and this session's transaction.
+    new_tokens = {}
+    for calendar, result in zip(calendars, results):
+        calendar_id = calendar["id"]
+        if result is None:
+            if calendar_id in tokens:
+                new_tokens[calendar_id] = tokens[calendar_id]
+            state.calendars_synced_at = None  # re-read the list next time
+            continue
+        items, sync_token, replace = result
+        if replace:
+            changed += crud_gcal.clear_mirror(db, user.id, [calendar_id])
+        changed += crud_gcal.apply_google_items(db, user.id, items, calendar_id)
+        if sync_token:
+            new_tokens[calendar_id] = sync_token
+
+    if changed:
+        publish_event_change(db, "sync", user.id)
+    state.sync_tokens = new_tokens
+    state.last_synced_at = now
+    db.commit()
@@ -0,0 +1,24 @@
+import os
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Point these at loadtest.fake_google (or any stand-in) to run without Google.
+GOOGLE_API_BASE_URL = os.getenv(
+    "GOOGLE_API_BASE_URL", "https://www.googleapis.com"
+).rstrip("/")
+GOOGLE_ACCOUNTS_BASE_URL = os.getenv(
+    "GOOGLE_ACCOUNTS_BASE_URL", "https://accounts.google.com"
+).rstrip("/")
+
+CALENDAR_API_URL = f"{GOOGLE_API_BASE_URL}/calendar/v3"
+CALENDAR_LIST_URL = f"{CALENDAR_API_URL}/users/me/calendarList"
+USERINFO_URL = f"{GOOGLE_API_BASE_URL}/oauth2/v3/userinfo"
+OIDC_DISCOVERY_URL = f"{GOOGLE_ACCOUNTS_BASE_URL}/.well-known/openid-configuration"
+
+
+def calendar_events_url(calendar_id: str = "primary") -> str:
+    # Secondary calendar ids look like "abc@group.calendar.google.com"
+    return f"{CALENDAR_API_URL}/calendars/{quote(calendar_id, safe='')}/events"
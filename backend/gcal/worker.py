@@ -0,0 +1,200 @@
+"""Background worker that drains the gcal_jobs queue.
+
+Run alongside the API with ``python -m gcal.worker`` from the backend folder.
+"""
+
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+import requests
+from database import gcal_events as crud_gcal
+from database import gcal_jobs as crud_jobs
+from database.db import SessionLocal
+from database.models import Event, GoogleCalendarJob, User
+from dotenv import load_dotenv
+from gcal.http import google_session
+from gcal.urls import calendar_events_url
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVENTS_URL = calendar_events_url()
+
+USER_RATE = float(os.getenv("GCAL_USER_RATE", "5"))  # writes per second
+USER_BURST = float(os.getenv("GCAL_USER_BURST", "10"))
+MAX_ATTEMPTS = int(os.getenv("GCAL_MAX_ATTEMPTS", "8"))
+BACKOFF_BASE = float(os.getenv("GCAL_BACKOFF_BASE", "2"))
+BACKOFF_MAX = float(os.getenv("GCAL_BACKOFF_MAX", "600"))
+POLL_INTERVAL = float(os.getenv("GCAL_WORKER_POLL_INTERVAL", "1"))
+
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class RetryableError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PermanentError(Exception):
+    pass
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, capped at BACKOFF_MAX."""
+    ceiling = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** max(attempts - 1, 0)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _error_reason(resp: requests.Response) -> str:
+    try:
+        errors = resp.json().get("error", {}).get("errors", [])
+        return errors[0].get("reason", "") if errors else ""
+    except ValueError:
+        return ""
+
+
+def _check_response(resp: requests.Response) -> None:
+    if resp.status_code < 400:
+        return
+    retry_after = resp.headers.get("Retry-After")
+    retry_after = float(retry_after) if retry_after and retry_after.isdigit() else None
+    if resp.status_code == 429 or resp.status_code >= 500:
+        raise RetryableError(f"Google returned {resp.status_code}", retry_after)
+    if resp.status_code == 403 and _error_reason(resp) in _RATE_LIMIT_REASONS:
+        raise RetryableError("Google rate limit exceeded", retry_after)
+    raise PermanentError(f"Google returned {resp.status_code}: {resp.text[:200]}")
+
+
+def _run_insert(headers: dict, job: GoogleCalendarJob) -> dict:
+    resp = google_session().post(EVENTS_URL, headers=headers, json=job.payload)
+    if resp.status_code == 409 and job.payload.get("id"):
+        # An earlier attempt already created it; fetch the existing copy.
+        resp = google_session().get(
+            f"{EVENTS_URL}/{job.payload['id']}", headers=headers
+        )
+    _check_response(resp)
+    return resp.json()
+
+
+def _run_update(headers: dict, job: GoogleCalendarJob) -> dict:
+    url = f"{EVENTS_URL}/{job.google_event_id}"
+    resp = google_session().patch(url, headers=headers, json=job.payload)
+    _check_response(resp)
+    return resp.json()
+
+
+def _run_delete(headers: dict, job: GoogleCalendarJob) -> dict:
+    resp = google_session().delete(
+        f"{EVENTS_URL}/{job.google_event_id}", headers=headers
+    )
+    if resp.status_code in (404, 410):
+        # Already gone, which is what a delete wants.
+        return {"id": job.google_event_id, "status": "cancelled"}
+    _check_response(resp)
+    return {"id": job.google_event_id, "status": "cancelled"}
+
+
+_ACTIONS = {"insert": _run_insert, "update": _run_update, "delete": _run_delete}
+
+
+def _apply_result(db: Session, job: GoogleCalendarJob, result: dict) -> None:
+    """Reflect a finished write in the events table and the gcal mirror."""
+    if job.action == "insert":
+        job.google_event_id = result.get("id")
+    if job.action == "insert" and job.event_id is not None:
+        event = db.get(Event, job.event_id)
+        if event is not None:
+            event.google_event_id = result.get("id")
+    crud_gcal.apply_google_items(db, job.user_id, [result])
+
+
+def execute_job(db: Session, job: GoogleCalendarJob) -> None:
+    """Run one claimed job and record its outcome on the queue."""
+    wait = crud_jobs.take_rate_limit_token(db, job.user_id, USER_RATE, USER_BURST)
+    if wait > 0:
+        crud_jobs.reschedule_job(db, job, wait, count_attempt=False)
+        return
+
+    user = db.get(User, job.user_id)
+    if user is None:
+        crud_jobs.fail_job(db, job, "User not found")
+        return
+
+    if crud_jobs.is_superseded(db, job):
+        crud_jobs.skip_job(db, job, "Superseded by a newer update")
+        return
+
+    headers = {
+        "Authorization": f"Bearer {user.access_token}",
+        "Content-Type": "application/json",
+    }
+
+    try:
+        result = _ACTIONS[job.action](headers, job)
+    except (RetryableError, requests.RequestException) as e:
+        if job.attempts >= MAX_ATTEMPTS:
+            crud_jobs.fail_job(db, job, str(e))
+            return
+        delay = backoff_delay(job.attempts)
+        retry_after = getattr(e, "retry_after", None)
+        if retry_after:
+            delay = max(delay, retry_after)
+        crud_jobs.reschedule_job(db, job, delay, error=str(e))
+        return
+    except PermanentError as e:
+        crud_jobs.fail_job(db, job, str(e))
+        return
+
+    _apply_result(db, job, result)
+    crud_jobs.complete_job(db, job, result)
+
+
+def _handle_crash(db: Session, job_id: int, error: Exception) -> None:
+    """Record an unexpected error so one bad job cannot crash-loop the worker.
+
+    The job is retried with backoff like a transient Google error, and
+    failed once it runs out of attempts.
+    """
+    logger.exception("gcal job %s crashed", job_id)
+    db.rollback()
+    job = db.get(GoogleCalendarJob, job_id)
+    if job is None:
+        return
+    message = f"{type(error).__name__}: {error}"
+    if job.attempts >= MAX_ATTEMPTS:
+        crud_jobs.fail_job(db, job, message)
+    else:
+        crud_jobs.reschedule_job(db, job, backoff_delay(job.attempts), error=message)
+
+
+def run_forever() -> None:
+    while True:
+        db = SessionLocal()
+        try:
+            job = crud_jobs.claim_next_job(db)
+            if job is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+            job_id = job.id
+            try:
+                execute_job(db, job)
+            except Exception as e:
+                try:
+                    _handle_crash(db, job_id, e)
+                except Exception:
+                    # Even recording failed (e.g. the database is down); the
+                    # job's lease runs out and it is claimed again later.
+                    logger.exception("Could not record failure of gcal job %s", job_id)
+                    db.rollback()
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    run_forever()
@@ -0,0 +1,412 @@
+"""In-memory stand-in for the Google endpoints the backend talks to.
+
+Serves OIDC discovery, the OAuth authorize/token pair, userinfo, the
+calendar list, Calendar events (list with paging and syncToken, insert, get,
+patch, delete) and the Calendar batch endpoint, with configurable latency,
+429s and 5xx errors. Each user has a primary calendar, ``--extra-calendars``
+selected secondary ones and one unselected calendar.
+
+    python -m loadtest.fake_google --port 9100 --latency-ms 80 --rate-429 0.02
+
+then start the backend with GOOGLE_API_BASE_URL and GOOGLE_ACCOUNTS_BASE_URL
+set to http://localhost:9100.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+import uvicorn
+from fastapi import FastAPI, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_error: float = 0.0
+    seed_events: int = 50
+    extra_calendars: int = 2
+
+
+@dataclass
+class FakeCalendar:
+    events: Dict[str, dict] = field(default_factory=dict)
+    # event id -> change sequence number, used to answer syncToken requests
+    changed_at: Dict[str, int] = field(default_factory=dict)
+    seq: int = 0
+
+    def touch(self, event: dict) -> None:
+        self.seq += 1
+        event["etag"] = f'"{self.seq}"'
+        event["updated"] = datetime.now(timezone.utc).isoformat()
+        self.events[event["id"]] = event
+        self.changed_at[event["id"]] = self.seq
+
+
+config = FaultConfig()
+calendars: Dict[str, Dict[str, FakeCalendar]] = {}
+app = FastAPI(title="Fake Google")
+
+
+def _google_error(code: int, reason: str, message: str) -> JSONResponse:
+    body = {
+        "error": {
+            "code": code,
+            "message": message,
+            "errors": [{"reason": reason, "message": message}],
+        }
+    }
+    return JSONResponse(body, status_code=code, headers={"Retry-After": "1"})
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    if config.latency_ms or config.jitter_ms:
+        delay = random.gauss(config.latency_ms, config.jitter_ms) / 1000
+        await asyncio.sleep(max(delay, 0))
+    roll = random.random()
+    if roll < config.rate_429:
+        return _google_error(429, "rateLimitExceeded", "Rate Limit Exceeded")
+    if roll < config.rate_429 + config.rate_error:
+        return _google_error(503, "backendError", "Backend Error")
+    return await call_next(request)
+
+
+# ── OAuth / OIDC ─────────────────────────────────────────────────────────────
+def _subject_from_token(request: Request) -> str:
+    auth = request.headers.get("Authorization", "")
+    token = auth.removeprefix("Bearer ").strip()
+    if not token.startswith("fake-"):
+        raise HTTPException(status_code=401, detail="Invalid Credentials")
+    return token.split("-")[1]
+
+
+@app.get("/.well-known/openid-configuration")
+def discovery(request: Request):
+    base = str(request.base_url).rstrip("/")
+    return {
+        "issuer": base,
+        "authorization_endpoint": f"{base}/o/oauth2/v2/auth",
+        "token_endpoint": f"{base}/token",
+        "userinfo_endpoint": f"{base}/oauth2/v3/userinfo",
+        "jwks_uri": f"{base}/oauth2/v3/certs",
+        "response_types_supported": ["code"],
+        "subject_types_supported": ["public"],
+        "id_token_signing_alg_values_supported": ["RS256"],
+    }
+
+
+@app.get("/oauth2/v3/certs")
+def certs():
+    return {"keys": []}
+
+
+@app.get("/o/oauth2/v2/auth")
+def authorize(redirect_uri: str, state: str, login_hint: Optional[str] = None):
+    # Tokens carry the subject so later calls need no server-side lookup.
+    subject = login_hint or uuid.uuid4().hex[:12]
+    code = f"{subject}.{secrets.token_hex(4)}"
+    return RedirectResponse(
+        f"{redirect_uri}?{urlencode({'code': code, 'state': state})}"
+    )
+
+
+@app.post("/token")
+def token(code: str = Form(...)):
+    subject = code.split(".")[0]
+    return {
+        "access_token": f"fake-{subject}-{secrets.token_hex(8)}",
+        "expires_in": 3599,
+        "token_type": "Bearer",
+        "scope": (
+            "openid email profile https://www.googleapis.com/auth/calendar.events "
+            "https://www.googleapis.com/auth/calendar.calendarlist.readonly"
+        ),
+    }
+
+
+@app.get("/oauth2/v3/userinfo")
+def userinfo(request: Request):
+    subject = _subject_from_token(request)
+    return {
+        "sub": subject,
+        "email": f"{subject}@example.edu",
+        "name": f"Load Test {subject}",
+    }
+
+
+# ── Calendar ────────────────────────────────────────────────────────────────
+def _seed(calendar: FakeCalendar, count: int) -> None:
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    for _ in range(count):
+        start = now + timedelta(hours=random.randint(-24 * 90, 24 * 90))
+        end = start + timedelta(minutes=random.choice([30, 50, 60, 90, 120]))
+        calendar.touch(
+            {
+                "kind": "calendar#event",
+                "id": uuid.uuid4().hex,
+                "status": "confirmed",
+                "summary": random.choice(["Lecture", "Work shift", "Club", "Gym"]),
+                "start": {"dateTime": start.isoformat()},
+                "end": {"dateTime": end.isoformat()},
+            }
+        )
+
+
+def _calendar_for(subject: str, calendar_id: str) -> FakeCalendar:
+    if calendar_id == subject:
+        calendar_id = "primary"  # the primary calendar's id is the user's own
+    user_calendars = calendars.setdefault(subject, {})
+    if calendar_id not in user_calendars:
+        user_calendars[calendar_id] = FakeCalendar()
+        _seed(user_calendars[calendar_id], config.seed_events)
+    return user_calendars[calendar_id]
+
+
+def _event_start(event: dict) -> str:
+    return event["start"].get("dateTime") or event["start"].get("date") or ""
+
+
+def _event_time(event: dict, key: str) -> datetime:
+    value = event[key].get("dateTime") or f"{event[key]['date']}T00:00:00+00:00"
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _list_events(calendar: FakeCalendar, params: dict) -> dict:
+    max_results = min(int(params.get("maxResults", 250)), 2500)
+    offset = int(params.get("pageToken") or 0)
+    sync_token = params.get("syncToken")
+
+    if sync_token:
+        if not sync_token.isdigit() or int(sync_token) > calendar.seq:
+            raise HTTPException(status_code=410, detail="Sync token is no longer valid")
+        since = int(sync_token)
+        items = [
+            calendar.events[eid]
+            for eid, seq in calendar.changed_at.items()
+            if seq > since
+        ]
+    else:
+        show_deleted = str(params.get("showDeleted", "")).lower() == "true"
+        items = [
+            e
+            for e in calendar.events.values()
+            if show_deleted or e.get("status") != "cancelled"
+        ]
+        time_min = params.get("timeMin")
+        time_max = params.get("timeMax")
+        if time_min:
+            lo = datetime.fromisoformat(time_min.replace("Z", "+00:00"))
+            items = [
+                e
+                for e in items
+                if _event_time(e, "end") > lo or e.get("status") == "cancelled"
+            ]
+        if time_max:
+            hi = datetime.fromisoformat(time_max.replace("Z", "+00:00"))
+            items = [e for e in items if _event_time(e, "start") < hi]
+        items.sort(key=_event_start)
+
+    page = items[offset : offset + max_results]
+    body = {"kind": "calendar#events", "etag": f'"{calendar.seq}"', "items": page}
+    if offset + max_results < len(items):
+        body["nextPageToken"] = str(offset + max_results)
+    else:
+        body["nextSyncToken"] = str(calendar.seq)
+    return body
+
+
+def _insert_event(calendar: FakeCalendar, body: dict) -> dict:
+    event_id = body.get("id") or uuid.uuid4().hex
+    if (
+        event_id in calendar.events
+        and calendar.events[event_id]["status"] != "cancelled"
+    ):
+        raise HTTPException(
+            status_code=409, detail="The requested identifier already exists."
+        )
+    event = {**body, "kind": "calendar#event", "id": event_id, "status": "confirmed"}
+    calendar.touch(event)
+    return event
+
+
+def _get_event(calendar: FakeCalendar, event_id: str) -> dict:
+    event = calendar.events.get(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return event
+
+
+def _patch_event(calendar: FakeCalendar, event_id: str, body: dict) -> dict:
+    event = {**_get_event(calendar, event_id), **body, "id": event_id}
+    calendar.touch(event)
+    return event
+
+
+def _delete_event(calendar: FakeCalendar, event_id: str) -> None:
+    event = _get_event(calendar, event_id)
+    if event["status"] == "cancelled":
+        raise HTTPException(status_code=410, detail="Resource has been deleted")
+    calendar.touch(
+        {
+            "id": event_id,
+            "status": "cancelled",
+            "start": event["start"],
+            "end": event["end"],
+        }
+    )
+
+
+@app.get("/calendar/v3/users/me/calendarList")
+def calendar_list(request: Request):
+    subject = _subject_from_token(request)
+    items = [
+        {
+            "kind": "calendar#calendarListEntry",
+            "id": subject,
+            "summary": subject,
+            "primary": True,
+            "selected": True,
+            "accessRole": "owner",
+        }
+    ]
+    for index in range(config.extra_calendars):
+        items.append(
+            {
+                "kind": "calendar#calendarListEntry",
+                "id": f"extra{index}-{subject}@group.calendar.google.com",
+                "summary": f"Calendar {index + 1}",
+                "selected": True,
+                "accessRole": "owner",
+            }
+        )
+    items.append(
+        {
+            "kind": "calendar#calendarListEntry",
+            "id": "en.usa#holiday@group.v.calendar.google.com",
+            "summary": "Holidays in United States",
+            "accessRole": "reader",
+        }
+    )
+    return {"kind": "calendar#calendarList", "items": items}
+
+
+@app.get("/calendar/v3/calendars/{calendar_id}/events")
+def list_events(calendar_id: str, request: Request):
+    calendar = _calendar_for(_subject_from_token(request), calendar_id)
+    return _list_events(calendar, dict(request.query_params))
+
+
+@app.post("/calendar/v3/calendars/{calendar_id}/events")
+async def insert_event(calendar_id: str, request: Request):
+    calendar = _calendar_for(_subject_from_token(request), calendar_id)
+    return _insert_event(calendar, await request.json())
+
+
+@app.get("/calendar/v3/calendars/{calendar_id}/events/{event_id}")
+def get_event(calendar_id: str, event_id: str, request: Request):
+    calendar = _calendar_for(_subject_from_token(request), calendar_id)
+    return _get_event(calendar, event_id)
+
+
+@app.patch("/calendar/v3/calendars/{calendar_id}/events/{event_id}")
+async def patch_event(calendar_id: str, event_id: str, request: Request):
+    calendar = _calendar_for(_subject_from_token(request), calendar_id)
+    return _patch_event(calendar, event_id, await request.json())
+
+
+@app.delete("/calendar/v3/calendars/{calendar_id}/events/{event_id}")
+def delete_event(calendar_id: str, event_id: str, request: Request):
+    calendar = _calendar_for(_subject_from_token(request), calendar_id)
+    _delete_event(calendar, event_id)
+    return Response(status_code=204)
+
+
+def _dispatch_batch_part(subject: str, method: str, path: str, body: Optional[dict]):
+    """Route one batched sub-request; returns (status, json body)."""
+    parts = path.split("?")[0].strip("/").split("/")
+    # calendar/v3/calendars/{calendar_id}/events[/{event_id}]
+    if len(parts) < 5 or parts[:3] != ["calendar", "v3", "calendars"]:
+        return 404, {"error": {"code": 404, "message": "Not Found"}}
+    calendar = _calendar_for(subject, parts[3])
+    event_id = parts[5] if len(parts) > 5 else None
+    try:
+        if method == "POST" and event_id is None:
+            return 200, _insert_event(calendar, body or {})
+        if method == "GET" and event_id:
+            return 200, _get_event(calendar, event_id)
+        if method == "PATCH" and event_id:
+            return 200, _patch_event(calendar, event_id, body or {})
+        if method == "DELETE" and event_id:
+            _delete_event(calendar, event_id)
+            return 204, None
+    except HTTPException as e:
+        return e.status_code, {"error": {"code": e.status_code, "message": e.detail}}
+    return 405, {"error": {"code": 405, "message": "Method Not Allowed"}}
+
+
+@app.post("/batch/calendar/v3")
+async def batch(request: Request):
+    subject = _subject_from_token(request)
+    content_type = request.headers.get("Content-Type", "")
+    boundary = content_type.split("boundary=")[-1].strip('"')
+    raw = (await request.body()).decode()
+
+    responses: List[str] = []
+    for chunk in raw.split(f"--{boundary}")[1:]:
+        if chunk.startswith("--"):
+            break
+        # MIME headers, blank line, then the embedded HTTP request.
+        _, _, http_part = chunk.replace("\r\n", "\n").partition("\n\n")
+        request_line, _, rest = http_part.strip().partition("\n")
+        _, _, body_text = rest.partition("\n\n")
+        method, path = request_line.split()[:2]
+        body = json.loads(body_text) if body_text.strip() else None
+
+        status, payload = _dispatch_batch_part(subject, method, path, body)
+        text = json.dumps(payload) if payload is not None else ""
+        responses.append(
+            f"--batch_fake\r\nContent-Type: application/http\r\n\r\n"
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n\r\n{text}\r\n"
+        )
+
+    return Response(
+        "".join(responses) + "--batch_fake--\r\n",
+        media_type="multipart/mixed; boundary=batch_fake",
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=9100)
+    arg_parser.add_argument("--latency-ms", type=float, default=0.0)
+    arg_parser.add_argument("--jitter-ms", type=float, default=0.0)
+    arg_parser.add_argument("--rate-429", type=float, default=0.0)
+    arg_parser.add_argument("--rate-error", type=float, default=0.0)
+    arg_parser.add_argument("--seed-events", type=int, default=50)
+    arg_parser.add_argument("--extra-calendars", type=int, default=2)
+    args = arg_parser.parse_args()
+
+    config.latency_ms = args.latency_ms
+    config.jitter_ms = args.jitter_ms
+    config.rate_429 = args.rate_429
+    config.rate_error = args.rate_error
+    config.seed_events = args.seed_events
+    config.extra_calendars = args.extra_calendars
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
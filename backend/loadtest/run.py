@@ -0,0 +1,288 @@
+"""Load-test the auth and gcal routes against a running backend.
+
+Start loadtest.fake_google, point the backend at it (see that module), then:
+
+    python -m loadtest.run --base-url http://localhost:8000 \\
+        --users 20 --concurrency 50 --duration 30
+
+Each virtual user logs in through the real OAuth flow, then workers issue
+requests round-robin over the selected routes. The report lists throughput,
+error counts and p50/p95/p99 latency per route.
+
+``--logins-only`` benchmarks a login storm instead: every virtual user goes
+through /auth/login and /auth/callback concurrently and nothing else runs.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+
+@dataclass
+class VirtualUser:
+    user_id: int
+    jwt_token: str
+    event_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class RouteStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, elapsed: float, status: int) -> None:
+        self.latencies.append(elapsed)
+        self.statuses[status] += 1
+
+    @property
+    def errors(self) -> int:
+        return sum(n for code, n in self.statuses.items() if not 200 <= code < 400)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+
+
+async def timed(name: str, request: Awaitable[httpx.Response]) -> httpx.Response:
+    start = time.perf_counter()
+    try:
+        resp = await request
+    except httpx.HTTPError:
+        stats[name].record(time.perf_counter() - start, 599)
+        raise
+    stats[name].record(time.perf_counter() - start, resp.status_code)
+    return resp
+
+
+# ── Login ───────────────────────────────────────────────────────────────────
+async def login(base_url: str, subject: str) -> Optional[VirtualUser]:
+    """Walk /auth/login -> fake authorize -> /auth/callback -> /auth/verify."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        resp = await timed("auth.login", client.get("/auth/login"))
+        authorize_url = resp.headers.get("location")
+        if not authorize_url:
+            return None
+
+        resp = await client.get(f"{authorize_url}&login_hint={subject}")
+        callback_url = resp.headers.get("location")
+        if not callback_url:
+            return None
+
+        resp = await timed("auth.callback", client.get(callback_url))
+        frontend_url = resp.headers.get("location", "")
+        jwt_token = parse_qs(urlparse(frontend_url).query).get("jwt_token", [None])[0]
+        if not jwt_token:
+            return None
+
+        resp = await client.post("/auth/verify", json={"token": jwt_token})
+        if resp.status_code != 200:
+            return None
+        return VirtualUser(user_id=resp.json()["user"]["id"], jwt_token=jwt_token)
+
+
+# ── Scenarios ───────────────────────────────────────────────────────────────
+def _week_window() -> tuple:
+    start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)
+    start += timedelta(days=7 * random.randint(-4, 8))
+    return start.isoformat(), (start + timedelta(days=7)).isoformat()
+
+
+async def auth_verify(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    await timed(
+        "auth.verify", client.post("/auth/verify", json={"token": user.jwt_token})
+    )
+
+
+async def auth_session(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    await timed(
+        "auth.session", client.get("/auth/session", params={"user_id": user.user_id})
+    )
+
+
+async def gcal_events(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    start, end = _week_window()
+    params = {"user_id": user.user_id, "start_date": start, "end_date": end}
+    await timed("gcal.events", client.get("/gcal/events", params=params))
+
+
+async def gcal_add_event(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    start = datetime.now(timezone.utc) + timedelta(hours=random.randint(1, 24 * 60))
+    resp = await client.post(
+        "/events",
+        json={
+            "user_id": user.user_id,
+            "summary": "Load test event",
+            "eventType": "assignment",
+            "start": start.isoformat(),
+            "end": (start + timedelta(hours=1)).isoformat(),
+            "google_event_id": None,
+            "description": None,
+            "location": None,
+            "colorId": None,
+            "recurrence": None,
+            "course_name": "LOAD 101",
+        },
+    )
+    if resp.status_code != 200:
+        stats["gcal.add_event"].record(0.0, resp.status_code)
+        return
+    params = {"user_id": user.user_id, "event_id": resp.json()["id"]}
+    await timed("gcal.add_event", client.post("/gcal/add-event", params=params))
+
+
+async def gcal_free_slots(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    start, end = _week_window()
+    await timed(
+        "gcal.free_slots",
+        client.post(
+            "/gcal/free-slots",
+            params={"user_id": user.user_id},
+            json={"start": start, "end": end, "block_minutes": 60},
+        ),
+    )
+
+
+SCENARIOS: Dict[str, Callable[[httpx.AsyncClient, VirtualUser], Awaitable[None]]] = {
+    "auth.verify": auth_verify,
+    "auth.session": auth_session,
+    "gcal.events": gcal_events,
+    "gcal.add_event": gcal_add_event,
+    "gcal.free_slots": gcal_free_slots,
+}
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    users: List[VirtualUser],
+    routes: List[str],
+    deadline: float,
+    remaining: List[int],
+) -> None:
+    i = random.randrange(len(routes))
+    while time.perf_counter() < deadline and remaining[0] != 0:
+        remaining[0] -= 1
+        route = routes[i % len(routes)]
+        i += 1
+        try:
+            await SCENARIOS[route](client, random.choice(users))
+        except httpx.HTTPError:
+            pass
+
+
+def report(elapsed: float, as_json: bool) -> None:
+    rows = []
+    for name, route in sorted(stats.items()):
+        rows.append(
+            {
+                "route": name,
+                "requests": len(route.latencies),
+                "errors": route.errors,
+                "statuses": dict(route.statuses),
+                "rps": len(route.latencies) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(route.latencies, 50) * 1000,
+                "p95_ms": percentile(route.latencies, 95) * 1000,
+                "p99_ms": percentile(route.latencies, 99) * 1000,
+            }
+        )
+    if as_json:
+        print(json.dumps({"elapsed_s": elapsed, "routes": rows}, indent=2))
+        return
+
+    header = (
+        f"{'route':<18}{'reqs':>8}{'errs':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['route']:<18}{row['requests']:>8}{row['errors']:>7}"
+            f"{row['rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['p99_ms']:>9.1f}"
+        )
+    print(f"\nelapsed {elapsed:.1f}s (latencies in ms)")
+
+
+async def run(args: argparse.Namespace) -> None:
+    run_id = f"{int(time.time())}"
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited_login(n: int):
+        async with semaphore:
+            try:
+                return await login(args.base_url, f"lt{run_id}u{n}")
+            except httpx.HTTPError:
+                return None
+
+    start = time.perf_counter()
+    logins = await asyncio.gather(*(limited_login(n) for n in range(args.users)))
+    if args.logins_only:
+        report(time.perf_counter() - start, args.json)
+        return
+
+    users = [u for u in logins if u is not None]
+    if not users:
+        raise SystemExit(
+            "No virtual users could log in; is the backend pointed at the fake?"
+        )
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=30, limits=limits
+    ) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        remaining = [args.requests or -1]
+        await asyncio.gather(
+            *(
+                worker(client, users, args.routes, deadline, remaining)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    report(elapsed, args.json)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--base-url", default="http://localhost:8000")
+    arg_parser.add_argument("--users", type=int, default=10)
+    arg_parser.add_argument("--concurrency", type=int, default=20)
+    arg_parser.add_argument("--duration", type=float, default=30.0)
+    arg_parser.add_argument(
+        "--requests", type=int, default=0, help="stop after N requests (0 = no cap)"
+    )
+    arg_parser.add_argument(
+        "--routes",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=sorted(SCENARIOS),
+    )
+    arg_parser.add_argument(
+        "--logins-only",
+        action="store_true",
+        help="only run --users concurrent OAuth logins and report on them",
+    )
+    arg_parser.add_argument("--json", action="store_true", help="print JSON report")
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,40 @@
 import os
 
 from database.db import Base, engine
+from database.migrations import upgrade_schema
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from monitoring.hooks import install_db_hooks
+from monitoring.middleware import MetricsMiddleware
 from routers.auth import router as auth_router
 from routers.events import router as event_router
+from routers.feeds import router as feeds_router
 from routers.gcal import router as gcal_router
+from routers.metrics import router as metrics_router
 from routers.parser import router as parser_router
+from routers.syllabi import router as syllabi_router
 from starlette.middleware.sessions import SessionMiddleware
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # in requirements.txt; gzip only if it is missing
+    BrotliMiddleware = None
+
 load_dotenv()
 
 SESSION_SECRET = os.getenv("SESSION_SECRET")
+# Smaller bodies are not worth the CPU to compress
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
 
 # Uncomment the below line to reset the database tables
 # Base.metadata.drop_all(bind=engine)
 
 Base.metadata.create_all(bind=engine)
+# create_all never alters existing tables; add newer columns to them
+upgrade_schema(engine)
+install_db_hooks(engine)
 
 
 app = FastAPI(title="Syllabus App", redirect_slashes=False)
@@ -34,11 +51,28 @@ app.add_middleware(
     allow_credentials=True,  # allow cookies / sessions
     allow_methods=["*"],  # allow all HTTP methods
     allow_headers=["*"],  # allow all headers
+    # read by the syllabus scanner after /parser/parse
+    expose_headers=["X-Syllabus-Id", "X-Syllabus-Owner-Id"],
 )
 
 app.add_middleware(SessionMiddleware, secret_key=SESSION_SECRET)
 
+# Event lists and feeds are large, repetitive JSON/ICS; brotli when the client
+# accepts it and brotli-asgi is installed, gzip otherwise
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware, minimum_size=COMPRESSION_MIN_BYTES, gzip_fallback=True
+    )
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
+# Outermost, so latency includes the session and CORS layers
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router)
 app.include_router(event_router)
 app.include_router(parser_router)
+app.include_router(syllabi_router)
 app.include_router(gcal_router)
+app.include_router(feeds_router)
+app.include_router(metrics_router)
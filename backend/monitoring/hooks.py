@@ -0,0 +1,83 @@
+import re
+import time
+from urllib.parse import urlparse
+
+from sqlalchemy import event
+
+from .metrics import (
+    DB_QUERIES,
+    DB_TIME,
+    GOOGLE_LATENCY,
+    GOOGLE_REQUESTS,
+    current_request,
+)
+
+_ID_SEGMENTS = re.compile(r"/(calendars|events)/[^/]+")
+
+
+def install_db_hooks(engine) -> None:
+    """Count statements and DB time per request via engine cursor events."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request.get()
+        if stats is None:
+            DB_QUERIES.inc(route="background")
+            DB_TIME.inc(elapsed, route="background")
+            return
+        # The route is only known once routing has run, so the middleware
+        # publishes these per-route totals when the request finishes.
+        stats.db_queries += 1
+        stats.db_time += elapsed
+        stats.statements[statement] += 1
+
+
+def google_endpoint(method: str, url: str) -> str:
+    """Collapse a Google URL to a low-cardinality label.
+
+    e.g. 'GET /calendars/{id}/events' for any calendar id.
+    """
+    path = urlparse(url).path
+    path = re.sub(r"^/calendar/v3", "", path)
+    return f"{method} {_ID_SEGMENTS.sub(lambda m: f'/{m.group(1)}/{{id}}', path)}"
+
+
+def record_google_call(method: str, url: str, status: int, elapsed: float) -> None:
+    endpoint = google_endpoint(method, url)
+    GOOGLE_LATENCY.observe(elapsed, endpoint=endpoint)
+    GOOGLE_REQUESTS.inc(endpoint=endpoint, status=str(status))
+    stats = current_request.get()
+    if stats is not None:
+        stats.google_calls += 1
+        stats.google_time += elapsed
+
+
+def requests_response_hook(response, *args, **kwargs):
+    """``requests`` response hook; ``elapsed`` covers send through headers."""
+    record_google_call(
+        response.request.method,
+        response.url,
+        response.status_code,
+        response.elapsed.total_seconds(),
+    )
+    return response
+
+
+async def httpx_request_hook(request):
+    request.extensions["started_at"] = time.perf_counter()
+
+
+async def httpx_response_hook(response):
+    started_at = response.request.extensions.get("started_at")
+    if started_at is not None:
+        record_google_call(
+            response.request.method,
+            str(response.request.url),
+            response.status_code,
+            time.perf_counter() - started_at,
+        )
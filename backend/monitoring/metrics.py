@@ -0,0 +1,61 @@
+import contextvars
+from collections import Counter as StatementCounter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .registry import Counter, Histogram
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route"],
+)
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code.",
+    ["method", "route", "status"],
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed, by route.", ["route"]
+)
+DB_TIME = Counter(
+    "db_query_seconds_total", "Time spent in SQL statements, by route.", ["route"]
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request.",
+    ["route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+DB_N_PLUS_ONE = Counter(
+    "db_n_plus_one_suspected_total",
+    "Requests that repeated one SQL statement past the N+1 threshold.",
+    ["route"],
+)
+GOOGLE_LATENCY = Histogram(
+    "google_api_duration_seconds",
+    "Outbound Google API call latency by endpoint.",
+    ["endpoint"],
+)
+GOOGLE_REQUESTS = Counter(
+    "google_api_requests_total",
+    "Outbound Google API calls by endpoint and status code.",
+    ["endpoint", "status"],
+)
+
+
+@dataclass
+class RequestStats:
+    """Per-request tallies filled in by the DB and Google hooks."""
+
+    route: str = "unmatched"
+    db_queries: int = 0
+    db_time: float = 0.0
+    statements: StatementCounter = field(default_factory=StatementCounter)
+    google_calls: int = 0
+    google_time: float = 0.0
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = (
+    contextvars.ContextVar("current_request", default=None)
+)
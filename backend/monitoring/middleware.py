@@ -0,0 +1,98 @@
+import logging
+import os
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from .metrics import (
+    DB_N_PLUS_ONE,
+    DB_QUERIES,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME,
+    REQUEST_COUNT,
+    REQUEST_LATENCY,
+    RequestStats,
+    current_request,
+)
+
+logger = logging.getLogger(__name__)
+
+# A statement repeated this many times in one request is flagged as likely N+1.
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+# Add a Server-Timing header to every response (otherwise only on X-Debug-Timing: 1).
+DEBUG_TIMING_HEADERS = os.getenv("DEBUG_TIMING_HEADERS", "").lower() in ("1", "true")
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Per-request latency, DB and Google metrics, recorded once the body is sent.
+
+    Streaming responses (e.g. the .ics feed) keep querying while their body
+    is sent, after call_next has returned, so the totals are published only
+    when the body iterator finishes. Latency therefore runs to the last
+    byte. The Server-Timing header goes out with the headers and only
+    covers work done before them.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+
+        def finish(status: int) -> None:
+            route = request.scope.get("route")
+            stats.route = getattr(route, "path", None) or "unmatched"
+            self._record(request.method, stats, status, time.perf_counter() - start)
+
+        try:
+            response = await call_next(request)
+        except BaseException:
+            finish(500)
+            raise
+        finally:
+            current_request.reset(token)
+        elapsed = time.perf_counter() - start
+        response.body_iterator = self._then(
+            response.body_iterator, lambda: finish(response.status_code)
+        )
+
+        if DEBUG_TIMING_HEADERS or request.headers.get("X-Debug-Timing") == "1":
+            response.headers["Server-Timing"] = ", ".join(
+                [
+                    f"app;dur={elapsed * 1000:.1f}",
+                    f"db;dur={stats.db_time * 1000:.1f}"
+                    f';desc="{stats.db_queries} queries"',
+                    f"google;dur={stats.google_time * 1000:.1f}"
+                    f';desc="{stats.google_calls} calls"',
+                ]
+            )
+        return response
+
+    @staticmethod
+    async def _then(body, callback):
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            callback()
+
+    @staticmethod
+    def _record(method: str, stats: RequestStats, status: int, elapsed: float) -> None:
+        REQUEST_LATENCY.observe(elapsed, method=method, route=stats.route)
+        REQUEST_COUNT.inc(method=method, route=stats.route, status=str(status))
+        DB_QUERIES_PER_REQUEST.observe(stats.db_queries, route=stats.route)
+        if stats.db_queries:
+            DB_QUERIES.inc(stats.db_queries, route=stats.route)
+            DB_TIME.inc(stats.db_time, route=stats.route)
+
+        if stats.statements:
+            statement, repeats = stats.statements.most_common(1)[0]
+            if repeats >= N_PLUS_ONE_THRESHOLD:
+                DB_N_PLUS_ONE.inc(route=stats.route)
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    method,
+                    stats.route,
+                    repeats,
+                    " ".join(statement.split())[:200],
+                )
@@ -0,0 +1,116 @@
+"""Minimal Prometheus-style metric types and text exposition."""
+
+import math
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# Seconds; spans fast cache hits through slow Google round trips.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> (per-bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (k, [list(v[0]), v[1], v[2]]) for k, v in self._values.items()
+            )
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} "
+                    f"{cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_all() -> str:
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
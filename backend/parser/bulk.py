@@ -0,0 +1,405 @@
+"""Parse a directory or archive of syllabi offline.
+
+    python -m parser.bulk /data/registrar-dump.zip -o parsed.jsonl \\
+        --semester-start 2026-01-12 --workers 8
+
+Files are parsed across a process pool and written one record per file with
+its sha256, timing, drafts or error. Re-running with the same output skips
+files whose hash is already recorded, so an interrupted run resumes where it
+stopped (``--retry-errors`` re-parses the failures). ``--format parquet`` (or
+an output path ending in .parquet) writes part files into a directory and
+needs ``pyarrow``. ``--warm-catalog`` also stores each result in the shared
+syllabus catalog so uploads of the same documents skip parsing.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from parser.parser_app import detect_course_code, parser
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".md"}
+
+# (display name, loader returning the file's bytes)
+Source = Tuple[str, Callable[[], bytes]]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Inputs
+def _supported(name: str) -> bool:
+    base = os.path.basename(name)
+    return (
+        not base.startswith(".") and Path(name).suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+def _directory_sources(root: Path) -> List[Source]:
+    paths = sorted(p for p in root.rglob("*") if p.is_file() and _supported(p.name))
+    return [(str(p.relative_to(root)), p.read_bytes) for p in paths]
+
+
+def _zip_sources(path: Path) -> List[Source]:
+    archive = zipfile.ZipFile(path)
+    names = sorted(
+        info.filename
+        for info in archive.infolist()
+        if not info.is_dir() and _supported(info.filename)
+    )
+    return [(name, lambda name=name: archive.read(name)) for name in names]
+
+
+def _tar_sources(path: Path) -> List[Source]:
+    archive = tarfile.open(path)
+    members = sorted(
+        (m for m in archive.getmembers() if m.isfile() and _supported(m.name)),
+        key=lambda m: m.name,
+    )
+    return [(m.name, lambda m=m: archive.extractfile(m).read()) for m in members]
+
+
+def collect_sources(path: Path) -> List[Source]:
+    """Supported files under a directory, or inside a zip/tar archive."""
+    if path.is_dir():
+        return _directory_sources(path)
+    if zipfile.is_zipfile(path):
+        return _zip_sources(path)
+    if tarfile.is_tarfile(path):
+        return _tar_sources(path)
+    raise SystemExit(f"{path} is not a directory, zip or tar archive")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Worker
+def parse_one(
+    name: str,
+    sha256: str,
+    file_bytes: bytes,
+    semester_start: Optional[str],
+    timezone: str,
+    collapse_recurring: bool,
+) -> dict:
+    """Parse one file into a result record; never raises."""
+    record = {"path": name, "sha256": sha256, "bytes": len(file_bytes)}
+    started = time.perf_counter()
+    try:
+        drafts = parser(
+            file_bytes=file_bytes,
+            filename=name,
+            semester_start=semester_start,
+            timezone=timezone,
+            collapse_recurring=collapse_recurring,
+        )
+    except Exception as e:
+        record.update(ok=False, error=f"{type(e).__name__}: {e}", drafts=[])
+    else:
+        record.update(
+            ok=True,
+            error=None,
+            course_code=detect_course_code(drafts),
+            drafts=[d.model_dump(mode="json") for d in drafts],
+        )
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    record.setdefault("course_code", None)
+    record["event_count"] = len(record["drafts"])
+    return record
+
+
+def crashed_record(name: str, sha256: str, size: int) -> dict:
+    """Result for a file that was in flight when a worker process died.
+
+    The pool cannot say which file killed the worker, so every in-flight
+    file gets one; ``--retry-errors`` re-parses the ones that were innocent.
+    """
+    return {
+        "path": name,
+        "sha256": sha256,
+        "bytes": size,
+        "ok": False,
+        "error": "BrokenProcessPool: a worker died while this file was in flight",
+        "drafts": [],
+        "seconds": 0.0,
+        "course_code": None,
+        "event_count": 0,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Outputs
+class JsonlWriter:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def processed(self, retry_errors: bool) -> Set[str]:
+        done: Set[str] = set()
+        if not self.path.exists():
+            return done
+        with self.path.open() as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by an interruption
+                if record.get("ok") or not retry_errors:
+                    done.add(record["sha256"])
+        return done
+
+    def __enter__(self):
+        self._file = self.path.open("a")
+        return self
+
+    def write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        # Flushed per record so an interrupted run loses at most one line
+        self._file.flush()
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Buffered part files (part-NNNNN.parquet) in a directory.
+
+    Parquet files cannot be appended to, so each flush writes a new part and
+    resuming reads the hashes back from all of them.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 500):
+        if importlib.util.find_spec("pyarrow") is None:
+            raise SystemExit("--format parquet requires the 'pyarrow' package")
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[dict] = []
+
+    def _parts(self) -> List[Path]:
+        return sorted(self.path.glob("part-*.parquet"))
+
+    def processed(self, retry_errors: bool) -> Set[str]:
+        import pyarrow.parquet as pq
+
+        done: Set[str] = set()
+        for part in self._parts():
+            table = pq.read_table(part, columns=["sha256", "ok"])
+            for sha256, ok in zip(table["sha256"].to_pylist(), table["ok"].to_pylist()):
+                if ok or not retry_errors:
+                    done.add(sha256)
+        return done
+
+    def __enter__(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def write(self, record: dict) -> None:
+        # Drafts are nested and loosely typed; keep them as a JSON column
+        self._buffer.append(record | {"drafts": json.dumps(record["drafts"])})
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        index = len(self._parts())
+        pq.write_table(
+            pa.Table.from_pylist(self._buffer),
+            self.path / f"part-{index:05d}.parquet",
+        )
+        self._buffer = []
+
+    def __exit__(self, *exc):
+        self._flush()
+
+
+class CatalogWarmer:
+    """Stores successful results in the shared syllabus catalog."""
+
+    def __init__(self, semester_start, timezone, collapse_recurring):
+        from database import syllabi as crud_syllabi
+        from database.db import SessionLocal
+        from routers.schemas import EventDraftSchema
+
+        self._crud = crud_syllabi
+        self._draft = EventDraftSchema
+        self._db = SessionLocal()
+        self._options = crud_syllabi.parse_options_key(
+            semester_start, timezone, collapse_recurring
+        )
+
+    def store(self, record: dict) -> None:
+        if not record["ok"]:
+            return
+        if self._crud.find_syllabus(self._db, record["sha256"], self._options):
+            return
+        self._crud.create_syllabus(
+            self._db,
+            document_hash=record["sha256"],
+            parse_options=self._options,
+            drafts=[self._draft.model_validate(d) for d in record["drafts"]],
+            course_code=record["course_code"],
+            filename=os.path.basename(record["path"]),
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Driver
+class Progress:
+    def __init__(self, total: int, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.started = time.monotonic()
+        self.done = self.ok = self.failed = self.skipped = 0
+        self._last_line = 0.0
+        self._tty = stream.isatty()
+
+    def update(self, record: Optional[dict] = None, skipped: bool = False) -> None:
+        self.done += 1
+        if skipped:
+            self.skipped += 1
+        elif record["ok"]:
+            self.ok += 1
+        else:
+            self.failed += 1
+        now = time.monotonic()
+        # Redraw in place on a terminal; log a line every 10s otherwise
+        if self._tty and now - self._last_line >= 0.2:
+            self._render(end="\r")
+        elif not self._tty and now - self._last_line >= 10:
+            self._render(end="\n")
+
+    def _render(self, end: str) -> None:
+        self._last_line = time.monotonic()
+        elapsed = self._last_line - self.started
+        rate = (self.done - self.skipped) / elapsed if elapsed else 0.0
+        self.stream.write(
+            f"[{self.done}/{self.total}] ok={self.ok} failed={self.failed} "
+            f"skipped={self.skipped} {rate:.1f} files/s{end}"
+        )
+        self.stream.flush()
+
+    def finish(self) -> None:
+        self._render(end="\n")
+
+
+def _pending(
+    sources: List[Source], processed: Set[str], progress: Progress
+) -> Iterator[Tuple[str, str, bytes]]:
+    seen: Set[str] = set()
+    for name, load in sources:
+        file_bytes = load()
+        sha256 = hashlib.sha256(file_bytes).hexdigest()  # same as the catalog key
+        if sha256 in processed or sha256 in seen:
+            progress.update(skipped=True)
+            continue
+        seen.add(sha256)
+        yield name, sha256, file_bytes
+
+
+def run(args: argparse.Namespace) -> int:
+    """Parse everything not yet in the output; failures are recorded, not fatal."""
+    sources = collect_sources(Path(args.input))
+    output = Path(args.output)
+    fmt = args.format or ("parquet" if output.suffix == ".parquet" else "jsonl")
+    writer = ParquetWriter(output) if fmt == "parquet" else JsonlWriter(output)
+    processed = writer.processed(retry_errors=args.retry_errors)
+    warmer = (
+        CatalogWarmer(args.semester_start, args.timezone, args.collapse_recurring)
+        if args.warm_catalog
+        else None
+    )
+
+    progress = Progress(total=len(sources))
+    options = (args.semester_start, args.timezone, args.collapse_recurring)
+    # Bound in-flight work so only a few files' bytes are held at once
+    max_in_flight = args.workers * 4
+
+    def record_result(record: dict) -> None:
+        writer.write(record)
+        if warmer is not None:
+            warmer.store(record)
+        progress.update(record)
+
+    pool = ProcessPoolExecutor(max_workers=args.workers)
+    # future -> (name, sha256, size), to record files whose worker died
+    in_flight: Dict[Future, Tuple[str, str, int]] = {}
+
+    def collect(return_when: str) -> None:
+        nonlocal pool
+        done, _ = wait(in_flight, return_when=return_when)
+        if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+            # A worker died (e.g. a segfault in PyMuPDF) and broke the pool:
+            # everything still in flight fails with it. Record those and
+            # carry on with a fresh pool.
+            done, _ = wait(in_flight)
+            pool.shutdown(wait=False)
+            pool = ProcessPoolExecutor(max_workers=args.workers)
+        for future in done:
+            name, sha256, size = in_flight.pop(future)
+            if isinstance(future.exception(), BrokenProcessPool):
+                record_result(crashed_record(name, sha256, size))
+            else:
+                record_result(future.result())
+
+    try:
+        with writer:
+            for name, sha256, file_bytes in _pending(sources, processed, progress):
+                future = pool.submit(parse_one, name, sha256, file_bytes, *options)
+                in_flight[future] = (name, sha256, len(file_bytes))
+                if len(in_flight) >= max_in_flight:
+                    collect(FIRST_COMPLETED)
+            collect(ALL_COMPLETED)
+    finally:
+        pool.shutdown()
+        progress.finish()
+        if warmer is not None:
+            warmer.close()
+    return 0
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("input", help="directory, .zip or .tar(.gz) of syllabi")
+    arg_parser.add_argument("-o", "--output", required=True)
+    arg_parser.add_argument("--format", choices=["jsonl", "parquet"])
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument("--semester-start")
+    arg_parser.add_argument("--timezone", default="America/Chicago")
+    arg_parser.add_argument(
+        "--collapse-recurring",
+        action="store_true",
+        help="fold weekly repeats into one RRULE draft",
+    )
+    arg_parser.add_argument(
+        "--retry-errors",
+        action="store_true",
+        help="re-parse files that failed in an earlier run",
+    )
+    arg_parser.add_argument(
+        "--warm-catalog",
+        action="store_true",
+        help="also store results in the shared syllabus catalog (needs DATABASE_URL)",
+    )
+    sys.exit(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
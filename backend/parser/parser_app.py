@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import io
 import re
+from collections import Counter
 from datetime import datetime
 from typing import List, Optional
 
@@ -10,9 +11,14 @@ import fitz  # PyMuPDF
 from dateutil import tz as dateutil_tz
 from docx import Document
 
+from planner.recurrence import weekly_recurrence, weekly_runs
 from routers.schemas import EventDraftSchema as EventDraft
 
-__all__ = ["EventDraft", "parser"]
+__all__ = ["EventDraft", "PARSER_VERSION", "detect_course_code", "parser"]
+
+# Bump whenever a change alters parser() output for the same input, so shared
+# catalog entries parsed by an older version are re-parsed rather than served.
+PARSER_VERSION = 3
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -239,11 +245,13 @@ def _line_to_event(
         summary=_pick_summary(line),
         start=dt,
         end=None,
+        time_zone=tz,
         all_day=not has_time and not dueish,
         course_name=course_m.group(0) if course_m else None,
         eventType=eventType,
         source_page=page_idx,
         source_line=line_idx,
+        source_locations=[(page_idx, line_idx)],
         raw_text=line.strip(),
     )
 
@@ -356,6 +364,146 @@ def _group_nearby_lines(lines: list[str], max_distance: int = 5) -> list[str]:
     return grouped
 
 
+def _collapse_weekly_series(
+    events: List[EventDraft], min_repeats: int = 3
+) -> List[EventDraft]:
+    """Fold identical events repeating on the same weekday/time into one RRULE."""
+    groups: dict = {}
+    for evt in events:
+        key = (
+            " ".join(evt.summary.lower().split()),
+            evt.eventType,
+            evt.course_name,
+            evt.all_day,
+            evt.start.weekday(),
+            evt.start.time(),
+        )
+        groups.setdefault(key, []).append(evt)
+
+    collapsed: List[EventDraft] = []
+    for group in groups.values():
+        group.sort(key=lambda e: e.start)
+        for run in weekly_runs([e.start for e in group]):
+            series = [group[i] for i in run]
+            if len(series) < min_repeats:
+                collapsed.extend(series)
+                continue
+            first = series[0]
+            collapsed.append(
+                first.model_copy(
+                    update={"recurrence": weekly_recurrence([e.start for e in series])}
+                )
+            )
+    return collapsed
+
+
+_SUMMARY_STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "at",
+    "by",
+    "due",
+    "for",
+    "in",
+    "of",
+    "on",
+    "the",
+    "to",
+}
+
+
+def _summary_tokens(summary: str) -> frozenset:
+    """Normalized word set of a summary; numbers are kept ("HW 1" != "HW 2")."""
+    words = re.findall(r"[a-z0-9]+", summary.lower())
+    return frozenset(w for w in words if w not in _SUMMARY_STOPWORDS)
+
+
+def _near_duplicate(a: frozenset, b: frozenset) -> bool:
+    """Same tokens, mostly the same tokens, or one summary containing the other
+    (what overlapping line windows produce)."""
+    if a == b:
+        return True
+    if not a or not b:
+        return False
+    if len(a & b) / len(a | b) >= 0.75:
+        return True
+    return min(len(a), len(b)) >= 2 and (a <= b or b <= a)
+
+
+def _merge_drafts(group: List[EventDraft]) -> EventDraft:
+    """Keep the draft with the richest raw_text, filling its gaps from the rest.
+
+    Timing always comes from a timed member when there is one, so an all-day
+    mention never erases the time of the event it duplicates.
+    """
+    # Longest raw_text wins; ties go to the earliest page
+    best = max(group, key=lambda e: (len(e.raw_text), -(e.source_page or 0)))
+    update = {
+        "source_locations": sorted(
+            {tuple(loc) for e in group for loc in e.source_locations}
+        )
+    }
+    timed = [e for e in group if not e.all_day]
+    if best.all_day and timed:
+        update.update(
+            start=timed[0].start,
+            end=next((e.end for e in timed if e.end is not None), None),
+            all_day=False,
+        )
+    for field in ("description", "location", "course_name", "end"):
+        if field not in update and getattr(best, field) is None:
+            update[field] = next(
+                (getattr(e, field) for e in group if getattr(e, field) is not None),
+                None,
+            )
+    return best.model_copy(update=update)
+
+
+def _dedupe_drafts(events: List[EventDraft]) -> List[EventDraft]:
+    """Merge duplicate drafts from overlapping line windows and repeated tables.
+
+    Drafts are bucketed by (date, type); within a bucket, drafts whose
+    summary tokens are near-duplicates are merged when they are at the same
+    time or one of them is all-day. A group holds at most one start time, so
+    a 9am and a 2pm section never merge through an all-day mention. Exact
+    repeats hit the same token set, so most merges are a dict lookup.
+    """
+    buckets: dict = {}
+    for evt in events:
+        buckets.setdefault((evt.start.date(), evt.eventType), []).append(evt)
+
+    deduped: List[EventDraft] = []
+    for bucket in buckets.values():
+        groups: List[list] = []  # [tokens, timed start or None, members]
+        by_tokens: dict = {}
+        for evt in bucket:
+            tokens = _summary_tokens(evt.summary)
+            group = by_tokens.get((tokens, evt.start, evt.all_day))
+            if group is None:
+                group = next(
+                    (
+                        g
+                        for g in groups
+                        if (evt.all_day or g[1] is None or g[1] == evt.start)
+                        and _near_duplicate(g[0], tokens)
+                    ),
+                    None,
+                )
+            if group is None:
+                group = [tokens, None, []]
+                groups.append(group)
+            if not evt.all_day:
+                group[1] = evt.start
+            by_tokens[(tokens, evt.start, evt.all_day)] = group
+            group[2].append(evt)
+        deduped.extend(
+            members[0] if len(members) == 1 else _merge_drafts(members)
+            for _, _, members in groups
+        )
+    return deduped
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Public API
 def parser(
@@ -363,8 +511,16 @@ def parser(
     filename: str,
     semester_start: Optional[str] = None,
     timezone: str = "America/Chicago",
+    collapse_recurring: bool = False,
 ) -> List[EventDraft]:
-    """Main entrypoint: parse syllabi into EventDraft objects."""
+    """Main entrypoint: parse syllabi into EventDraft objects.
+
+    With ``collapse_recurring``, weekly repeats of the same event are
+    returned as one draft carrying an RRULE instead of one draft per week.
+    It is off by default: the unranged event list the dashboard reads
+    returns a series once with its raw RRULE, which the client does not
+    expand yet.
+    """
     pages = _guess_text(file_bytes, filename)
     base = datetime.fromisoformat(semester_start) if semester_start else None
     events: List[EventDraft] = []
@@ -411,6 +567,22 @@ def parser(
                 if evt:
                     events.append(evt)
 
+    # Before collapsing, so repeats of one date don't break weekly runs
+    events = _dedupe_drafts(events)
+
+    if collapse_recurring:
+        events = _collapse_weekly_series(events)
+
     # Sort events chronologically for consistent output.
     events.sort(key=lambda e: ((e.start or ""), e.summary))
     return events
+
+
+def detect_course_code(events: List[EventDraft]) -> Optional[str]:
+    """Most common course code among drafts, normalized (e.g. "CS 101" -> "CS101")."""
+    codes = Counter(
+        re.sub(r"\s+", "", m.group(1))
+        for evt in events
+        if evt.course_name and (m := _COURSE_RE.search(evt.course_name))
+    )
+    return codes.most_common(1)[0][0] if codes else None
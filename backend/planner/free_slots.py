@@ -0,0 +1,122 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and coalesce overlapping or touching intervals in O(n log n)."""
+    merged: List[Interval] = []
+    for start, end in sorted(i for i in intervals if i[1] > i[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class BusyIndex:
+    """Sorted, non-overlapping busy intervals with binary-search lookups."""
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        merged = merge_intervals(intervals)
+        self._starts = [s for s, _ in merged]
+        self._ends = [e for _, e in merged]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def free_within(self, start: datetime, end: datetime) -> List[Interval]:
+        """Return the gaps between busy intervals inside [start, end)."""
+        gaps: List[Interval] = []
+        cursor = start
+        # First busy interval that ends after the window opens.
+        i = bisect_right(self._ends, start)
+        while i < len(self._starts) and self._starts[i] < end:
+            if self._starts[i] > cursor:
+                gaps.append((cursor, self._starts[i]))
+            cursor = max(cursor, self._ends[i])
+            i += 1
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, start: datetime, end: datetime) -> None:
+        """Mark [start, end) busy, merging with any neighbours it touches."""
+        lo = bisect_left(self._ends, start)
+        hi = bisect_right(self._starts, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+
+def working_windows(
+    range_start: datetime,
+    range_end: datetime,
+    day_start: time,
+    day_end: time,
+    weekdays: Sequence[int],
+    tz: tzinfo,
+) -> Iterator[Interval]:
+    """Yield each day's working-hours window, clipped to the requested range.
+
+    ``weekdays`` uses Python numbering (Monday is 0).
+    """
+    day: date = range_start.astimezone(tz).date()
+    last: date = range_end.astimezone(tz).date()
+    while day <= last:
+        if day.weekday() in weekdays:
+            ws = max(datetime.combine(day, day_start, tz), range_start)
+            we = min(datetime.combine(day, day_end, tz), range_end)
+            if we > ws:
+                yield ws, we
+        day += timedelta(days=1)
+
+
+def find_free_slots(
+    index: BusyIndex, windows: Iterable[Interval], min_length: timedelta
+) -> List[Interval]:
+    slots: List[Interval] = []
+    for ws, we in windows:
+        slots.extend(
+            gap for gap in index.free_within(ws, we) if gap[1] - gap[0] >= min_length
+        )
+    return slots
+
+
+def place_blocks_before(
+    index: BusyIndex,
+    deadline: datetime,
+    count: int,
+    length: timedelta,
+    windows: Sequence[Interval],
+    not_before: Optional[datetime] = None,
+) -> List[Interval]:
+    """Place up to ``count`` blocks on distinct days, latest first, before a deadline.
+
+    ``windows`` must be sorted; placed blocks are marked busy in the index so
+    later placements (e.g. for the next exam) do not reuse the time.
+    """
+    placed: List[Interval] = []
+    # Windows that end before the deadline, walked backwards from it.
+    stop = bisect_left([ws for ws, _ in windows], deadline)
+    for ws, we in reversed(windows[:stop]):
+        if len(placed) >= count:
+            break
+        we = min(we, deadline)
+        if not_before is not None:
+            if we <= not_before:
+                break
+            ws = max(ws, not_before)
+        for gap_start, gap_end in reversed(index.free_within(ws, we)):
+            if gap_end - gap_start >= length:
+                block = (gap_end - length, gap_end)
+                index.add(*block)
+                placed.append(block)
+                break
+    placed.reverse()
+    return placed
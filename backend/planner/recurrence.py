@@ -0,0 +1,114 @@
+"""RRULE-based recurrence: parsing, lazy expansion and weekly-series detection.
+
+``Event.recurrence`` holds RFC 5545 lines separated by newlines, the same
+strings Google Calendar takes in its ``recurrence`` list, e.g.::
+
+    RRULE:FREQ=WEEKLY;UNTIL=20261201T160000Z
+    EXDATE:20261013T150000Z
+
+Series are expanded in the event's IANA time zone (``Event.time_zone``), so a
+10:00 lecture stays at 10:00 local time across DST changes; stored starts
+only carry a fixed UTC offset and cannot be expanded in directly.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.rrule import rruleset, rrulestr
+
+WEEK = timedelta(days=7)
+
+# Zone for events stored without one.
+DEFAULT_TIME_ZONE = "America/Chicago"
+
+
+def recurrence_lines(recurrence: Optional[str]) -> List[str]:
+    return [line.strip() for line in (recurrence or "").splitlines() if line.strip()]
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=64)
+def resolve_zone(name: Optional[str]) -> ZoneInfo:
+    """ZoneInfo for an IANA name, falling back to DEFAULT_TIME_ZONE."""
+    try:
+        return ZoneInfo(name or DEFAULT_TIME_ZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIME_ZONE)
+
+
+@lru_cache(maxsize=4096)
+def _ruleset(recurrence: str, dtstart: datetime, zone_key: str) -> rruleset:
+    # cache=True makes dateutil memoise generated occurrences, so repeated
+    # window queries over the same series only walk the rule once. zone_key
+    # is part of the cache key because aware datetimes for the same instant
+    # hash equal whatever their zone.
+    return rrulestr(recurrence, dtstart=dtstart, forceset=True, cache=True)
+
+
+def occurrences_between(
+    recurrence: str,
+    dtstart: datetime,
+    duration: timedelta,
+    window_start: datetime,
+    window_end: datetime,
+    time_zone: Optional[str] = None,
+) -> List[datetime]:
+    """UTC start times of occurrences overlapping [window_start, window_end).
+
+    The series repeats at ``dtstart``'s wall-clock time in ``time_zone`` and
+    is converted to UTC only after expansion, so UTC UNTIL/EXDATE values
+    match occurrences on either side of a DST change. Naive datetimes are
+    taken as UTC.
+    """
+    zone = resolve_zone(time_zone)
+    local_start = _aware(dtstart).astimezone(zone)
+    rules = _ruleset("\n".join(recurrence_lines(recurrence)), local_start, zone.key)
+    occurrences = rules.between(
+        _aware(window_start) - duration, _aware(window_end), inc=False
+    )
+    return [occurrence.astimezone(timezone.utc) for occurrence in occurrences]
+
+
+def _utc_stamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def weekly_recurrence(starts: Sequence[datetime]) -> str:
+    """Build a weekly RRULE covering ``starts``, with EXDATEs for skipped weeks.
+
+    ``starts`` must be sorted, share a weekday and wall-clock time, and be
+    whole weeks apart. They should carry their IANA zone (as parsed drafts
+    do) so skipped weeks past a DST change get the right UTC EXDATE.
+    """
+    lines = [f"RRULE:FREQ=WEEKLY;UNTIL={_utc_stamp(starts[-1])}"]
+    present = set(starts)
+    current = starts[0]
+    while current < starts[-1]:
+        current = (current.replace(tzinfo=None) + WEEK).replace(tzinfo=current.tzinfo)
+        if current not in present:
+            lines.append(f"EXDATE:{_utc_stamp(current)}")
+    return "\n".join(lines)
+
+
+def weekly_runs(starts: Sequence[datetime], max_gap_weeks: int = 2) -> List[List[int]]:
+    """Split sorted starts into runs that are whole weeks apart.
+
+    Returns index lists; a gap of up to ``max_gap_weeks`` (e.g. a break
+    week) stays in the same run and becomes an EXDATE.
+    """
+    runs: List[List[int]] = []
+    for i, start in enumerate(starts):
+        if runs:
+            prev = starts[runs[-1][-1]]
+            gap = start.replace(tzinfo=None) - prev.replace(tzinfo=None)
+            if gap > timedelta(0) and gap % WEEK == timedelta(0):
+                if gap // WEEK <= max_gap_weeks:
+                    runs[-1].append(i)
+                    continue
+        runs.append([i])
+    return runs
@@ -0,0 +1,79 @@
+"""Per-week event counts behind the planner's workload heatmap.
+
+An event contributes one count to the (week, course, type) cell of each week
+it starts in; recurring events count once per occurrence. Weeks start on
+Monday in ``WORKLOAD_TIME_ZONE`` so that a Sunday 11:59 PM deadline lands in
+the week it is due rather than the next one in UTC.
+"""
+
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+from planner.recurrence import occurrences_between, recurrence_lines
+
+load_dotenv()
+
+WORKLOAD_TIME_ZONE = ZoneInfo(os.getenv("WORKLOAD_TIME_ZONE", "America/Chicago"))
+# Recurring series are counted this far past their first occurrence.
+RECURRENCE_HORIZON = timedelta(days=366)
+
+# (week_start, course_name, event_type); "" stands for no course
+WorkloadKey = Tuple[date, str, str]
+
+
+def _aware(value: datetime) -> datetime:
+    # Naive values come from SQLite and are UTC, as elsewhere in the planner
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def week_start(value: datetime) -> date:
+    local = _aware(value).astimezone(WORKLOAD_TIME_ZONE).date()
+    return local - timedelta(days=local.weekday())
+
+
+def event_weeks(
+    start: datetime,
+    end: datetime,
+    event_type: str,
+    course_name: Optional[str],
+    recurrence: Optional[str] = None,
+    time_zone: Optional[str] = None,
+) -> Counter:
+    """Counts by (week_start, course_name, event_type) for one event."""
+    key_rest = (course_name or "", event_type)
+    if not recurrence_lines(recurrence):
+        return Counter({(week_start(start),) + key_rest: 1})
+
+    duration = max(end - start, timedelta(0))
+    # Nudge the window back so the first occurrence is included when the
+    # event has no duration (between() is exclusive at the window start).
+    occurrences = occurrences_between(
+        recurrence,
+        start,
+        duration,
+        _aware(start) - timedelta(seconds=1),
+        _aware(start) + RECURRENCE_HORIZON,
+        time_zone,
+    )
+    return Counter((week_start(o),) + key_rest for o in occurrences)
+
+
+def total_weeks(events: Iterable) -> Counter:
+    """Summed counts for Event rows (or anything with the same attributes)."""
+    totals: Counter = Counter()
+    for event in events:
+        totals.update(
+            event_weeks(
+                event.start,
+                event.end,
+                event.eventType,
+                event.course_name,
+                event.recurrence,
+                event.time_zone,
+            )
+        )
+    return totals
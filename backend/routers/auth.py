@@ -1,19 +1,28 @@
+import asyncio
 import datetime
+import logging
 import os
 import time
 
+import httpx
 import jwt
-import requests
 from authlib.integrations.starlette_client import OAuth
 from database.db import get_db
-from database.users import select_user_by_google_id, select_user_by_id, upsert_user_sync
+from database.user_cache import CachedUser
+from database.users import get_cached_user_by_google_id, upsert_user_sync
 from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
+from gcal.urls import OIDC_DISCOVERY_URL, USERINFO_URL
+from monitoring.hooks import httpx_request_hook, httpx_response_hook
+from routers.deps import get_current_user
 from sqlalchemy.orm import Session
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 # --- Google OAuth setup ---
@@ -22,20 +31,57 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
-CONF_URL = "https://accounts.google.com/.well-known/openid-configuration"
+CONF_URL = OIDC_DISCOVERY_URL
 oauth.register(
     name="google",
     client_id=GOOGLE_CLIENT_ID,
     client_secret=GOOGLE_CLIENT_SECRET,
     server_metadata_url=CONF_URL,
     client_kwargs={
-        "scope": "openid email profile https://www.googleapis.com/auth/calendar.events",
+        "scope": (
+            "openid email profile https://www.googleapis.com/auth/calendar.events "
+            "https://www.googleapis.com/auth/calendar.calendarlist.readonly"
+        ),
         # ensures refresh_token is returned every time -- not needed anymore since we are using access token
         # "access_type": "offline",
         # "prompt": "consent",
     },
 )
 
+# Discovery metadata is refetched at most once per TTL, behind a lock so a
+# login storm on a cold pod triggers a single request.
+OIDC_METADATA_TTL = int(os.getenv("OIDC_METADATA_TTL", "3600"))
+_metadata_lock = asyncio.Lock()
+
+# Shared client so userinfo calls reuse pooled connections.
+_http = httpx.AsyncClient(
+    timeout=10,
+    event_hooks={"request": [httpx_request_hook], "response": [httpx_response_hook]},
+)
+
+
+async def load_google_metadata() -> dict:
+    metadata = oauth.google.server_metadata
+    loaded_at = metadata.get("_loaded_at")
+    if loaded_at and time.time() - loaded_at < OIDC_METADATA_TTL:
+        return metadata
+
+    async with _metadata_lock:
+        loaded_at = metadata.get("_loaded_at")
+        if not loaded_at or time.time() - loaded_at >= OIDC_METADATA_TTL:
+            metadata.pop("_loaded_at", None)
+            await oauth.google.load_server_metadata()
+    return oauth.google.server_metadata
+
+
+@router.on_event("startup")
+async def warm_google_metadata():
+    try:
+        await load_google_metadata()
+    except Exception as e:
+        # Not fatal: the first login retries the fetch.
+        logger.warning("OIDC discovery prefetch failed: %s", e)
+
 
 @router.get("/login")
 @router.get("/login/")
@@ -45,6 +91,7 @@ async def login(request: Request):
         if os.getenv("IS_KUBERNETES")
         else request.url_for("auth_callback")
     )
+    await load_google_metadata()
     return await oauth.google.authorize_redirect(request, redirect_uri)
 
 
@@ -52,16 +99,17 @@ async def login(request: Request):
 @router.get("/callback/")
 async def auth_callback(request: Request, db: Session = Depends(get_db)):
     try:
+        metadata = await load_google_metadata()
         token = await oauth.google.authorize_access_token(request)
     except Exception as e:
-        print("OAuth Error:", e)
+        logger.warning("OAuth error: %s", e)
         raise HTTPException(status_code=400, detail="OAuth authorization failed")
 
     # Fetch user info
     userinfo = token.get("userinfo")
     if not userinfo:
-        resp = requests.get(
-            "https://www.googleapis.com/oauth2/v3/userinfo",
+        resp = await _http.get(
+            metadata.get("userinfo_endpoint", USERINFO_URL),
             headers={"Authorization": f"Bearer {token['access_token']}"},
         )
         userinfo = resp.json()
@@ -72,7 +120,9 @@ async def auth_callback(request: Request, db: Session = Depends(get_db)):
     access_token = token["access_token"]
     expires_in = token["expires_in"]
 
-    upsert_user_sync(
+    # The session is synchronous; keep it off the event loop.
+    await run_in_threadpool(
+        upsert_user_sync,
         db,
         google_id=google_id,
         email=email,
@@ -108,7 +158,11 @@ async def verify_token(request: Request, db: Session = Depends(get_db)):
 
     try:
         decoded = jwt.decode(token, os.getenv("JWT_SECRET"), os.getenv("JWT_ALGORITHM"))
-        user = select_user_by_google_id(db, google_id=decoded["google_id"])
+        user = await run_in_threadpool(
+            get_cached_user_by_google_id, db, google_id=decoded["google_id"]
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
         return {
             "user": {
                 "id": user.id,
@@ -124,11 +178,7 @@ async def verify_token(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/session")
 @router.get("/session/")
-async def check_session(user_id: int, db: Session = Depends(get_db)):
-    user = select_user_by_id(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
+async def check_session(user: CachedUser = Depends(get_current_user)):
     now = datetime.datetime.utcnow()
     if user.token_expires_at < now:
         raise HTTPException(status_code=401, detail="Session expired")
@@ -0,0 +1,47 @@
+"""Helpers for ETag / Last-Modified conditional GETs."""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """Quoted ETag from ``parts``; weak for bodies that may be re-encoded."""
+    tag = '"' + "-".join(str(p) for p in parts) + '"'
+    return "W/" + tag if weak else tag
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """True when the client's cached copy is current (RFC 9110 §13.2.2 order)."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        # GET uses weak comparison, so W/ prefixes are ignored on both sides.
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution.
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
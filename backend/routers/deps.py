@@ -0,0 +1,37 @@
+import os
+
+from database.db import get_db
+from database.user_cache import CachedUser
+from database.users import get_cached_user_by_id
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+# Accounts that may own shared syllabi and publish revisions to them
+INSTRUCTOR_EMAILS = {
+    email.strip().lower()
+    for email in os.getenv("INSTRUCTOR_EMAILS", "").split(",")
+    if email.strip()
+}
+
+
+def is_instructor(email: str) -> bool:
+    return email.lower() in INSTRUCTOR_EMAILS
+
+
+def get_current_user(
+    request: Request, user_id: int, db: Session = Depends(get_db)
+) -> CachedUser:
+    """Resolve the ``user_id`` query parameter to a user once per request.
+
+    FastAPI caches dependency results within a request, so routes and other
+    dependencies that ask for this share one lookup; the user is also left
+    on ``request.state.user`` for middleware.
+    """
+    user = get_cached_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    request.state.user = user
+    return user
@@ -1,13 +1,48 @@
-from typing import List
+import asyncio
+import json
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 
 from database import events as crud_events
-from database.db import get_db
-from fastapi import APIRouter, Depends, HTTPException
-from routers.schemas import EventCreate, EventSchema
+from database import search as crud_search
+from database import workload as crud_workload
+from database.db import engine, get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from feeds.changes import hub, start_listener, stop_listener
+from gcal.jobs import enqueue_event_delete, enqueue_event_update
+from routers.conditional import is_not_modified, make_etag, validator_headers
+from routers.schemas import (
+    EventCreate,
+    EventSchema,
+    EventSearchHit,
+    EventSearchResponse,
+    WorkloadCount,
+    WorkloadWeek,
+)
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+# Comment lines keep proxies from closing idle change streams
+CHANGE_STREAM_HEARTBEAT_SECONDS = 15
+
+
+@router.on_event("startup")
+def listen_for_event_changes():
+    start_listener(engine)
+
+
+@router.on_event("startup")
+def detect_search_extensions():
+    crud_search.detect_pg_trgm(engine)
+
+
+@router.on_event("shutdown")
+def stop_listening_for_event_changes():
+    stop_listener()
+
 
 @router.post("", response_model=EventSchema)
 @router.post("/", response_model=EventSchema)
@@ -17,10 +52,150 @@ def create_event(event: EventCreate, db: Session = Depends(get_db)):
 
 @router.get("", response_model=List[EventSchema])
 @router.get("/", response_model=List[EventSchema])
-def get_events(user_id: int, db: Session = Depends(get_db)):
+def get_events(
+    request: Request,
+    response: Response,
+    user_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+):
+    """List a user's events.
+
+    Without a range, recurring events come back once with their RRULE. With
+    ``start`` and ``end``, only events in the window are returned and
+    recurring ones are expanded into their occurrences.
+
+    Responses carry an ETag and Last-Modified built from the user's event
+    count and latest ``updated_at``; a matching If-None-Match or
+    If-Modified-Since gets a 304 before any event rows are read.
+    """
+    count, last_updated = crud_events.get_events_version(db, user_id)
+    version = int(last_updated.timestamp() * 1_000_000) if last_updated else 0
+    etag = make_etag("events", count, version, weak=True)
+    headers = validator_headers(etag, last_updated)
+    if is_not_modified(request, etag, last_updated):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    if start and end:
+        return crud_events.get_events_in_window(
+            db=db, user_id=user_id, start=start, end=end
+        )
     return crud_events.get_events(db=db, user_id=user_id)
 
 
+@router.get("/search", response_model=EventSearchResponse)
+@router.get("/search/", response_model=EventSearchResponse)
+def search_events(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    fuzzy: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Ranked search over summary, course, description and location.
+
+    ``q`` accepts web-search syntax ("lab report", -quiz, midterm or final).
+    ``fuzzy`` also matches misspelled titles and course names.
+    """
+    hits, has_more = crud_search.search_events(
+        db=db,
+        user_id=user_id,
+        q=q,
+        start=start,
+        end=end,
+        event_type=event_type,
+        fuzzy=fuzzy,
+        limit=limit,
+        offset=offset,
+    )
+    results = [
+        EventSearchHit(
+            **EventSchema.model_validate(event, from_attributes=True).model_dump(),
+            rank=rank,
+        )
+        for event, rank in hits
+    ]
+    return EventSearchResponse(
+        results=results, limit=limit, offset=offset, has_more=has_more
+    )
+
+
+@router.get("/changes")
+@router.get("/changes/")
+async def stream_event_changes(user_id: int):
+    """Server-sent events for a user's event changes, replacing polling.
+
+    Each message's ``event:`` is the op ("create", "update", "delete",
+    "sync" when the Google mirror changed, or "resync" when the client should
+    refetch everything) and ``data:`` is the change as JSON.
+    """
+
+    async def stream():
+        async with hub.subscribe(user_id) as changes:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        changes.get(), CHANGE_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {change['op']}\ndata: {json.dumps(change)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/workload", response_model=List[WorkloadWeek])
+@router.get("/workload/", response_model=List[WorkloadWeek])
+def get_workload(
+    user_id: int,
+    start: date,
+    end: date,
+    db: Session = Depends(get_db),
+):
+    """Per-week event counts by type and course for the weeks overlapping
+    [start, end), read from the precomputed weekly_workload table."""
+    first_week = start - timedelta(days=start.weekday())
+    cells = crud_workload.get_workload(db, user_id, first_week, end)
+
+    weeks = {}
+    for cell in cells:
+        week = weeks.setdefault(
+            cell.week_start,
+            {"by_type": Counter(), "by_course": Counter(), "counts": []},
+        )
+        week["by_type"][cell.event_type] += cell.count
+        week["by_course"][cell.course_name] += cell.count
+        week["counts"].append(
+            WorkloadCount(
+                course_name=cell.course_name or None,
+                event_type=cell.event_type,
+                count=cell.count,
+            )
+        )
+    return [
+        WorkloadWeek(
+            week_start=week_start,
+            total=sum(week["by_type"].values()),
+            by_type=week["by_type"],
+            by_course=week["by_course"],
+            counts=week["counts"],
+        )
+        for week_start, week in weeks.items()
+    ]
+
+
 @router.get("/{event_id}", response_model=EventSchema)
 @router.get("/{event_id}/", response_model=EventSchema)
 def get_event(event_id: int, db: Session = Depends(get_db)):
@@ -35,13 +210,23 @@ def get_event(event_id: int, db: Session = Depends(get_db)):
 def update_event(
     event_id: int, updated_event: EventCreate, db: Session = Depends(get_db)
 ):
-    return crud_events.update_event(
+    db_event = crud_events.update_event(
         db=db, event_id=event_id, updated_event=updated_event
     )
+    # Keep the Google copy in step; the worker applies it in the background.
+    if db_event.google_event_id:
+        enqueue_event_update(db, db_event)
+    return db_event
 
 
 @router.delete("/{event_id}")
 @router.delete("/{event_id}/")
 def delete_event(event_id: int, db: Session = Depends(get_db)):
+    db_event = crud_events.get_event(db=db, event_id=event_id)
+    google_event_id = db_event.google_event_id if db_event else None
+    user_id = db_event.user_id if db_event else None
+
     crud_events.delete_event(db=db, event_id=event_id)
+    if google_event_id:
+        enqueue_event_delete(db, user_id, google_event_id)
     return {"message": "Event deleted successfully"}
@@ -0,0 +1,111 @@
+import os
+from typing import Optional
+
+from database import events as crud_events
+from database import feed_tokens as crud_feed_tokens
+from database.db import SessionLocal, get_db
+from database.user_cache import CachedUser
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from feeds.ics import (
+    CALENDAR_FOOTER,
+    calendar_header,
+    event_to_vevent,
+    new_timezones,
+)
+from itsdangerous import BadSignature, URLSafeSerializer
+from routers.conditional import is_not_modified, make_etag, validator_headers
+from routers.deps import get_current_user
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+router = APIRouter(prefix="/feeds", tags=["Feeds"])
+
+SESSION_SECRET = os.getenv("SESSION_SECRET")
+if not SESSION_SECRET:
+    # An empty key would let anyone forge a feed token for any user.
+    raise RuntimeError("SESSION_SECRET must be set to sign feed URLs")
+
+# Calendar apps cannot send our auth headers, so feed URLs carry a signed token.
+# It includes the user's feed token version, so rotating revokes leaked URLs.
+_signer = URLSafeSerializer(SESSION_SECRET, salt="ics-feed")
+
+
+def _feed_url(
+    request: Request, user_id: int, course_name: Optional[str], version: int
+) -> dict:
+    token = _signer.dumps(
+        {"user_id": user_id, "course_name": course_name, "v": version}
+    )
+    return {"url": str(request.url_for("get_ics_feed", token=token))}
+
+
+@router.get("/url")
+@router.get("/url/")
+def get_feed_url(
+    request: Request,
+    course_name: Optional[str] = None,
+    user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Subscribable .ics URL for all of the user's events, or one course."""
+    version = crud_feed_tokens.get_feed_token_version(db, user.id)
+    return _feed_url(request, user.id, course_name, version)
+
+
+@router.post("/rotate")
+@router.post("/rotate/")
+def rotate_feed_url(
+    request: Request,
+    course_name: Optional[str] = None,
+    user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Revoke every feed URL issued to the user and return a fresh one."""
+    version = crud_feed_tokens.rotate_feed_token(db, user.id)
+    return _feed_url(request, user.id, course_name, version)
+
+
+def _stream_feed(user_id: int, course_name: Optional[str], name: str):
+    # Own session: the request-scoped one may close before streaming ends.
+    db = SessionLocal()
+    emitted = set()
+    try:
+        yield calendar_header(name)
+        for batch in crud_events.iter_event_batches(db, user_id, course_name):
+            yield new_timezones(batch, emitted) + "".join(
+                event_to_vevent(event) for event in batch
+            )
+        yield CALENDAR_FOOTER
+    finally:
+        db.close()
+
+
+@router.get("/{token}.ics")
+def get_ics_feed(token: str, request: Request, db: Session = Depends(get_db)):
+    """Stream the feed as iCalendar, answering 304 when nothing changed."""
+    try:
+        claims = _signer.loads(token)
+    except BadSignature:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    user_id = claims["user_id"]
+    if claims.get("v") != crud_feed_tokens.get_feed_token_version(db, user_id):
+        raise HTTPException(status_code=404, detail="Feed not found")
+    course_name = claims.get("course_name")
+
+    count, last_updated = crud_events.get_events_version(db, user_id, course_name)
+    version = int(last_updated.timestamp() * 1_000_000) if last_updated else 0
+    etag = make_etag("ics", count, version, weak=True)
+    headers = validator_headers(etag, last_updated)
+
+    if is_not_modified(request, etag, last_updated):
+        return Response(status_code=304, headers=headers)
+
+    name = f"{course_name} Schedule" if course_name else "Semester Planner"
+    return StreamingResponse(
+        _stream_feed(user_id, course_name, name),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
@@ -1,123 +1,234 @@
-from datetime import datetime
-import requests
+from datetime import datetime, timedelta
+from typing import List, Optional
+
 from database import events as crud_events
+from database import gcal_events as crud_gcal
+from database import gcal_jobs as crud_jobs
 from database.db import get_db
-from database.models import User
-from database.users import select_user_by_id
-from fastapi import APIRouter, Depends, HTTPException
-from routers.schemas import EventSchema
+from database.user_cache import CachedUser
+from dateutil import tz as dateutil_tz
+from fastapi import APIRouter, Depends, Header, HTTPException
+from gcal.calendars import fetch_range
+from gcal.jobs import enqueue_event_insert, enqueue_study_block
+from gcal.sync import mirror_window_start, selected_calendars, sync_user_calendar
+from planner.free_slots import (
+    BusyIndex,
+    Interval,
+    find_free_slots,
+    place_blocks_before,
+    working_windows,
+)
+from routers.deps import get_current_user
+from routers.schemas import (
+    EventCreate,
+    FreeSlotRequest,
+    FreeSlotResponse,
+    GCalJobSchema,
+)
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/gcal", tags=["GCal"])
 
 
 # Google Events Logic
-@router.post("/add-event", response_model=EventSchema)
-@router.post("/add-event/", response_model=EventSchema)
-def post_event_to_google(user_id: int, event_id: int, db: Session = Depends(get_db)):
+@router.post("/add-event", response_model=GCalJobSchema, status_code=202)
+@router.post("/add-event/", response_model=GCalJobSchema, status_code=202)
+def post_event_to_google(
+    user_id: int,
+    event_id: int,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Queue the event for upload to Google Calendar and return the job."""
     event = crud_events.get_event(db, event_id=event_id)
-    user: User = select_user_by_id(db, user_id)
-    access_token = user.access_token
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
 
-    url = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
-    data = {
-        "summary": event.summary,
-        "description": event.description or "",
-        "location": event.location or "",
-        "colorId": event.colorId or "1",
-        "eventType": "default",
-        "start": {
-            "dateTime": event.start.isoformat(),
-            "timeZone": str(event.start.tzinfo),
-        },
-        "end": {"dateTime": event.end.isoformat(), "timeZone": str(event.end.tzinfo)},
-        # "recurrence": event.recurrence #leaving blank for now
-    }
+    key = f"{user_id}:{idempotency_key}" if idempotency_key else None
+    return enqueue_event_insert(db, user_id, event, idempotency_key=key)
 
-    resp = requests.post(url, headers=headers, json=data)
 
-    if resp.status_code == 200:
-        resp_data = resp.json() or {}
-        google_event_id = resp_data.get("id", None)
-        event.google_event_id = google_event_id
-        db.commit()
-        db.refresh(event)
-        return event
-    else:
-        raise Exception("Error uploading event to GCal")
+@router.get("/jobs/{job_id}", response_model=GCalJobSchema)
+@router.get("/jobs/{job_id}/", response_model=GCalJobSchema)
+def get_gcal_job(job_id: int, db: Session = Depends(get_db)):
+    job = crud_jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @router.get("/events")
 @router.get("/events/")
 def get_calendar_events(
-    user_id: int, start_date: str, end_date: str, db: Session = Depends(get_db)
+    start_date: str,
+    end_date: str,
+    user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    """Get user's Google Calendar events for a date range"""
-    user = select_user_by_id(db, user_id)
-    access_token = user.access_token
-
-    url = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-    }
-    params = {
-        "timeMin": start_date,
-        "timeMax": end_date,
-        "singleEvents": True,
-        "orderBy": "startTime",
-    }
-
-    resp = requests.get(url, headers=headers, params=params)
-
-    if resp.status_code == 200:
-        return resp.json()
-    else:
-        raise HTTPException(
-            status_code=resp.status_code, detail="Error fetching calendar events"
-        )
-
-
-@router.post("/study-block")
-@router.post("/study-block/")
+    """Get user's Google Calendar events for a date range.
+
+    Covers every calendar the user has selected in Google Calendar, merged
+    into one list ordered by start time, each event tagged with its
+    ``calendarId``. Served from the local mirror after an incremental sync;
+    ranges reaching further back than the mirror window are fetched from
+    Google directly, all calendars in parallel and every page followed.
+    """
+    range_start = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+    range_end = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+    items = _google_items(db, user, range_start, range_end)
+    return {"kind": "calendar#events", "items": items}
+
+
+def _google_items(
+    db: Session, user: CachedUser, range_start: datetime, range_end: datetime
+) -> List[dict]:
+    """Google events in [range_start, range_end), after an incremental sync.
+
+    Read from the mirror when its window covers the range; otherwise fetched
+    live, since the mirror holds nothing before its window start.
+    """
+    sync_user_calendar(db, user)
+    window_start = mirror_window_start(db, user.id)
+    if window_start is not None and range_start.tzinfo and range_start >= window_start:
+        return crud_gcal.get_mirrored_events(db, user.id, range_start, range_end)
+    return fetch_range(
+        user.access_token,
+        selected_calendars(db, user.id),
+        range_start.isoformat(),
+        range_end.isoformat(),
+    )
+
+
+@router.post("/study-block", response_model=GCalJobSchema, status_code=202)
+@router.post("/study-block/", response_model=GCalJobSchema, status_code=202)
 def add_study_block_to_calendar(
-    user_id: int, summary: str, start: str, end: str, db: Session = Depends(get_db)
+    user_id: int,
+    summary: str,
+    start: str,
+    end: str,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
 ):
-    """Add a study block directly to Google Calendar"""
-    user = select_user_by_id(db, user_id)
-    access_token = user.access_token
-
+    """Queue a study block for Google Calendar"""
     # Parse the datetime strings
     start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
     end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
 
-    url = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
-    data = {
-        "summary": summary,
-        "description": "Study block created by Study Planner",
-        "colorId": "5",  # Yellow color for study blocks
-        "start": {
-            "dateTime": start_dt.isoformat(),
-            "timeZone": str(start_dt.tzinfo) if start_dt.tzinfo else "America/Chicago",
-        },
-        "end": {
-            "dateTime": end_dt.isoformat(),
-            "timeZone": str(end_dt.tzinfo) if end_dt.tzinfo else "America/Chicago",
-        },
-    }
-
-    resp = requests.post(url, headers=headers, json=data)
-
-    if resp.status_code == 200:
-        return resp.json()
-    else:
-        raise HTTPException(
-            status_code=resp.status_code, detail="Error adding event to calendar"
+    key = f"{user_id}:{idempotency_key}" if idempotency_key else None
+    return enqueue_study_block(
+        db, user_id, summary, start_dt, end_dt, idempotency_key=key
+    )
+
+
+def _google_busy_intervals(items: List[dict]) -> List[Interval]:
+    """Timed, opaque Google events; all-day and 'free' events do not block time."""
+    busy = []
+    for item in items:
+        if item.get("transparency") == "transparent":
+            continue
+        start = (item.get("start") or {}).get("dateTime")
+        end = (item.get("end") or {}).get("dateTime")
+        if start and end:
+            busy.append(
+                (
+                    datetime.fromisoformat(start.replace("Z", "+00:00")),
+                    datetime.fromisoformat(end.replace("Z", "+00:00")),
+                )
+            )
+    return busy
+
+
+@router.post("/free-slots", response_model=FreeSlotResponse)
+@router.post("/free-slots/", response_model=FreeSlotResponse)
+def find_free_study_slots(
+    request: FreeSlotRequest,
+    user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Find free time across local events and Google Calendar.
+
+    Optionally places `blocks_per_exam` study blocks before each exam in the
+    range and saves them as events in one insert.
+    """
+    user_id = user.id
+    tzinfo = dateutil_tz.gettz(request.timezone)
+    if tzinfo is None:
+        raise HTTPException(status_code=400, detail="Unknown timezone")
+    range_start = request.start.replace(tzinfo=request.start.tzinfo or tzinfo)
+    range_end = request.end.replace(tzinfo=request.end.tzinfo or tzinfo)
+    buffer = timedelta(minutes=request.buffer_minutes)
+    exam_buffer = timedelta(minutes=request.exam_buffer_minutes)
+    block = timedelta(minutes=request.block_minutes)
+
+    # Pull in events just outside the range whose buffers still reach into it.
+    pad = max(buffer, exam_buffer)
+    # Recurring lectures are expanded so each occurrence blocks its slot.
+    local_events = crud_events.get_events_in_window(
+        db, user_id, range_start - pad, range_end + pad
+    )
+    google_items = _google_items(db, user, range_start - pad, range_end + pad)
+
+    busy: List[Interval] = []
+    exams = []
+    for event in local_events:
+        if event.eventType == "assignment":
+            continue  # deadlines, not time commitments
+        extra = buffer
+        if event.eventType == "exam":
+            extra = max(buffer, exam_buffer)
+            if range_start <= event.start < range_end:
+                exams.append(event)
+        busy.append((event.start - extra, event.end + extra))
+    busy.extend(
+        (start - buffer, end + buffer)
+        for start, end in _google_busy_intervals(google_items)
+    )
+    index = BusyIndex(busy)
+
+    windows = list(
+        working_windows(
+            range_start,
+            range_end,
+            request.day_start,
+            request.day_end,
+            request.weekdays,
+            tzinfo,
         )
+    )
+
+    placed_events = []
+    if request.blocks_per_exam and exams:
+        drafts = []
+        for exam in exams:
+            not_before = max(
+                range_start, exam.start - timedelta(days=request.days_before_exam)
+            )
+            for start, end in place_blocks_before(
+                index, exam.start, request.blocks_per_exam, block, windows, not_before
+            ):
+                drafts.append(
+                    EventCreate(
+                        user_id=user_id,
+                        google_event_id=None,
+                        summary=f"Study: {exam.summary}",
+                        description="Study block created by Study Planner",
+                        location=None,
+                        colorId="5",
+                        eventType="study",
+                        start=start,
+                        end=end,
+                        recurrence=None,
+                        time_zone=request.timezone,
+                        course_name=exam.course_name,
+                    )
+                )
+        placed_events = crud_events.create_events_bulk(db, drafts)
+        if request.push_to_google:
+            for event in placed_events:
+                enqueue_event_insert(db, user_id, event)
+
+    slots = find_free_slots(index, windows, block)
+    return {
+        "slots": [{"start": start, "end": end} for start, end in slots],
+        "placed": placed_events,
+    }
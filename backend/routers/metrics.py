@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from monitoring.registry import render_all
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of request, DB and Google API metrics."""
+    return PlainTextResponse(render_all(), media_type="text/plain; version=0.0.4")
@@ -1,33 +1,91 @@
+import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.orm import Session
 
+from database import syllabi as crud_syllabi
 from database.db import get_db
+from database.models import User
+from parser.parser_app import detect_course_code
 from parser.parser_app import parser as parse_syllabus
+from routers.deps import is_instructor
 from routers.schemas import EventDraftSchema
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/parser", tags=["Parser"])
 
 
 @router.post("/parse", response_model=List[EventDraftSchema])
 @router.post("/parse/", response_model=List[EventDraftSchema])
-async def parse_events_from_file(
+def parse_events_from_file(
+    response: Response,
     file: UploadFile = File(...),
     semester_start: Optional[str] = Form(None),
     timezone: str = Form("America/Chicago"),
+    collapse_recurring: bool = Form(False),
+    user_id: Optional[int] = Form(None),
     db: Session = Depends(get_db),
 ):
+    """Parse a syllabus into drafts, reusing the shared catalog entry when the
+    same document was already parsed with the same options.
+
+    The entry's id is returned in ``X-Syllabus-Id``; ``POST
+    /syllabi/{id}/enroll`` turns it into the user's events. An instructor's
+    upload claims an entry nobody owns yet; the owner, if any, is returned in
+    ``X-Syllabus-Owner-Id``.
+
+    A plain ``def`` on purpose: FastAPI runs it on the threadpool, so the
+    CPU-bound parse and the blocking session never stall the event loop.
+    """
+    uploader = db.get(User, user_id) if user_id is not None else None
+    if user_id is not None and uploader is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    # Students can enroll in an entry but never own, and so revise, it
+    owner_id = uploader.id if uploader and is_instructor(uploader.email) else None
+
     try:
-        file_bytes = await file.read()
-        events = parse_syllabus(
-            file_bytes=file_bytes,
-            filename=file.filename or "upload",
-            semester_start=semester_start,
-            timezone=timezone,
+        file_bytes = file.file.read()
+        doc_hash = crud_syllabi.document_hash(file_bytes)
+        options = crud_syllabi.parse_options_key(
+            semester_start, timezone, collapse_recurring
         )
 
-        return events
+        syllabus = crud_syllabi.find_syllabus(db, doc_hash, options)
+        if syllabus is None:
+            events = parse_syllabus(
+                file_bytes=file_bytes,
+                filename=file.filename or "upload",
+                semester_start=semester_start,
+                timezone=timezone,
+                collapse_recurring=collapse_recurring,
+            )
+            syllabus = crud_syllabi.create_syllabus(
+                db,
+                document_hash=doc_hash,
+                parse_options=options,
+                drafts=events,
+                course_code=detect_course_code(events),
+                filename=file.filename,
+                owner_id=owner_id,
+            )
+        elif syllabus.owner_id is None and owner_id is not None:
+            syllabus = crud_syllabi.claim_syllabus(db, syllabus, owner_id)
+
+        response.headers["X-Syllabus-Id"] = str(syllabus.id)
+        if syllabus.owner_id is not None:
+            response.headers["X-Syllabus-Owner-Id"] = str(syllabus.owner_id)
+        return syllabus.drafts
 
     except Exception as e:
+        logger.exception("Failed to parse %s", file.filename)
         raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
@@ -1,7 +1,7 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, time
+from typing import Annotated, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class UserBase(BaseModel):
@@ -34,6 +34,7 @@ class EventBase(BaseModel):
     start: datetime
     end: datetime
     recurrence: Optional[str]
+    time_zone: Optional[str] = None  # IANA name, e.g. "America/Chicago"
 
     # Non Google Calendar
     course_name: Optional[str]
@@ -52,11 +53,39 @@ class EventCreate(EventBase):
 
 class EventSchema(EventCreate):
     id: int
+    # Set on expanded occurrences of a recurring event; equals `id`
+    recurring_event_id: Optional[int] = None
+    syllabus_id: Optional[int] = None
 
     class Config:
         orm_mode = True
 
 
+class EventSearchHit(EventSchema):
+    rank: float
+
+
+class EventSearchResponse(BaseModel):
+    results: List[EventSearchHit]
+    limit: int
+    offset: int
+    has_more: bool
+
+
+class WorkloadCount(BaseModel):
+    course_name: Optional[str] = None
+    event_type: str
+    count: int
+
+
+class WorkloadWeek(BaseModel):
+    week_start: date  # Monday
+    total: int
+    by_type: Dict[str, int]
+    by_course: Dict[str, int]  # "" = events without a course
+    counts: List[WorkloadCount]
+
+
 class EventDraftSchema(BaseModel):
     # aligned to EventBase
     summary: str
@@ -68,15 +97,87 @@ class EventDraftSchema(BaseModel):
     start: datetime
     end: Optional[datetime] = None
     recurrence: Optional[str] = None
+    time_zone: Optional[str] = None
 
     # non Gcal
     course_name: Optional[str] = None
 
     # draft only helpers
     all_day: bool = False
+    catalog_key: Optional[str] = None  # stable id within a shared syllabus
     source_page: Optional[int] = None
     source_line: Optional[int] = None
+    # Every (page, line) a merged duplicate was found at
+    source_locations: List[Tuple[int, int]] = []
     raw_text: str
 
     class Config:
         orm_mode = True
+
+
+class SyllabusSummary(BaseModel):
+    id: int
+    course_code: Optional[str] = None
+    filename: Optional[str] = None
+    revision: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class SyllabusSchema(SyllabusSummary):
+    drafts: List[EventDraftSchema]
+
+
+class GCalJobSchema(BaseModel):
+    id: int
+    action: str
+    status: str
+    attempts: int
+    event_id: Optional[int] = None
+    google_event_id: Optional[str] = None
+    last_error: Optional[str] = None
+    run_after: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class FreeSlotRequest(BaseModel):
+    start: datetime
+    end: datetime
+    block_minutes: int = Field(60, gt=0)
+    timezone: str = "America/Chicago"
+
+    # Working hours, local to `timezone`, e.g. "09:00"; weekdays use Monday = 0
+    day_start: time = time(9)
+    day_end: time = time(21)
+    weekdays: List[Annotated[int, Field(ge=0, le=6)]] = [0, 1, 2, 3, 4, 5, 6]
+
+    # kept clear around every busy interval / around exams
+    buffer_minutes: int = Field(15, ge=0)
+    exam_buffer_minutes: int = Field(60, ge=0)
+
+    # Optional study block placement before each exam in range; None places none
+    blocks_per_exam: Optional[int] = Field(None, gt=0)
+    days_before_exam: int = Field(7, ge=0)
+    push_to_google: bool = False
+
+    @model_validator(mode="after")
+    def _check_ranges(self):
+        if self.end <= self.start:
+            raise ValueError("end must be after start")
+        if self.day_end <= self.day_start:
+            raise ValueError("day_end must be after day_start")
+        return self
+
+
+class TimeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class FreeSlotResponse(BaseModel):
+    slots: List[TimeSlot]
+    placed: List[EventSchema] = []
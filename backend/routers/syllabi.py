@@ -0,0 +1,78 @@
+from typing import List, Optional
+
+from database import syllabi as crud_syllabi
+from database.db import get_db
+from database.user_cache import CachedUser
+from fastapi import APIRouter, Depends, HTTPException
+from gcal.jobs import enqueue_event_delete, enqueue_event_update
+from routers.deps import get_current_user, is_instructor
+from routers.schemas import (
+    EventDraftSchema,
+    EventSchema,
+    SyllabusSchema,
+    SyllabusSummary,
+)
+from sqlalchemy.orm import Session
+
+router = APIRouter(prefix="/syllabi", tags=["Syllabi"])
+
+
+def _get_or_404(db: Session, syllabus_id: int):
+    syllabus = crud_syllabi.get_syllabus(db, syllabus_id)
+    if syllabus is None:
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+    return syllabus
+
+
+@router.get("", response_model=List[SyllabusSummary])
+@router.get("/", response_model=List[SyllabusSummary])
+def list_syllabi(course_code: Optional[str] = None, db: Session = Depends(get_db)):
+    return crud_syllabi.list_syllabi(db, course_code=course_code)
+
+
+@router.get("/{syllabus_id}", response_model=SyllabusSchema)
+@router.get("/{syllabus_id}/", response_model=SyllabusSchema)
+def get_syllabus(syllabus_id: int, db: Session = Depends(get_db)):
+    return _get_or_404(db, syllabus_id)
+
+
+@router.post("/{syllabus_id}/enroll", response_model=List[EventSchema])
+@router.post("/{syllabus_id}/enroll/", response_model=List[EventSchema])
+def enroll(
+    syllabus_id: int,
+    user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Add a shared syllabus' events to a user's calendar."""
+    syllabus = _get_or_404(db, syllabus_id)
+    return crud_syllabi.link_user(db, syllabus, user.id)
+
+
+@router.put("/{syllabus_id}", response_model=SyllabusSchema)
+@router.put("/{syllabus_id}/", response_model=SyllabusSchema)
+def revise_syllabus(
+    syllabus_id: int,
+    drafts: List[EventDraftSchema],
+    user: CachedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Publish a revised schedule to everyone enrolled in the syllabus.
+
+    Drafts keep their ``catalog_key`` to update in place; drafts without one
+    are added and missing keys are removed. Only the entry's owner, who must
+    still be listed in ``INSTRUCTOR_EMAILS``, may revise, and events an
+    enrolled user has edited keep their edits.
+    """
+    syllabus = _get_or_404(db, syllabus_id)
+    if syllabus.owner_id != user.id or not is_instructor(user.email):
+        raise HTTPException(status_code=403, detail="Not the owner of this syllabus")
+
+    syllabus, updated, deleted = crud_syllabi.revise_syllabus(db, syllabus, drafts)
+
+    # Keep Google copies in step; the worker applies these in the background.
+    for event in updated:
+        if event.google_event_id:
+            enqueue_event_update(db, event)
+    for owner_id, google_event_id in deleted:
+        enqueue_event_delete(db, owner_id, google_event_id)
+    return syllabus
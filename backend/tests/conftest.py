@@ -0,0 +1,41 @@
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+# database.db builds its engine at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# routers.feeds refuses to sign feed URLs without it
+os.environ.setdefault("SESSION_SECRET", "test-secret")
+
+from database.db import Base  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """A session on a fresh in-memory SQLite database."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _register_now(conn, record):
+        # Server defaults call now(), which SQLite lacks
+        conn.create_function(
+            "now", 0, lambda: datetime.now(timezone.utc).isoformat(" ")
+        )
+
+    import database.models  # noqa: F401  (registers the tables)
+
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
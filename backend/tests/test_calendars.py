@@ -0,0 +1,65 @@
+import contextvars
+import threading
+import time
+
+import pytest
+from gcal import calendars
+from gcal.http import google_session
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_results_keep_argument_order_and_context():
+    request_id.set("req-1")
+
+    def slow_echo(value, delay):
+        time.sleep(delay)
+        return value, request_id.get()
+
+    results = calendars.map_concurrently(
+        slow_echo, [("a", 0.03), ("b", 0.0), ("c", 0.01)]
+    )
+
+    assert results == [("a", "req-1"), ("b", "req-1"), ("c", "req-1")]
+
+
+def test_at_most_fetch_concurrency_calls_run_at_once(monkeypatch):
+    monkeypatch.setattr(calendars, "FETCH_CONCURRENCY", 2)
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def tracked(_):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    calendars.map_concurrently(tracked, [(i,) for i in range(6)])
+
+    assert peak == 2
+
+
+def test_failure_is_raised_after_every_call_finished():
+    finished = []
+
+    def maybe_fail(value):
+        if value == 0:
+            raise ValueError("calendar 0")
+        time.sleep(0.01)
+        finished.append(value)
+
+    with pytest.raises(ValueError, match="calendar 0"):
+        calendars.map_concurrently(maybe_fail, [(0,), (1,), (2,)])
+    assert sorted(finished) == [1, 2]
+
+
+def test_each_thread_has_its_own_google_session():
+    sessions = calendars.map_concurrently(
+        lambda _: (time.sleep(0.01), google_session())[1], [(i,) for i in range(2)]
+    )
+
+    assert sessions[0] is not sessions[1]
+    assert google_session() is google_session()
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from parser.parser_app import EventDraft, _dedupe_drafts
+
+
+def _draft(summary: str, start: datetime, **fields) -> EventDraft:
+    values = dict(
+        summary=summary,
+        start=start,
+        eventType="assignment",
+        raw_text=summary,
+        source_page=1,
+        source_locations=[],
+    )
+    values.update(fields)
+    return EventDraft(**values)
+
+
+DUE = datetime(2026, 2, 3, 23, 59)
+
+
+def test_overlapping_window_repeats_merge_into_richest_draft():
+    short = _draft("Homework 1 due", DUE, source_locations=[(1, 4)])
+    rich = _draft(
+        "Homework 1 due",
+        DUE,
+        raw_text="Feb 3 Homework 1 due on Canvas by 11:59pm",
+        source_locations=[(1, 5)],
+    )
+    located = _draft(
+        "Homework 1 due", DUE, location="Canvas", source_locations=[(2, 1)]
+    )
+
+    (merged,) = _dedupe_drafts([short, rich, located])
+
+    assert merged.raw_text == rich.raw_text
+    assert merged.location == "Canvas"
+    assert merged.source_locations == [(1, 4), (1, 5), (2, 1)]
+
+
+def test_contained_summary_is_a_duplicate():
+    drafts = [
+        _draft("Midterm exam", DUE, eventType="exam"),
+        _draft("Midterm exam CS 101", DUE, eventType="exam"),
+    ]
+
+    assert len(_dedupe_drafts(drafts)) == 1
+
+
+def test_numbers_type_and_time_keep_drafts_apart():
+    drafts = [
+        _draft("Homework 1 due", DUE),
+        _draft("Homework 2 due", DUE),
+        _draft("Homework 1 due", DUE, eventType="exam"),
+        _draft("Homework 1 due", DUE.replace(hour=9)),
+    ]
+
+    assert len(_dedupe_drafts(drafts)) == 4
+
+
+def test_all_day_draft_merges_with_timed_one_same_day():
+    drafts = [
+        _draft(
+            "Midterm exam",
+            DUE.replace(hour=0, minute=0),
+            eventType="exam",
+            all_day=True,
+            raw_text="Feb 3 Midterm exam covering chapters 1-5",
+        ),
+        _draft(
+            "Midterm exam",
+            DUE.replace(hour=14, minute=0),
+            eventType="exam",
+            end=DUE.replace(hour=15, minute=30),
+        ),
+    ]
+
+    (merged,) = _dedupe_drafts(drafts)
+
+    assert merged.raw_text == "Feb 3 Midterm exam covering chapters 1-5"
+    assert merged.start == DUE.replace(hour=14, minute=0)
+    assert merged.end == DUE.replace(hour=15, minute=30)
+    assert merged.all_day is False
+
+
+def test_all_day_draft_does_not_bridge_different_times():
+    day = DUE.replace(hour=0, minute=0)
+    drafts = [
+        _draft("Midterm exam", day, eventType="exam", all_day=True),
+        _draft("Midterm exam", day.replace(hour=9), eventType="exam"),
+        _draft("Midterm exam", day.replace(hour=14), eventType="exam"),
+    ]
+
+    merged = _dedupe_drafts(drafts)
+
+    assert sorted(d.start.hour for d in merged) == [9, 14]
+    assert not any(d.all_day for d in merged)
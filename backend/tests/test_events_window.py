@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from database.events import create_event, get_events_in_window
+from routers.schemas import EventCreate
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _create(db, summary, start, duration=timedelta(hours=1), **fields):
+    values = dict(
+        user_id=1,
+        google_event_id=None,
+        summary=summary,
+        description=None,
+        location=None,
+        colorId=None,
+        start=start,
+        end=start + duration,
+        recurrence=None,
+        course_name=None,
+    )
+    values.update(fields)
+    return create_event(db, EventCreate(**values))
+
+
+def test_series_is_expanded_into_occurrences_in_the_window(db):
+    # Tuesdays 10:00 Chicago (15:00 UTC before the November change)
+    lecture = _create(
+        db,
+        "Lecture",
+        _utc(2026, 10, 20, 15),
+        recurrence="RRULE:FREQ=WEEKLY;COUNT=4",
+        time_zone="America/Chicago",
+    )
+    _create(db, "Office hours", _utc(2026, 10, 28, 18))
+    _create(db, "Outside", _utc(2026, 12, 1, 18))
+
+    events = get_events_in_window(db, 1, _utc(2026, 10, 26), _utc(2026, 11, 9))
+
+    assert [(e.summary, e.start) for e in events] == [
+        ("Lecture", _utc(2026, 10, 27, 15)),
+        ("Office hours", _utc(2026, 10, 28, 18)),
+        ("Lecture", _utc(2026, 11, 3, 16)),  # still 10:00 local after DST ends
+    ]
+    assert [e.recurring_event_id for e in events] == [lecture.id, None, lecture.id]
+    assert events[0].end - events[0].start == timedelta(hours=1)
+
+
+def test_other_users_and_blank_rules_are_excluded(db):
+    _create(db, "Theirs", _utc(2026, 10, 27, 15), user_id=2)
+    _create(db, "Blank rule", _utc(2026, 9, 1, 15), recurrence=" ")
+
+    assert get_events_in_window(db, 1, _utc(2026, 10, 26), _utc(2026, 11, 2)) == []
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from database.db import get_db
+from database.events import create_event
+from database.user_cache import CachedUser
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from routers import feeds as feeds_router
+from routers.deps import get_current_user
+from routers.schemas import EventCreate
+
+
+def _user(user_id: int) -> CachedUser:
+    return CachedUser(
+        id=user_id,
+        google_id=f"g-{user_id}",
+        email=f"user{user_id}@example.edu",
+        name="Student",
+        access_token=f"token-{user_id}",
+        token_expires_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture
+def app(db, monkeypatch):
+    # The feed body streams from its own session; hand it the test one
+    monkeypatch.setattr(feeds_router, "SessionLocal", lambda: db)
+    app = FastAPI()
+    app.include_router(feeds_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: _user(1)
+    start = datetime(2026, 10, 20, 15, tzinfo=timezone.utc)
+    create_event(
+        db,
+        EventCreate(
+            user_id=1,
+            google_event_id=None,
+            summary="Lecture",
+            description=None,
+            location=None,
+            colorId=None,
+            start=start,
+            end=start + timedelta(hours=1),
+            recurrence=None,
+            course_name="CS 101",
+        ),
+    )
+    return app
+
+
+def _path(url: str) -> str:
+    return url.replace("http://testserver", "")
+
+
+def test_feed_url_serves_the_current_users_events(app):
+    client = TestClient(app)
+
+    url = client.get("/feeds/url").json()["url"]
+    response = client.get(_path(url))
+
+    assert response.status_code == 200
+    assert "SUMMARY:Lecture" in response.text
+
+
+def test_rotating_revokes_old_urls(app):
+    client = TestClient(app)
+    old = client.get("/feeds/url").json()["url"]
+
+    new = client.post("/feeds/rotate").json()["url"]
+
+    assert client.get(_path(old)).status_code == 404
+    assert client.get(_path(new)).status_code == 200
+    assert client.get("/feeds/url").json()["url"] == new
+
+
+def test_unversioned_and_forged_tokens_are_rejected(app):
+    client = TestClient(app)
+    legacy = feeds_router._signer.dumps({"user_id": 1, "course_name": None})
+
+    assert client.get(f"/feeds/{legacy}.ics").status_code == 404
+    assert client.get("/feeds/not-a-token.ics").status_code == 404
@@ -0,0 +1,113 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from planner.free_slots import BusyIndex, place_blocks_before, working_windows
+
+HOUR = timedelta(hours=1)
+
+
+def _at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 10, day, hour, minute, tzinfo=timezone.utc)
+
+
+def test_busy_index_merges_overlapping_and_touching_intervals():
+    index = BusyIndex(
+        [
+            (_at(5, 10), _at(5, 11)),
+            (_at(5, 10, 30), _at(5, 12)),
+            (_at(5, 12), _at(5, 13)),  # touches the previous one
+            (_at(5, 15), _at(5, 15)),  # empty, dropped
+        ]
+    )
+
+    assert len(index) == 1
+    assert index.free_within(_at(5, 9), _at(5, 14)) == [
+        (_at(5, 9), _at(5, 10)),
+        (_at(5, 13), _at(5, 14)),
+    ]
+
+
+def test_free_within_clips_busy_time_at_the_window_edges():
+    index = BusyIndex([(_at(5, 8), _at(5, 10)), (_at(5, 16), _at(5, 18))])
+
+    assert index.free_within(_at(5, 9), _at(5, 17)) == [(_at(5, 10), _at(5, 16))]
+    assert index.free_within(_at(5, 8), _at(5, 10)) == []
+    assert index.free_within(_at(5, 11), _at(5, 12)) == [(_at(5, 11), _at(5, 12))]
+
+
+def test_add_bridges_the_intervals_it_touches():
+    index = BusyIndex([(_at(5, 10), _at(5, 11)), (_at(5, 14), _at(5, 15))])
+
+    index.add(_at(5, 11), _at(5, 14))
+
+    assert len(index) == 1
+    assert index.free_within(_at(5, 9), _at(5, 16)) == [
+        (_at(5, 9), _at(5, 10)),
+        (_at(5, 15), _at(5, 16)),
+    ]
+
+
+def test_working_windows_skip_weekdays_and_clip_to_range():
+    # 2026-10-05 is a Monday
+    windows = list(
+        working_windows(
+            _at(5, 12), _at(10, 12), time(9), time(17), [0, 2, 4], timezone.utc
+        )
+    )
+
+    assert windows == [
+        (_at(5, 12), _at(5, 17)),
+        (_at(7, 9), _at(7, 17)),
+        (_at(9, 9), _at(9, 17)),
+    ]
+
+
+def test_working_windows_follow_local_hours_across_dst():
+    chicago = ZoneInfo("America/Chicago")
+    # DST ends Sunday 2026-11-01
+    windows = list(
+        working_windows(
+            datetime(2026, 10, 31, 5, tzinfo=timezone.utc),
+            datetime(2026, 11, 2, 5, tzinfo=timezone.utc),
+            time(9),
+            time(17),
+            range(7),
+            chicago,
+        )
+    )
+
+    assert [ws.astimezone(timezone.utc).hour for ws, _ in windows] == [14, 15]
+
+
+def test_place_blocks_before_uses_latest_gap_on_distinct_days():
+    windows = [(_at(day, 9), _at(day, 17)) for day in (5, 6, 7)]
+    index = BusyIndex([(_at(7, 15), _at(7, 17))])
+
+    placed = place_blocks_before(index, _at(7, 12), 2, 2 * HOUR, windows)
+
+    # The deadline cuts day 7 short; one block per day, latest first
+    assert placed == [(_at(6, 15), _at(6, 17)), (_at(7, 10), _at(7, 12))]
+    assert index.free_within(_at(7, 9), _at(7, 12)) == [(_at(7, 9), _at(7, 10))]
+
+
+def test_place_blocks_before_respects_not_before_and_busy_time():
+    windows = [(_at(day, 9), _at(day, 17)) for day in (5, 6, 7)]
+    index = BusyIndex([(_at(6, 9), _at(6, 16))])
+
+    placed = place_blocks_before(
+        index, _at(8, 0), 3, 2 * HOUR, windows, not_before=_at(6, 0)
+    )
+
+    # Day 6 has only an hour free and day 5 is before not_before
+    assert placed == [(_at(7, 15), _at(7, 17))]
+
+
+def test_placed_blocks_are_not_reused_by_the_next_exam():
+    windows = [(_at(5, 9), _at(5, 12))]
+    index = BusyIndex()
+
+    first = place_blocks_before(index, _at(6, 0), 1, 2 * HOUR, windows)
+    second = place_blocks_before(index, _at(6, 0), 1, 2 * HOUR, windows)
+
+    assert first == [(_at(5, 10), _at(5, 12))]
+    assert second == []
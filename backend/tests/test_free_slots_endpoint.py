@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from database.db import get_db
+from database.events import create_event
+from database.models import Event
+from database.user_cache import CachedUser
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from routers import gcal as gcal_router
+from routers.deps import get_current_user
+from routers.schemas import EventCreate
+
+USER = CachedUser(
+    id=1,
+    google_id="g-1",
+    email="student@example.edu",
+    name="Student",
+    access_token="token",
+    token_expires_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+)
+
+BODY = {
+    "start": "2026-10-19T00:00:00Z",
+    "end": "2026-10-24T00:00:00Z",
+    "timezone": "UTC",
+    "day_start": "09:00",
+    "day_end": "18:00",
+}
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    # No Google account in tests: nothing busy on the user's calendars
+    monkeypatch.setattr(gcal_router, "_google_items", lambda *args: [])
+    app = FastAPI()
+    app.include_router(gcal_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: USER
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "invalid",
+    [
+        {"block_minutes": 0},
+        {"block_minutes": -30},
+        {"blocks_per_exam": 0},
+        {"days_before_exam": -1},
+        {"buffer_minutes": -5},
+        {"exam_buffer_minutes": -5},
+        {"end": BODY["start"]},
+        {"day_start": "18:00", "day_end": "09:00"},
+        {"day_start": "9am"},
+        {"weekdays": [0, 7]},
+    ],
+)
+def test_invalid_requests_are_rejected(client, invalid):
+    response = client.post("/gcal/free-slots", json=BODY | invalid)
+
+    assert response.status_code == 422
+
+
+def test_study_blocks_are_placed_before_the_exam(client, db):
+    exam_start = datetime(2026, 10, 23, 14, tzinfo=timezone.utc)
+    create_event(
+        db,
+        EventCreate(
+            user_id=1,
+            google_event_id=None,
+            summary="Midterm",
+            description=None,
+            location=None,
+            colorId=None,
+            eventType="exam",
+            start=exam_start,
+            end=exam_start + timedelta(hours=2),
+            recurrence=None,
+            course_name="CS 101",
+        ),
+    )
+
+    response = client.post(
+        "/gcal/free-slots", json=BODY | {"blocks_per_exam": 2, "block_minutes": 90}
+    )
+
+    assert response.status_code == 200
+    placed = response.json()["placed"]
+    assert [p["summary"] for p in placed] == ["Study: Midterm"] * 2
+    starts = [datetime.fromisoformat(p["start"]) for p in placed]
+    ends = [datetime.fromisoformat(p["end"]) for p in placed]
+    assert all(end - start == timedelta(minutes=90) for start, end in zip(starts, ends))
+    # Both end before the exam, clear of its 60 minute buffer, on distinct days
+    assert all(end.replace(tzinfo=None) <= datetime(2026, 10, 23, 13) for end in ends)
+    assert len({start.date() for start in starts}) == 2
+    assert db.query(Event).filter(Event.eventType == "study").count() == 2
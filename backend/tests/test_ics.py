@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from feeds.ics import event_to_vevent, new_timezones, vtimezone
+
+
+def _event(**fields) -> SimpleNamespace:
+    values = dict(
+        id=1,
+        updated_at=None,
+        start=datetime(2026, 1, 13, 15, tzinfo=timezone.utc),
+        end=datetime(2026, 1, 13, 16, 15, tzinfo=timezone.utc),
+        summary="Lecture",
+        description=None,
+        location=None,
+        eventType=None,
+        course_name=None,
+        recurrence=None,
+        time_zone="America/Chicago",
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def test_one_off_event_stays_in_utc():
+    lines = event_to_vevent(_event()).splitlines()
+
+    assert "DTSTART:20260113T150000Z" in lines
+    assert "DTEND:20260113T161500Z" in lines
+
+
+def test_recurring_event_uses_local_time_and_tzid():
+    event = _event(recurrence="RRULE:FREQ=WEEKLY;UNTIL=20260428T140000Z")
+    lines = event_to_vevent(event).splitlines()
+
+    assert "DTSTART;TZID=America/Chicago:20260113T090000" in lines
+    assert "DTEND;TZID=America/Chicago:20260113T101500" in lines
+
+
+def test_vtimezone_has_yearly_dst_rules():
+    lines = vtimezone("America/Chicago", 2026).splitlines()
+
+    assert lines[:2] == ["BEGIN:VTIMEZONE", "TZID:America/Chicago"]
+    assert "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU" in lines
+    assert "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU" in lines
+    assert "DTSTART:19700308T020000" in lines
+    assert "DTSTART:19701101T020000" in lines
+
+
+def test_vtimezone_last_sunday_and_fixed_offset_zones():
+    berlin = vtimezone("Europe/Berlin", 2026).splitlines()
+    assert "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU" in berlin
+
+    kolkata = vtimezone("Asia/Kolkata", 2026).splitlines()
+    assert "TZOFFSETTO:+0530" in kolkata
+    assert not any(line.startswith("RRULE") for line in kolkata)
+
+
+def test_each_zone_is_emitted_once():
+    recurring = _event(recurrence="RRULE:FREQ=WEEKLY;COUNT=3")
+    emitted = set()
+
+    first = new_timezones([recurring, _event(), recurring], emitted)
+    second = new_timezones([recurring], emitted)
+
+    assert first.count("BEGIN:VTIMEZONE") == 1
+    assert second == ""
+    assert emitted == {"America/Chicago"}
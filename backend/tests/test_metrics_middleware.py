@@ -0,0 +1,39 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from monitoring.hooks import install_db_hooks
+from monitoring.metrics import DB_QUERIES, DB_QUERIES_PER_REQUEST
+from monitoring.middleware import MetricsMiddleware
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+
+def _db_queries(route: str) -> float:
+    return DB_QUERIES._values.get((route,), 0.0)
+
+
+def test_queries_made_while_streaming_count_toward_the_route():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    install_db_hooks(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/stream/{name}")
+    def stream(name: str):
+        def body():
+            with engine.connect() as conn:
+                for i in range(3):
+                    yield f"{conn.execute(text('SELECT :i'), {'i': i}).scalar()}\n"
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    before = _db_queries("/stream/{name}")
+    background = _db_queries("background")
+
+    response = TestClient(app).get("/stream/feed")
+
+    assert response.text == "0\n1\n2\n"
+    assert _db_queries("/stream/{name}") - before == 3
+    assert _db_queries("background") == background
+    assert DB_QUERIES_PER_REQUEST._values[("/stream/{name}",)][2] >= 1
+    engine.dispose()
@@ -0,0 +1,71 @@
+import pytest
+from database.db import Base
+from database.migrations import missing_columns, upgrade_schema
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+# events as it shipped, before the columns added since
+OLD_EVENTS = """
+CREATE TABLE events (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    google_event_id VARCHAR UNIQUE,
+    summary VARCHAR NOT NULL,
+    description VARCHAR,
+    location VARCHAR,
+    "colorId" VARCHAR,
+    "eventType" VARCHAR NOT NULL,
+    start DATETIME NOT NULL,
+    "end" DATETIME NOT NULL,
+    recurrence VARCHAR,
+    course_name VARCHAR
+)
+"""
+OLD_EVENT_ROW = """
+INSERT INTO events (user_id, summary, "eventType", start, "end")
+VALUES (1, 'Lecture', 'class', '2026-01-13 15:00', '2026-01-13 16:00')
+"""
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    import database.models  # noqa: F401  (registers the tables)
+
+    Base.metadata.tables["users"].create(engine)
+    with engine.begin() as conn:
+        conn.execute(text(OLD_EVENTS))
+        conn.execute(text(OLD_EVENT_ROW))
+    yield engine
+    engine.dispose()
+
+
+def test_old_events_table_gains_new_columns(engine):
+    Base.metadata.create_all(engine)
+    assert "events" in missing_columns(engine)
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)  # a second start is a no-op
+
+    assert missing_columns(engine) == {}
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT version, syllabus_edited, updated_at FROM events")
+        ).one()
+    assert row.version == 1
+    assert not row.syllabus_edited
+    assert row.updated_at is not None
+
+
+def test_tables_it_cannot_upgrade_stop_startup(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE gcal_events (id INTEGER PRIMARY KEY, "
+                "user_id INTEGER, google_event_id VARCHAR)"
+            )
+        )
+    Base.metadata.create_all(engine)
+
+    with pytest.raises(RuntimeError, match="gcal_events: calendar_id"):
+        upgrade_schema(engine)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from planner.recurrence import occurrences_between, weekly_recurrence, weekly_runs
+
+CHICAGO = ZoneInfo("America/Chicago")
+HOUR = timedelta(hours=1)
+
+
+def _local(*args) -> datetime:
+    return datetime(*args, tzinfo=CHICAGO)
+
+
+def _as_stored(value: datetime) -> datetime:
+    """What Postgres hands back: the same instant with a fixed UTC offset."""
+    return value.astimezone(timezone(value.utcoffset()))
+
+
+def test_weekly_series_keeps_wall_clock_across_november_change():
+    # Tuesdays 10:00 Chicago; DST ends Sunday 2026-11-01
+    starts = [_local(2026, 10, 20, 10) + timedelta(weeks=i) for i in range(4)]
+    recurrence = weekly_recurrence(starts)
+
+    occurrences = occurrences_between(
+        recurrence,
+        _as_stored(starts[0]),
+        HOUR,
+        datetime(2026, 10, 1, tzinfo=timezone.utc),
+        datetime(2026, 12, 31, tzinfo=timezone.utc),
+        "America/Chicago",
+    )
+
+    assert occurrences == [s.astimezone(timezone.utc) for s in starts]
+    assert {o.astimezone(CHICAGO).hour for o in occurrences} == {10}
+
+
+def test_exdate_after_march_change_still_excludes_week():
+    # DST starts Sunday 2027-03-14; the 2027-03-16 class is skipped
+    starts = [
+        _local(2027, 3, 2, 9),
+        _local(2027, 3, 9, 9),
+        _local(2027, 3, 23, 9),
+        _local(2027, 3, 30, 9),
+    ]
+    recurrence = weekly_recurrence(starts)
+    assert "EXDATE:20270316T140000Z" in recurrence
+
+    occurrences = occurrences_between(
+        recurrence,
+        _as_stored(starts[0]),
+        HOUR,
+        datetime(2027, 3, 1, tzinfo=timezone.utc),
+        datetime(2027, 4, 30, tzinfo=timezone.utc),
+        "America/Chicago",
+    )
+
+    assert occurrences == [s.astimezone(timezone.utc) for s in starts]
+
+
+def test_window_is_half_open_and_includes_overlapping_occurrence():
+    start = datetime(2026, 9, 1, 15, tzinfo=timezone.utc)
+    recurrence = "RRULE:FREQ=WEEKLY;COUNT=3"
+
+    # Occurrence 2 (09-08 15:00-16:00) overlaps a window starting at 15:30
+    occurrences = occurrences_between(
+        recurrence,
+        start,
+        HOUR,
+        datetime(2026, 9, 8, 15, 30, tzinfo=timezone.utc),
+        datetime(2026, 9, 15, 15, tzinfo=timezone.utc),
+        "UTC",
+    )
+
+    assert occurrences == [datetime(2026, 9, 8, 15, tzinfo=timezone.utc)]
+
+
+def test_unknown_zone_falls_back_to_default():
+    start = _as_stored(_local(2026, 10, 27, 10))
+    occurrences = occurrences_between(
+        "RRULE:FREQ=WEEKLY;COUNT=2",
+        start,
+        HOUR,
+        start - HOUR,
+        start + timedelta(weeks=2),
+        "Not/AZone",
+    )
+
+    assert [o.astimezone(CHICAGO).hour for o in occurrences] == [10, 10]
+
+
+def test_weekly_runs_bridge_short_gaps_only():
+    base = datetime(2026, 9, 1, 10)
+    starts = [base + timedelta(weeks=w) for w in (0, 1, 3, 7, 8)]
+
+    assert weekly_runs(starts, max_gap_weeks=2) == [[0, 1, 2], [3, 4]]
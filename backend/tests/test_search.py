@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from database.models import Event, User
+from database.search import search_events
+
+
+@pytest.fixture
+def user_id(db):
+    user = User(
+        google_id="g1",
+        email="student@example.edu",
+        name="Student",
+        access_token="token",
+        token_expires_at=datetime(2030, 1, 1),
+    )
+    db.add(user)
+    db.flush()
+    start = datetime(2026, 10, 1, 15, tzinfo=timezone.utc)
+    db.add_all(
+        [
+            Event(
+                user_id=user.id,
+                summary="Quiz 3",
+                eventType="exam",
+                course_name="CS 101",
+                start=start,
+                end=start + timedelta(hours=1),
+            ),
+            Event(
+                user_id=user.id,
+                summary="Lab report due",
+                eventType="assignment",
+                start=start + timedelta(days=2),
+                end=start + timedelta(days=2),
+            ),
+        ]
+    )
+    db.commit()
+    return user.id
+
+
+@pytest.mark.parametrize("q", ["-", "|", '"" -', "or"])
+def test_operator_only_query_matches_nothing(db, user_id, q):
+    assert search_events(db, user_id, q) == ([], False)
+
+
+def test_fallback_matches_every_term(db, user_id):
+    hits, has_more = search_events(db, user_id, "lab report")
+
+    assert [event.summary for event, _ in hits] == ["Lab report due"]
+    assert not has_more
+
+
+def test_fallback_ranks_title_over_course(db, user_id):
+    hits, _ = search_events(db, user_id, "quiz")
+
+    assert [event.summary for event, _ in hits] == ["Quiz 3"]
+    assert hits[0][1] >= 1.0
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+import pytest
+from database.db import get_db
+from database.models import Event, User
+from database.user_cache import CachedUser
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from routers import deps
+from routers import parser as parser_router
+from routers import syllabi as syllabi_router
+from routers.deps import get_current_user
+from routers.schemas import EventDraftSchema
+
+DRAFTS = [
+    EventDraftSchema(
+        summary="Midterm exam",
+        eventType="exam",
+        start=datetime(2026, 10, 23, 14),
+        raw_text="Oct 23 Midterm exam",
+    ),
+    EventDraftSchema(
+        summary="Homework 1 due",
+        eventType="assignment",
+        start=datetime(2026, 10, 20, 23, 59),
+        raw_text="Oct 20 Homework 1 due",
+    ),
+]
+INSTRUCTOR, STUDENT, OTHER_STUDENT = 1, 2, 3
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    for user_id, email in [
+        (INSTRUCTOR, "prof@example.edu"),
+        (STUDENT, "student@example.edu"),
+        (OTHER_STUDENT, "other@example.edu"),
+    ]:
+        db.add(
+            User(
+                id=user_id,
+                google_id=f"g-{user_id}",
+                email=email,
+                name=email,
+                access_token=f"token-{user_id}",
+                token_expires_at=datetime(2030, 1, 1),
+            )
+        )
+    db.commit()
+    monkeypatch.setattr(deps, "INSTRUCTOR_EMAILS", {"prof@example.edu"})
+    monkeypatch.setattr(parser_router, "parse_syllabus", lambda **kwargs: DRAFTS)
+
+    def current_user(user_id: int):
+        user = db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return CachedUser.from_model(user)
+
+    app = FastAPI()
+    app.include_router(parser_router.router)
+    app.include_router(syllabi_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = current_user
+    return TestClient(app)
+
+
+def _upload(client, user_id):
+    return client.post(
+        "/parser/parse",
+        files={"file": ("syllabus.pdf", b"%PDF same document")},
+        data={"user_id": str(user_id)},
+    )
+
+
+def _summaries(db, user_id):
+    events = db.query(Event).filter(Event.user_id == user_id).order_by(Event.start)
+    return [e.summary for e in events]
+
+
+def test_student_upload_does_not_own_the_entry(client, db):
+    response = _upload(client, STUDENT)
+
+    assert response.status_code == 200
+    syllabus_id = response.headers["X-Syllabus-Id"]
+    assert "X-Syllabus-Owner-Id" not in response.headers
+
+    drafts = response.json()[:1]
+    response = client.put(
+        f"/syllabi/{syllabus_id}", params={"user_id": STUDENT}, json=drafts
+    )
+    assert response.status_code == 403
+
+
+def test_instructor_revision_fans_out_to_enrolled_students(client, db):
+    syllabus_id = _upload(client, STUDENT).headers["X-Syllabus-Id"]
+    # The instructor uploading the same document later claims the entry
+    response = _upload(client, INSTRUCTOR)
+    assert response.headers["X-Syllabus-Id"] == syllabus_id
+    assert response.headers["X-Syllabus-Owner-Id"] == str(INSTRUCTOR)
+    drafts = response.json()
+
+    for user_id in (STUDENT, OTHER_STUDENT):
+        response = client.post(
+            f"/syllabi/{syllabus_id}/enroll", params={"user_id": user_id}
+        )
+        assert response.status_code == 200
+    assert _summaries(db, OTHER_STUDENT) == ["Homework 1 due", "Midterm exam"]
+
+    # Enrolled students cannot rewrite each other's calendars
+    response = client.put(
+        f"/syllabi/{syllabus_id}", params={"user_id": STUDENT}, json=drafts[:1]
+    )
+    assert response.status_code == 403
+
+    midterm = next(d for d in drafts if d["summary"] == "Midterm exam")
+    response = client.put(
+        f"/syllabi/{syllabus_id}", params={"user_id": INSTRUCTOR}, json=[midterm]
+    )
+    assert response.status_code == 200
+    assert response.json()["revision"] == 2
+    db.expire_all()
+    assert _summaries(db, STUDENT) == ["Midterm exam"]
+    assert _summaries(db, OTHER_STUDENT) == ["Midterm exam"]
+
+
+def test_owner_dropped_from_instructors_can_no_longer_revise(client, db, monkeypatch):
+    response = _upload(client, INSTRUCTOR)
+    monkeypatch.setattr(deps, "INSTRUCTOR_EMAILS", set())
+
+    response = client.put(
+        f"/syllabi/{response.headers['X-Syllabus-Id']}",
+        params={"user_id": INSTRUCTOR},
+        json=response.json(),
+    )
+
+    assert response.status_code == 403
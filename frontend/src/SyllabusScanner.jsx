@@ -66,12 +66,30 @@ function normalizeForApi(event, userId) {
     start: startRaw,
     end: endRaw || startRaw,
     recurrence: toRecurrenceString(event?.recurrence),
+    // IANA zone recurring events repeat in across DST changes
+    time_zone:
+      event?.time_zone ?? Intl.DateTimeFormat().resolvedOptions().timeZone,
     course_name: event?.course_name ?? '',
     user_id: userId,
     google_event_id: event?.google_event_id ?? null,
   };
 }
 
+// Shape a reviewed item as a catalog draft for PUT /syllabi/{id}. Scanned
+// items keep their catalog_key so enrolled copies update in place.
+function toDraft(event) {
+  if (event.catalog_key) {
+    const { id, ...draft } = event;
+    return draft;
+  }
+  const body = normalizeForApi(event);
+  return {
+    ...body,
+    all_day: isAllDayStart(event, pickDateLike(event.start)),
+    raw_text: body.summary,
+  };
+}
+
 // Pretty-print FastAPI error details
 function prettyDetail(text) {
   try {
@@ -91,6 +109,8 @@ function SyllabusScanner({ user, onLogout }) {
   const [selectedIds, setSelectedIds] = useState(new Set());
   const [error, setError] = useState('');
   const [uploadedFileName, setUploadedFileName] = useState('');
+  // Shared catalog entry the scanned items came from (X-Syllabus-Id)
+  const [syllabus, setSyllabus] = useState(null); // { id, ownerId } | null
 
   const reset = () => {
     setStep('idle');
@@ -98,6 +118,7 @@ function SyllabusScanner({ user, onLogout }) {
     setSelectedIds(new Set());
     setError('');
     setUploadedFileName('');
+    setSyllabus(null);
   };
 
   const parseFile = async (file) => {
@@ -105,6 +126,7 @@ function SyllabusScanner({ user, onLogout }) {
     formData.append('file', file);
     formData.append('semester_start', '');
     formData.append('timezone', 'America/Chicago');
+    formData.append('user_id', String(user.id));
 
     const url = `${process.env.REACT_APP_BACKEND_URL}/parser/parse`;
     const response = await fetch(url, {
@@ -119,8 +141,15 @@ function SyllabusScanner({ user, onLogout }) {
       throw new Error(`Parse failed: ${response.status}\n${msg}`);
     }
 
+    const syllabusId = response.headers.get('X-Syllabus-Id');
+    const ownerId = response.headers.get('X-Syllabus-Owner-Id');
     try {
-      return response.json();
+      return {
+        events: await response.json(),
+        syllabus: syllabusId
+          ? { id: Number(syllabusId), ownerId: ownerId && Number(ownerId) }
+          : null,
+      };
     } catch (e) {
       throw new Error('Parse failed: invalid JSON from parser service');
     }
@@ -132,7 +161,8 @@ function SyllabusScanner({ user, onLogout }) {
     setStep('scanning');
 
     try {
-      const parsedEvents = await parseFile(file);
+      const { events: parsedEvents, syllabus: entry } = await parseFile(file);
+      setSyllabus(entry);
       const parsedEventsWithIds = parsedEvents.map((event, i) => ({
         ...event,
         id: i,
@@ -189,8 +219,83 @@ function SyllabusScanner({ user, onLogout }) {
     return response.json();
   };
 
-  const postEvents = async () =>
-    Promise.all(selectedItems.map((event) => postEvent(event)));
+  // Link the user to the shared entry; the backend writes all of its events
+  // at once and keeps them in step with the instructor's revisions.
+  const enroll = async () => {
+    const url = `${process.env.REACT_APP_BACKEND_URL}/syllabi/${syllabus.id}/enroll?user_id=${user.id}`;
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: { accept: 'application/json' },
+    });
+
+    if (!response.ok) {
+      const text = await response.text();
+      const msg = prettyDetail(text);
+      throw new Error(
+        `POST /syllabi/enroll failed: ${response.status}\n${msg}`,
+      );
+    }
+
+    return response.json();
+  };
+
+  // Enrolling adds every scanned item, so only do it when none were
+  // deselected; otherwise post the selection as the user's own events.
+  const postEvents = async () => {
+    const scanned = parsed.filter((p) => p.catalog_key);
+    const enrollAll =
+      syllabus &&
+      scanned.length > 0 &&
+      scanned.every((p) => selectedIds.has(p.id));
+    if (!enrollAll) {
+      return Promise.all(selectedItems.map((event) => postEvent(event)));
+    }
+
+    const extras = selectedItems.filter((event) => !event.catalog_key);
+    const [enrolled, ...added] = await Promise.all([
+      enroll(),
+      ...extras.map((event) => postEvent(event)),
+    ]);
+    return [...enrolled, ...added];
+  };
+
+  const canRevise = Boolean(syllabus && syllabus.ownerId === user.id);
+
+  // Owner only: publish the reviewed selection to everyone enrolled.
+  // Deselected items are removed from their calendars, added ones created.
+  const handlePublishRevision = async () => {
+    setError('');
+    try {
+      const url = `${process.env.REACT_APP_BACKEND_URL}/syllabi/${syllabus.id}?user_id=${user.id}`;
+      const response = await fetch(url, {
+        method: 'PUT',
+        headers: {
+          accept: 'application/json',
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(selectedItems.map(toDraft)),
+      });
+
+      if (!response.ok) {
+        const text = await response.text();
+        const msg = prettyDetail(text);
+        throw new Error(`PUT /syllabi failed: ${response.status}\n${msg}`);
+      }
+
+      const revised = await response.json();
+      const revisedWithIds = revised.drafts.map((event, i) => ({
+        ...event,
+        id: i,
+      }));
+      setParsed(revisedWithIds);
+      setSelectedIds(new Set(revisedWithIds.map((m) => m.id)));
+      alert(`Published revision ${revised.revision} to enrolled students ✨`);
+    } catch (err) {
+      // eslint-disable-next-line no-console
+      console.error(err);
+      setError(String(err?.message || err));
+    }
+  };
 
   const postEventToGCal = async (eventId) => {
     const userId = user.id;
@@ -323,6 +428,16 @@ function SyllabusScanner({ user, onLogout }) {
               >
                 Add to site & export to Google Calendar
               </button>
+              {canRevise && (
+                <button
+                  className="btn"
+                  disabled={selectedIds.size === 0}
+                  onClick={handlePublishRevision}
+                  type="button"
+                >
+                  Publish changes to enrolled students
+                </button>
+              )}
             </div>
           </>
         )}